@@ -0,0 +1,7 @@
+"""Run the corpus benchmark suite, see benchmarks/corpus.py."""
+
+import sys
+
+from .corpus import main
+
+sys.exit(main())
@@ -0,0 +1,36 @@
+"""Compare typed_ast backend (with transcription of type hints) with built-in ast backend."""
+
+import ast
+import sys
+
+import typed_ast.ast3
+
+from static_typing.augment import augment
+from static_typing.parse import parse
+from .common import synthetic_module, count_nodes, measure, report
+
+
+def main():
+    if sys.version_info[:2] < (3, 8):
+        print('built-in ast module does not provide type comments in Python {}.{}'
+              .format(*sys.version_info[:2]))
+        return
+    for functions, classes in ((100, 20), (1000, 200)):
+        code = synthetic_module(functions, classes)
+        nodes = count_nodes(ast.parse(code), ast)
+        print('module with {} functions and {} classes, {} nodes'
+              .format(functions, classes, nodes))
+        results = {}
+        for ast_module, kwargs in ((typed_ast.ast3, {}), (ast, {'type_comments': True})):
+            parsing = measure(lambda: ast_module.parse(code, **kwargs))
+            augmenting = measure(
+                lambda: augment(ast_module.parse(code, **kwargs), ast_module=ast_module)) - parsing
+            results[ast_module] = measure(lambda: parse(code, ast_module=ast_module))
+            report('{}.parse()'.format(ast_module.__name__), parsing, nodes)
+            report('augment() of {} tree'.format(ast_module.__name__), augmenting, nodes)
+            report('parse() using {}'.format(ast_module.__name__), results[ast_module], nodes)
+        print('speedup: {:.2f}x'.format(results[typed_ast.ast3] / results[ast]))
+
+
+if __name__ == '__main__':
+    main()
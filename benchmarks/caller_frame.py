@@ -0,0 +1,39 @@
+"""Compare capturing the caller frame via inspect.getouterframes() with direct frame access."""
+
+import inspect
+
+from static_typing.parse import _caller_frame, parse
+from .common import measure
+
+
+def outer_frames_caller_namespaces():
+    caller_frame = inspect.getouterframes(inspect.currentframe())[1][0]
+    return caller_frame.f_globals, caller_frame.f_locals
+
+
+def direct_caller_namespaces():
+    caller_frame = _caller_frame(1)
+    return caller_frame.f_globals, caller_frame.f_locals
+
+
+def nested(depth, function):
+    if depth == 0:
+        return function()
+    return nested(depth - 1, function)
+
+
+def main():
+    number = 1000
+    snippet = 'x = 1  # type: int'
+    for depth in (10, 100):
+        print('call stack deeper by {} frames'.format(depth))
+        for name, function in (
+                ('inspect.getouterframes()', outer_frames_caller_namespaces),
+                ('direct frame access', direct_caller_namespaces),
+                ('parse() of small snippet', lambda: parse(snippet))):
+            seconds = measure(lambda: nested(depth, function), number=number)
+            print('{:40} {:10.2f} us'.format(name, seconds * 1e6))
+
+
+if __name__ == '__main__':
+    main()
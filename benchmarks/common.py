@@ -0,0 +1,69 @@
+"""Utilities shared by performance benchmarks of static_typing package.
+
+Benchmarks live in a namespace package (without __init__.py), so that they are not
+distributed with static_typing. Each benchmark can be run as a module,
+e.g.: python -m benchmarks.fused_pass
+
+The whole package runs the corpus suite (see corpus module), which can be compared
+against stored baselines: python -m benchmarks --compare
+"""
+
+import timeit
+import typing as t
+
+import typed_ast.ast3
+
+SYNTHETIC_FUNCTION = '''
+def function_{index}(spam, ham):
+    eggs = spam + ham * 2  # type: int
+    bacon = [spam, ham, eggs, {{'key': (spam, ham)}}, [x * 2 for x in range(ham)]]
+    for i in range(len(bacon)):  # type: int
+        if i % 2:
+            sausage = str(bacon[i]).upper().strip().split(',')  # type: list
+        else:
+            with open(str(i)) as beans:  # type: object
+                sausage = beans.read()  # type: str
+    return eggs
+'''
+
+SYNTHETIC_CLASS = '''
+class Class{index}:
+    counter = 0  # type: int
+
+    def __init__(self):
+        self.value = 0.0  # type: float
+        self.name = 'name'  # type: str
+
+    def method(self, value):
+        self.value = value * 2.0 + self.value / 3.0
+        return self.value
+'''
+
+SYNTHETIC_TABLE_ROW = '    ({index}, {index}.5, "row {index}", [{index}, {index}, {index}]),\n'
+
+
+def synthetic_module(functions: int = 100, classes: int = 20, table_rows: int = 0) -> str:
+    """Generate source code of a module with many type-annotated functions and classes.
+
+    If table_rows is given, the module also contains a big literal data table,
+    like the ones commonly found in generated code.
+    """
+    parts = [SYNTHETIC_FUNCTION.format(index=i) for i in range(functions)]
+    parts += [SYNTHETIC_CLASS.format(index=i) for i in range(classes)]
+    if table_rows:
+        parts.append('TABLE = [\n{}]  # type: list\n'.format(''.join(
+            SYNTHETIC_TABLE_ROW.format(index=i) for i in range(table_rows))))
+    return ''.join(parts)
+
+
+def count_nodes(tree, ast_module=typed_ast.ast3) -> int:
+    return sum(1 for _ in ast_module.walk(tree))
+
+
+def measure(function: t.Callable[[], t.Any], repeat: int = 5, number: int = 1) -> float:
+    """Return the best time (in seconds) of a single execution of the function."""
+    return min(timeit.repeat(function, repeat=repeat, number=number)) / number
+
+
+def report(name: str, seconds: float, nodes: int) -> None:
+    print('{:<40} {:>10.2f} ms {:>14,.0f} nodes/s'.format(name, seconds * 1000, nodes / seconds))
@@ -0,0 +1,65 @@
+"""Compare running many analyses in separate traversals and in one composite traversal."""
+
+import ast
+import collections
+
+from static_typing.ast_manipulation import \
+    CompositeVisitor, EXPRESSION_NODE_TYPES, RecursiveAstVisitor, StructuralHasher
+from .common import synthetic_module, count_nodes, measure, report
+
+
+class NodeTypeCounter(RecursiveAstVisitor[ast]):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.counts = collections.Counter()
+
+    def visit_node(self, node):
+        self.counts[type(node)] += 1
+
+
+class NameCollector(RecursiveAstVisitor[ast]):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.names = set()
+
+    def visit_field(self, node, name, value):
+        if name in ('id', 'name', 'attr', 'arg'):
+            self.names.add(value)
+
+
+class StatementCounter(NodeTypeCounter):
+
+    pruned_node_types = EXPRESSION_NODE_TYPES[ast]
+
+
+def create_analyses():
+    return [NodeTypeCounter(), NameCollector(), StatementCounter(), StructuralHasher[ast](),
+            NodeTypeCounter(fields_first=True)]
+
+
+def main():
+    ast_module = ast
+    for functions, classes in ((100, 20), (1000, 200)):
+        tree = ast_module.parse(synthetic_module(functions, classes))
+        nodes = count_nodes(tree, ast_module)
+        print('module with {} functions and {} classes, {} nodes'
+              .format(functions, classes, nodes))
+
+        def separate():
+            for analysis in create_analyses():
+                analysis.visit(tree)
+
+        def composite():
+            CompositeVisitor[ast_module](create_analyses()).visit(tree)
+
+        separate_time = measure(separate)
+        report('5 analyses in separate traversals', separate_time, nodes)
+        composite_time = measure(composite)
+        report('5 analyses in composite traversal', composite_time, nodes)
+        print('speedup: {:.2f}x'.format(separate_time / composite_time))
+
+
+if __name__ == '__main__':
+    main()
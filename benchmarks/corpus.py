@@ -0,0 +1,269 @@
+"""Measure parse(), augment(), validation, transcription and unparse() over a corpus of modules.
+
+The corpus consists of the local standard library sources (without tests and site-packages),
+a large synthetic module and a deeply nested synthetic module, so no network access is needed.
+
+For each corpus and operation, throughput (nodes/s and MB/s) and peak memory are reported.
+Results can be stored as a JSON baseline, and later runs can be compared against it -- then
+the exit status is non-zero if any operation got slower, or used more memory, by more than
+the given tolerance, or if any operation was measured on different files (e.g. because it
+newly fails on some of them, which are then skipped). Baselines are specific to the machine
+and Python version, so by default they are kept in benchmarks/baselines/ under a name derived
+from the Python version.
+
+Run it as: python -m benchmarks [--save-baseline] [--compare] [--help for more options]
+"""
+
+import argparse
+import ast
+import gc
+import json
+import logging
+import os
+import pathlib
+import platform
+import sys
+import sysconfig
+import time
+import tracemalloc
+import typing as t
+import warnings
+
+import typed_ast.ast3
+
+from static_typing.ast_manipulation import AstTranscriber, AstValidator
+from static_typing.augment import augment
+from static_typing.parse import parse
+from static_typing.unparse import unparse
+from .common import synthetic_module
+
+BASELINES_PATH = pathlib.Path(__file__).parent.joinpath('baselines')
+
+EXCLUDED_DIRECTORIES = {
+    'site-packages', 'dist-packages', 'test', 'tests', 'idle_test', '__pycache__'}
+
+OPERATIONS = ('parse', 'augment', 'validate', 'transcribe', 'unparse')
+
+
+Module = t.NamedTuple('Module', [('name', str), ('code', str), ('size', int), ('nodes', int)])
+
+
+def stdlib_modules(max_files: t.Optional[int] = None) -> t.List[Module]:
+    """Load sources of the local standard library."""
+    root = pathlib.Path(sysconfig.get_paths()['stdlib'])
+    paths = []
+    for directory, subdirectories, files in os.walk(str(root)):
+        subdirectories[:] = sorted(_ for _ in subdirectories if _ not in EXCLUDED_DIRECTORIES)
+        paths += [pathlib.Path(directory, name) for name in sorted(files) if name.endswith('.py')]
+    modules = []
+    for path in paths[:max_files]:
+        try:
+            code = path.read_text(encoding='utf-8')
+            tree = ast.parse(code, type_comments=True)
+        except (SyntaxError, UnicodeDecodeError, ValueError):
+            continue
+        modules.append(Module(str(path.relative_to(root)), code, len(code.encode()),
+                              sum(1 for _ in ast.walk(tree))))
+    return modules
+
+
+def nested_module(depth: int) -> str:
+    """Generate source code of a module with functions and loops nested depth times."""
+    lines = []
+    for level in range(depth):
+        indent = '    ' * level
+        lines.append('{}def function_{}(spam):'.format(indent, level) if level % 2 == 0
+                     else '{}for ham_{} in range(spam):  # type: int'.format(indent, level))
+        lines.append('{}    eggs_{} = spam + {}  # type: int'.format(indent, level, level))
+    lines.append('{}return spam'.format('    ' * depth))
+    return '\n'.join(lines) + '\n'
+
+
+def synthetic_modules() -> t.Dict[str, t.List[Module]]:
+    corpora = {'synthetic': synthetic_module(1000, 200, 1000), 'nested': nested_module(90)}
+    return {name: [Module(name, code, len(code.encode()), sum(
+        1 for _ in ast.walk(ast.parse(code, type_comments=True))))]
+            for name, code in corpora.items()}
+
+
+def prepare(operation: str, code: str) -> t.Any:
+    """Prepare input of an operation (outside of measured time)."""
+    if operation == 'parse':
+        return code
+    tree = ast.parse(code, type_comments=True)
+    if operation == 'unparse':
+        tree = augment(tree)
+    return tree
+
+
+NAMESPACE = {'__builtins__': __builtins__}
+
+RUNNERS = {
+    'parse': lambda code: parse(code, globals_=NAMESPACE, locals_=NAMESPACE),
+    'augment': lambda tree: augment(tree, globals_=NAMESPACE),
+    'validate': lambda tree: AstValidator[ast](mode='exec').visit(tree),
+    'transcribe': lambda tree: AstTranscriber[ast, typed_ast.ast3]().visit(tree),
+    'unparse': unparse}
+
+
+def supported_modules(operation: str, modules: t.List[Module]) -> t.List[Module]:
+    """Select modules which the operation can process without errors."""
+    supported = []
+    for module in modules:
+        try:
+            RUNNERS[operation](prepare(operation, module.code))
+        except Exception:  # pylint: disable=broad-except
+            continue
+        supported.append(module)
+    return supported
+
+
+def run_once(operation: str, modules: t.List[Module]) -> float:
+    """Return time (in seconds) of performing the operation on all modules once."""
+    runner = RUNNERS[operation]
+    seconds = 0.0
+    for module in modules:
+        argument = prepare(operation, module.code)
+        start = time.perf_counter()
+        runner(argument)
+        seconds += time.perf_counter() - start
+    return seconds
+
+
+def peak_memory(operation: str, modules: t.List[Module]) -> int:
+    """Return the highest peak memory (in bytes) of performing the operation on any module."""
+    runner = RUNNERS[operation]
+    peak = 0
+    for module in modules:
+        argument = prepare(operation, module.code)
+        gc.collect()
+        tracemalloc.start()
+        runner(argument)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        del argument
+    return peak
+
+
+def measure_corpus(modules: t.List[Module], operation: str, repeat: int) -> t.Dict[str, t.Any]:
+    supported = supported_modules(operation, modules)
+    names = sorted(module.name for module in supported)
+    if not supported:
+        return {'files': 0, 'skipped_files': len(modules), 'file_names': names}
+    seconds = min(run_once(operation, supported) for _ in range(repeat))
+    nodes = sum(module.nodes for module in supported)
+    size = sum(module.size for module in supported)
+    return {
+        'files': len(supported), 'skipped_files': len(modules) - len(supported),
+        'file_names': names, 'nodes': nodes, 'bytes': size, 'seconds': seconds,
+        'nodes_per_second': nodes / seconds, 'mb_per_second': size / 2 ** 20 / seconds,
+        'peak_memory_bytes': peak_memory(operation, supported)}
+
+
+def default_baseline_path() -> pathlib.Path:
+    return BASELINES_PATH.joinpath('{}-{}.{}-{}.json'.format(
+        platform.python_implementation(), *sys.version_info[:2], sys.platform))
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> t.List[str]:
+    """Find operations that got slower, or use more memory, than in the baseline.
+
+    Operations measured on different files than in the baseline cannot be compared,
+    and they are reported too.
+    """
+    regressions = []
+    for key, result in sorted(results.items()):
+        expected = baseline.get(key)
+        if expected is None:
+            continue
+        if 'file_names' not in expected:
+            regressions.append('{}: baseline does not list measured files, save it again'
+                               .format(key))
+            continue
+        if result['file_names'] != expected['file_names']:
+            names = set(result['file_names'])
+            expected_names = set(expected['file_names'])
+            regressions.append(
+                '{}: measured on {} files, baseline on {} files (missing: {}; extra: {})'.format(
+                    key, result['files'], expected['files'],
+                    ', '.join(sorted(expected_names - names)) or 'none',
+                    ', '.join(sorted(names - expected_names)) or 'none'))
+            continue
+        if not result['files']:
+            continue
+        if result['nodes_per_second'] < expected['nodes_per_second'] * (1 - tolerance):
+            regressions.append('{}: {:,.0f} nodes/s, baseline {:,.0f} nodes/s'.format(
+                key, result['nodes_per_second'], expected['nodes_per_second']))
+        if result['peak_memory_bytes'] > expected['peak_memory_bytes'] * (1 + tolerance):
+            regressions.append('{}: {:.1f} MiB peak, baseline {:.1f} MiB peak'.format(
+                key, result['peak_memory_bytes'] / 2 ** 20,
+                expected['peak_memory_bytes'] / 2 ** 20))
+    return regressions
+
+
+def report(key: str, result: dict) -> None:
+    if not result['files']:
+        print('{:<22} {:>5} files, all skipped'.format(key, result['skipped_files']))
+        return
+    print('{:<22} {:>5} files {:>10.2f} ms {:>12,.0f} nodes/s {:>7.2f} MB/s {:>8.1f} MiB peak'
+          .format(key, result['files'], result['seconds'] * 1000, result['nodes_per_second'],
+                  result['mb_per_second'], result['peak_memory_bytes'] / 2 ** 20))
+
+
+def main(argv: t.Optional[t.Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks', description=__doc__.split('\n')[0])
+    parser.add_argument('--corpus', nargs='+', choices=('stdlib', 'synthetic', 'nested'),
+                        default=['stdlib', 'synthetic', 'nested'])
+    parser.add_argument('--operation', nargs='+', choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument('--max-files', type=int, default=None,
+                        help='limit number of standard library files')
+    parser.add_argument('--repeat', type=int, default=3, help='take the best of so many runs')
+    parser.add_argument('--save-baseline', nargs='?', const=default_baseline_path(),
+                        type=pathlib.Path, metavar='PATH', help='store results as baseline')
+    parser.add_argument('--compare', nargs='?', const=default_baseline_path(),
+                        type=pathlib.Path, metavar='PATH', help='compare results with baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='relative slowdown or memory increase considered a regression')
+    args = parser.parse_args(argv)
+    if args.compare is not None and not args.compare.is_file():
+        parser.error('no baseline at {}, run with --save-baseline first'.format(args.compare))
+
+    logging.disable(logging.WARNING)
+    warnings.simplefilter('ignore')
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+
+    corpora = {}
+    if 'stdlib' in args.corpus:
+        corpora['stdlib'] = stdlib_modules(args.max_files)
+    corpora.update({name: modules for name, modules in synthetic_modules().items()
+                    if name in args.corpus})
+
+    results = {}
+    for corpus_name, modules in corpora.items():
+        for operation in args.operation:
+            key = '{}/{}'.format(corpus_name, operation)
+            results[key] = measure_corpus(modules, operation, args.repeat)
+            report(key, results[key])
+
+    if args.save_baseline is not None:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        with args.save_baseline.open('w') as baseline_file:
+            json.dump({'python': sys.version, 'platform': platform.platform(),
+                       'results': results}, baseline_file, indent=2, sort_keys=True)
+        print('baseline saved in {}'.format(args.save_baseline))
+
+    if args.compare is not None:
+        with args.compare.open() as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print('regression in {}'.format(regression))
+        if regressions:
+            return 1
+        print('no regressions compared to {}'.format(args.compare))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,37 @@
+"""Show what whole-tree debug dumps would cost on every call to parse() with logging disabled."""
+
+import logging
+
+import typed_ast.ast3
+
+from static_typing.parse import parse
+from .common import synthetic_module, count_nodes, measure, report
+
+
+def parse_with_eager_dumps(code, ast_module):
+    tree = ast_module.parse(code)
+    ast_module.dump(tree)
+    tree = parse(code, ast_module=ast_module)
+    ast_module.dump(tree)
+    ast_module.dump(tree)
+    return tree
+
+
+def main():
+    logging.getLogger('static_typing').setLevel(logging.INFO)
+    ast_module = typed_ast.ast3
+    for functions, classes in ((100, 20), (1000, 200)):
+        code = synthetic_module(functions, classes)
+        nodes = count_nodes(ast_module.parse(code), ast_module)
+        print('module with {} functions and {} classes, {} nodes'
+              .format(functions, classes, nodes))
+        parsing = measure(lambda: ast_module.parse(code))
+        eager = measure(lambda: parse_with_eager_dumps(code, ast_module)) - parsing
+        lazy = measure(lambda: parse(code, ast_module=ast_module))
+        report('parse() with eager dumps', eager, nodes)
+        report('parse()', lazy, nodes)
+        print('speedup: {:.2f}x'.format(eager / lazy))
+
+
+if __name__ == '__main__':
+    main()
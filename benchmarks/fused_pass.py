@@ -0,0 +1,40 @@
+"""Compare separate type hint resolution and typing passes with the fused single pass."""
+
+import ast
+
+import typed_ast.ast3
+
+from static_typing.ast_manipulation import TypeHintResolver
+from static_typing.static_typer import StaticTyper
+from .common import synthetic_module, count_nodes, measure, report
+
+
+def augment_in_two_passes(tree, ast_module):
+    tree = TypeHintResolver[ast_module, ast]().visit(tree)
+    return StaticTyper[ast_module]().visit(tree)
+
+
+def augment_in_fused_pass(tree, ast_module):
+    resolver = TypeHintResolver[ast_module, ast]()
+    return StaticTyper[ast_module](type_hint_resolver=resolver).visit(tree)
+
+
+def main():
+    ast_module = typed_ast.ast3
+    for functions, classes in ((100, 20), (1000, 200)):
+        code = synthetic_module(functions, classes)
+        nodes = count_nodes(ast_module.parse(code), ast_module)
+        print('module with {} functions and {} classes, {} nodes'
+              .format(functions, classes, nodes))
+        parsing = measure(lambda: ast_module.parse(code))
+        two_passes = measure(
+            lambda: augment_in_two_passes(ast_module.parse(code), ast_module)) - parsing
+        fused = measure(
+            lambda: augment_in_fused_pass(ast_module.parse(code), ast_module)) - parsing
+        report('resolver + typer', two_passes, nodes)
+        report('fused pass', fused, nodes)
+        print('speedup: {:.2f}x'.format(two_passes / fused))
+
+
+if __name__ == '__main__':
+    main()
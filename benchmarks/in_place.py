@@ -0,0 +1,56 @@
+"""Compare upgrading nodes to statically typed ones in place with copying them."""
+
+import ast
+import time
+import tracemalloc
+
+from static_typing.augment import augment
+from .common import synthetic_module, count_nodes, report
+
+
+def measure_memory(function) -> int:
+    """Return peak size (in bytes) of memory allocated during execution of the function."""
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def measure_with_gc(code, ast_module, in_place: bool, repeat: int = 5) -> float:
+    """Return the best time of augmenting the code, with garbage collection enabled.
+
+    Unlike timeit, this does not disable garbage collector, whose cost grows
+    with the number of nodes allocated when copying them.
+    """
+    times = []
+    for _ in range(repeat):
+        tree = ast_module.parse(code, type_comments=True)
+        start = time.perf_counter()
+        augment(tree, ast_module=ast_module, in_place=in_place)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    ast_module = ast
+    for functions, classes in ((100, 20), (1000, 200)):
+        code = synthetic_module(functions, classes)
+        nodes = count_nodes(ast_module.parse(code, type_comments=True), ast_module)
+        print('module with {} functions and {} classes, {} nodes'
+              .format(functions, classes, nodes))
+        results = {}
+        for in_place in (False, True):
+            name = 'in place' if in_place else 'copying'
+            results[in_place] = measure_with_gc(code, ast_module, in_place)
+            tree = ast_module.parse(code, type_comments=True)
+            peak = measure_memory(lambda: augment(tree, ast_module=ast_module, in_place=in_place))
+            report(name, results[in_place], nodes)
+            print('{:<40} {:>10.2f} MiB peak of allocations'.format(name, peak / 1024 ** 2))
+        print('speedup: {:.2f}x'.format(results[False] / results[True]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Compare recursive and iterative (explicit stack) traversal of AST."""
+
+import ast
+
+from static_typing.ast_manipulation import RecursiveAstTransformer, RecursiveAstVisitor
+from .common import synthetic_module, count_nodes, measure, report
+
+
+def deep_expression(depth: int, ast_module):
+    expression = ast_module.Name('a', ast_module.Load())
+    for _ in range(depth):
+        expression = ast_module.BinOp(
+            expression, ast_module.Add(), ast_module.Name('a', ast_module.Load()))
+    return ast_module.Expression(expression)
+
+
+def main():
+    ast_module = ast
+    trees = [('module with {} functions and {} classes'.format(functions, classes),
+              ast_module.parse(synthetic_module(functions, classes)))
+             for functions, classes in ((100, 20), (1000, 200))]
+    trees += [('expression {} operations deep'.format(depth), deep_expression(depth, ast_module))
+              for depth in (500, 100000)]
+    for description, tree in trees:
+        nodes = count_nodes(tree, ast_module)
+        print('{}, {} nodes'.format(description, nodes))
+        for traversal_name, traversal_type in (
+                ('visitor', RecursiveAstVisitor), ('transformer', RecursiveAstTransformer)):
+            results = {}
+            for iterative in (False, True):
+                name = '{} {}'.format('iterative' if iterative else 'recursive', traversal_name)
+                try:
+                    results[iterative] = measure(
+                        lambda: traversal_type[ast_module](iterative=iterative).visit(tree))
+                except RecursionError:
+                    print('{:<40} RecursionError'.format(name))
+                    continue
+                report(name, results[iterative], nodes)
+            if len(results) == 2:
+                print('speedup: {:.2f}x'.format(results[False] / results[True]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Measure memory per statically typed node, with type fields allocated lazily and eagerly."""
+
+import ast
+import gc
+import tracemalloc
+
+from static_typing.augment import augment
+from static_typing.nodes import StaticallyTyped
+
+SMALL_FUNCTION = '''
+def function_{index}(spam):
+    return spam + {index}
+'''
+
+SMALL_CLASS = '''
+class Class{index}:
+    """Class without fields."""
+
+    def method(self):
+        pass
+'''
+
+
+def small_scopes_module(functions: int, classes: int) -> str:
+    """Generate source code of a module with many small functions and classes."""
+    return ''.join([SMALL_FUNCTION.format(index=i) for i in range(functions)]
+                   + [SMALL_CLASS.format(index=i) for i in range(classes)])
+
+
+def allocate_eagerly(tree) -> int:
+    """Allocate all type fields which are still empty, like they were before lazy allocation.
+
+    Return number of statically typed nodes.
+    """
+    count = 0
+    for node in ast.walk(tree):
+        if not isinstance(node, StaticallyTyped[ast]):
+            continue
+        count += 1
+        for field_name in type(node)._type_fields:
+            vars(node).setdefault('_{}'.format(field_name), {})
+        if not isinstance(type(node).__dict__.get('_stores'), property):
+            vars(node).setdefault('_stores', [])
+    return count
+
+
+def traced_size() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def main():
+    for functions, classes in ((1000, 200), (10000, 2000)):
+        tree = ast.parse(small_scopes_module(functions, classes), type_comments=True)
+        tracemalloc.start()
+        baseline = traced_size()
+        augment(tree, ast_module=ast)
+        lazy = traced_size() - baseline
+        typed_nodes = allocate_eagerly(tree)
+        eager = traced_size() - baseline
+        tracemalloc.stop()
+        print('module with {} small functions and {} small classes, {} statically typed nodes'
+              .format(functions, classes, typed_nodes))
+        for name, size in (('eager type fields', eager), ('lazy type fields', lazy)):
+            print('{:<40} {:>10.2f} MiB {:>10.0f} bytes per typed node'
+                  .format(name, size / 1024 ** 2, size / typed_nodes))
+        print('reduction: {:.0%}'.format(1 - lazy / eager))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Compare collecting stores bottom-up with walking the whole tree in every scope.
+
+Stores of nested scopes are shared rather than copied, so collecting them is linear in tree
+size. However, every function still registers all stores of its subtree (including those
+of nested functions) as its variables, so augmentation time grows with depth of nesting.
+"""
+
+import ast
+import collections
+import contextlib
+import unittest.mock
+
+from static_typing.augment import augment
+from static_typing.nodes import function_def, module
+from static_typing.nodes.statically_typed import StoreChain
+from .common import count_nodes, measure, report
+
+NESTED_SCOPE = '''{indent}def function_{index}(spam, ham):
+{indent}    eggs = [spam + ham * 2, {{'key': (spam, ham)}},
+{indent}            [x * 2 for x in range(ham)]]  # type: list
+{indent}    for i in range(len(eggs)):  # type: int
+{indent}        bacon = str(eggs[i]).upper().strip().split(',')  # type: list
+'''
+
+
+def nested_scopes(depth: int, nests: int) -> str:
+    """Generate a module with given number of functions, each with nested scopes of given depth.
+
+    Each scope is a function with a loop, the next scope is nested in the loop.
+    """
+    nest = ''.join(NESTED_SCOPE.format(indent='    ' * 2 * level, index=level)
+                   for level in range(depth))
+    return nest * nests
+
+
+def legacy_find_all_stores(tree):
+    """Collect stores like before, by walking the whole tree in every scope."""
+    variables = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Assign, ast.AnnAssign)):
+            variables += list(node._vars.items())
+        elif isinstance(node, ast.For):
+            variables += list(node._index_vars.items())
+        elif isinstance(node, ast.With):
+            variables += list(node._context_vars.items())
+    return StoreChain([collections.OrderedDict(variables)])
+
+
+def measure_augment(code, ast_module, repeat: int = 5) -> float:
+    """Return the best time of augmenting the code, excluding time of parsing it."""
+    times = []
+    for _ in range(repeat):
+        tree = ast_module.parse(code, type_comments=True)
+        times.append(measure(lambda: augment(tree, ast_module=ast_module), repeat=1))
+    return min(times)
+
+
+def main():
+    ast_module = ast
+    scopes = 480
+    for depth in (1, 5, 15, 30, 48):
+        code = nested_scopes(depth, scopes // depth)
+        nodes = count_nodes(ast_module.parse(code, type_comments=True), ast_module)
+        print('{} nests of {} nested scopes, {} nodes'.format(scopes // depth, depth, nodes))
+        results = {}
+        for legacy in (True, False):
+            with contextlib.ExitStack() as stack:
+                if legacy:
+                    for patched_module in (function_def, module):
+                        stack.enter_context(unittest.mock.patch.object(
+                            patched_module, 'find_all_stores',
+                            {ast_module: legacy_find_all_stores}))
+                results[legacy] = measure_augment(code, ast_module)
+            report('walking in every scope' if legacy else 'bottom-up aggregation',
+                   results[legacy], nodes)
+        print('speedup: {:.2f}x'.format(results[True] / results[False]))
+
+
+if __name__ == '__main__':
+    main()
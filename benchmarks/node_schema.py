@@ -0,0 +1,49 @@
+"""Compare traversal driven by precomputed field kinds with probing types of field values."""
+
+import ast
+
+from static_typing.ast_manipulation import RecursiveAstTransformer, RecursiveAstVisitor
+from .common import synthetic_module, count_nodes, measure, report
+
+
+class ProbingVisitor(RecursiveAstVisitor[ast]):
+
+    def generic_visit(self, node):
+        if not self._fields_first:
+            self.visit_node(node)
+        for name, value in ast.iter_fields(node):
+            self.generic_visit_field(node, name, value)
+        if self._fields_first:
+            self.visit_node(node)
+
+
+class ProbingTransformer(RecursiveAstTransformer[ast]):
+
+    def generic_visit(self, node):
+        if not self._fields_first:
+            node = self.visit_node(node)
+        for name, value in ast.iter_fields(node):
+            setattr(node, name, self.generic_visit_field(node, name, value))
+        if self._fields_first:
+            node = self.visit_node(node)
+        return node
+
+
+def main():
+    for functions, classes, table_rows in ((100, 20, 0), (1000, 200, 0), (1000, 200, 10000)):
+        tree = ast.parse(synthetic_module(functions, classes, table_rows))
+        nodes = count_nodes(tree, ast)
+        print('module with {} functions, {} classes and {} table rows, {} nodes'
+              .format(functions, classes, table_rows, nodes))
+        for name, probing_type, schema_type in (
+                ('visitor', ProbingVisitor, RecursiveAstVisitor[ast]),
+                ('transformer', ProbingTransformer, RecursiveAstTransformer[ast])):
+            probing = measure(lambda: probing_type().visit(tree))
+            schema = measure(lambda: schema_type().visit(tree))
+            report('{} probing field values'.format(name), probing, nodes)
+            report('{} using field kinds'.format(name), schema, nodes)
+            print('speedup: {:.2f}x'.format(probing / schema))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""Measure overhead of profiling visitors with ProfilingMixin."""
+
+import ast
+
+from static_typing.ast_manipulation import AstValidator, ProfilingMixin, RecursiveAstVisitor
+from .common import synthetic_module, count_nodes, measure, report
+
+
+def main():
+    ast_module = ast
+    tree = ast_module.parse(synthetic_module(1000, 200))
+    nodes = count_nodes(tree, ast_module)
+    print('module with 1000 functions and 200 classes, {} nodes'.format(nodes))
+    for name, visitor_type, kwargs in (('visitor', RecursiveAstVisitor[ast_module], {}),
+                                       ('validator', AstValidator[ast_module], {'mode': 'exec'})):
+
+        class ProfiledVisitor(ProfilingMixin, visitor_type):
+            pass
+
+        plain = measure(lambda: visitor_type(**kwargs).visit(tree))
+        report(name, plain, nodes)
+        profiled = measure(lambda: ProfiledVisitor(**kwargs).visit(tree))
+        report('profiled {}'.format(name), profiled, nodes)
+        print('overhead: {:.0%}'.format(profiled / plain - 1))
+    visitor = ProfiledVisitor(mode='exec')
+    visitor.visit(tree)
+    print(visitor.profile_report(limit=10))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""Measure how augmentation time depends on the size of expressions in augmented module."""
+
+import ast
+
+import typed_ast.ast3
+
+from static_typing.ast_manipulation import TypeHintResolver
+from static_typing.static_typer import StaticTyper
+from .common import synthetic_module, count_nodes, measure, report
+
+
+def main():
+    ast_module = typed_ast.ast3
+
+    class UnprunedTypeHintResolver(TypeHintResolver[ast_module, ast]):
+        pruned_node_types = ()
+
+    class UnprunedStaticTyper(StaticTyper[ast_module]):
+        pruned_node_types = ()
+
+    def augment(tree, resolver_class, typer_class):
+        return typer_class(type_hint_resolver=resolver_class()).visit(tree)
+
+    for table_rows in (0, 1000, 10000):
+        code = synthetic_module(functions=100, classes=20, table_rows=table_rows)
+        nodes = count_nodes(ast_module.parse(code), ast_module)
+        print('module with table of {} rows, {} nodes'.format(table_rows, nodes))
+        parsing = measure(lambda: ast_module.parse(code))
+        unpruned = measure(lambda: augment(
+            ast_module.parse(code), UnprunedTypeHintResolver, UnprunedStaticTyper)) - parsing
+        pruned = measure(lambda: augment(
+            ast_module.parse(code), TypeHintResolver[ast_module, ast], StaticTyper[ast_module])) \
+            - parsing
+        report('without pruning', unpruned, nodes)
+        report('with pruning', pruned, nodes)
+        print('speedup: {:.2f}x'.format(unpruned / pruned))
+
+
+if __name__ == '__main__':
+    main()
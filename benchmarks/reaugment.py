@@ -0,0 +1,32 @@
+"""Compare augmenting the whole module after an edit with augmenting only the edited function."""
+
+import ast
+
+from static_typing.augment import augment, reaugment
+from .common import SYNTHETIC_FUNCTION, synthetic_module, count_nodes, measure, report
+
+EDITED_FUNCTION = SYNTHETIC_FUNCTION.format(index=0).replace('# type: int', '# type: float')
+
+
+def main():
+    ast_module = ast
+    for functions, classes in ((100, 20), (1000, 200), (5000, 1000)):
+        code = synthetic_module(functions, classes)
+        nodes = count_nodes(ast_module.parse(code, type_comments=True), ast_module)
+        print('module with {} functions and {} classes, {} nodes'
+              .format(functions, classes, nodes))
+        edited_code = code.replace(SYNTHETIC_FUNCTION.format(index=0), EDITED_FUNCTION, 1)
+        full = measure(lambda: augment(ast_module.parse(edited_code, type_comments=True)))
+        report('parse and augment whole module', full, nodes)
+        tree = augment(ast_module.parse(code, type_comments=True))
+
+        def edit():
+            reaugment(tree, tree._functions['function_0'], EDITED_FUNCTION)
+
+        incremental = measure(edit)
+        report('reaugment edited function', incremental, nodes)
+        print('speedup: {:.0f}x'.format(full / incremental))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Compare parsing a big generated module at once and statement by statement."""
+
+import ast
+import gc
+import io
+import tracemalloc
+
+from static_typing.parse import parse
+from static_typing.parse_statements import parse_statements
+from .common import SYNTHETIC_FUNCTION, measure
+
+GENERATED_ROW = \
+    'ROW_{index} = ({index}, {index}.5, "row {index}", [{index}, {index}])  # type: tuple\n'
+
+
+def generated_module(rows: int, functions: int) -> str:
+    """Generate source code of a module made of many small top-level statements."""
+    return ''.join([GENERATED_ROW.format(index=i) for i in range(rows)]
+                   + [SYNTHETIC_FUNCTION.format(index=i) for i in range(functions)])
+
+
+def peak_memory(function) -> int:
+    """Return peak memory (in bytes) allocated during a single execution of the function."""
+    gc.collect()
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    ast_module = ast
+    namespace = {'__builtins__': __builtins__}
+    for rows, functions in ((10000, 100), (100000, 1000)):
+        code = generated_module(rows, functions)
+        print('module with {} rows and {} functions, {:.1f} MiB of code'
+              .format(rows, functions, len(code) / 2 ** 20))
+
+        def whole():
+            parse(code, globals_=namespace, locals_=namespace, ast_module=ast_module)
+
+        def streamed():
+            for _ in parse_statements(io.StringIO(code), globals_=namespace, locals_=namespace,
+                                      ast_module=ast_module):
+                pass
+
+        for name, function in (('parse whole module', whole), ('parse statements', streamed)):
+            seconds = measure(function, repeat=1)
+            peak = peak_memory(function)
+            print('{:<40} {:>10.2f} ms {:>10.1f} MiB peak'
+                  .format(name, seconds * 1000, peak / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
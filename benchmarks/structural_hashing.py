@@ -0,0 +1,25 @@
+"""Measure structural hashing of all subtrees."""
+
+import ast
+
+from static_typing.ast_manipulation import StructuralHasher
+from static_typing.augment import augment
+from .common import synthetic_module, count_nodes, measure, report
+
+
+def main():
+    ast_module = ast
+    for functions, classes in ((100, 20), (1000, 200)):
+        code = synthetic_module(functions, classes)
+        tree = ast_module.parse(code, type_comments=True)
+        nodes = count_nodes(tree, ast_module)
+        print('module with {} functions and {} classes, {} nodes'
+              .format(functions, classes, nodes))
+        report('hash all subtrees', measure(lambda: StructuralHasher[ast_module]().visit(tree)),
+               nodes)
+        report('augment, for comparison', measure(
+            lambda: augment(ast_module.parse(code, type_comments=True))), nodes)
+
+
+if __name__ == '__main__':
+    main()
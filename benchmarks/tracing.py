@@ -0,0 +1,44 @@
+"""Measure overhead of per-node logging in traversals, which tracers replaced.
+
+Before tracers, traversals called a logger for every node and every field even when logging
+was disabled. Passing a disabled logger's debug() as the tracer reproduces that overhead.
+"""
+
+import ast
+import logging
+
+from static_typing.ast_manipulation import RecursiveAstTransformer, RecursiveAstVisitor
+from static_typing.augment import augment
+from .common import synthetic_module, count_nodes, measure, report
+
+
+def main():
+    ast_module = ast
+    disabled_logger = logging.getLogger('benchmarks.tracing')
+    disabled_logger.setLevel(logging.WARNING)
+    for functions, classes in ((100, 20), (1000, 200)):
+        code = synthetic_module(functions, classes)
+        tree = ast_module.parse(code, type_comments=True)
+        nodes = count_nodes(tree, ast_module)
+        print('module with {} functions and {} classes, {} nodes'
+              .format(functions, classes, nodes))
+        for traversal_name, traversal_type in (
+                ('visitor', RecursiveAstVisitor), ('transformer', RecursiveAstTransformer)):
+            results = {}
+            for name, tracer in (('no tracer', None), ('disabled logging', disabled_logger.debug)):
+                results[name] = measure(
+                    lambda: traversal_type[ast_module](tracer=tracer).visit(tree))
+                report('{}, {}'.format(traversal_name, name), results[name], nodes)
+            print('overhead removed: {:.0%}'.format(
+                results['disabled logging'] / results['no tracer'] - 1))
+        results = {}
+        for name, tracer in (('no tracer', None), ('disabled logging', disabled_logger.debug)):
+            results[name] = measure(lambda: augment(
+                ast_module.parse(code, type_comments=True), tracer=tracer))
+            report('parse and augment, {}'.format(name), results[name], nodes)
+        print('overhead removed: {:.0%}'.format(
+            results['disabled logging'] / results['no tracer'] - 1))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Compare augmenting the tree with building a detached type index of it."""
+
+import ast
+import copy
+import gc
+import time
+import tracemalloc
+
+from static_typing.augment import augment
+from .common import synthetic_module, count_nodes, report
+
+VARIANTS = {
+    'tree, copying nodes': {'in_place': False},
+    'tree, in place': {'in_place': True},
+    'tree, in place in a deep copy': {'in_place': True, 'deep_copy': True},
+    'index': {'mode': 'index'}}
+"""Ways of augmenting a tree. Only the last two leave the original tree intact."""
+
+
+def augment_variant(tree, ast_module, deep_copy: bool = False, **kwargs):
+    if deep_copy:
+        tree = copy.deepcopy(tree)
+    return augment(tree, ast_module=ast_module, **kwargs)
+
+
+def measure_memory(function) -> tuple:
+    """Return peak and retained size (in bytes) of memory allocated by the function."""
+    tracemalloc.start()
+    try:
+        result = function()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak, retained
+
+
+def measure_with_gc(code, ast_module, kwargs, repeat: int = 5) -> float:
+    """Return the best time of augmenting the code, with garbage collection enabled.
+
+    Garbage left by previous measurements is collected first, so that it is not counted.
+    """
+    gc.collect()
+    times = []
+    for _ in range(repeat):
+        tree = ast_module.parse(code, type_comments=True)
+        start = time.perf_counter()
+        augment_variant(tree, ast_module, **kwargs)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    ast_module = ast
+    for functions, classes in ((100, 20), (1000, 200)):
+        code = synthetic_module(functions, classes)
+        nodes = count_nodes(ast_module.parse(code, type_comments=True), ast_module)
+        print('module with {} functions and {} classes, {} nodes'
+              .format(functions, classes, nodes))
+        for name, kwargs in VARIANTS.items():
+            report(name, measure_with_gc(code, ast_module, kwargs), nodes)
+            tree = ast_module.parse(code, type_comments=True)
+            peak, retained = measure_memory(
+                lambda: augment_variant(tree, ast_module, **kwargs))
+            print('{:<40} {:>10.2f} MiB peak, {:.2f} MiB retained'
+                  .format('', peak / 1024 ** 2, retained / 1024 ** 2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Measure memory held by type sets after augmenting a whole project.
+
+Usage: python -m benchmarks.type_sets [PROJECT_PATH]
+
+By default, the project is the Python standard library (without site-packages).
+Files that cannot be augmented (e.g. because of unsupported constructs) are skipped.
+"""
+
+import ast
+import gc
+import logging
+import pathlib
+import sys
+import sysconfig
+import tracemalloc
+
+import ordered_set
+
+from static_typing.augment import augment
+from static_typing.nodes import StaticallyTyped, TypeSet
+
+TYPE_SET_FIELDS = (
+    '_module_vars', '_params', '_local_vars', '_nonlocal_assignments', '_class_fields',
+    '_instance_fields')
+
+
+def augment_project(paths):
+    trees = []
+    for path in paths:
+        try:
+            tree = ast.parse(path.read_text(encoding='utf-8'), str(path), type_comments=True)
+            trees.append(augment(tree, ast_module=ast))
+        except Exception:  # pylint: disable=broad-except
+            continue
+    return trees
+
+
+def type_set_fields(trees):
+    for tree in trees:
+        for node in ast.walk(tree):
+            if isinstance(node, StaticallyTyped[ast]):
+                for field_name in TYPE_SET_FIELDS:
+                    field = getattr(node, field_name, None)
+                    if field:
+                        yield field
+
+
+def convert_to_ordered_sets(trees) -> None:
+    """Replace type sets with ordered sets, like they were stored before type sets existed."""
+    for field in type_set_fields(trees):
+        for key, value in field.items():
+            if isinstance(value, TypeSet):
+                field[key] = ordered_set.OrderedSet(value)
+
+
+def traced_size() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    project_path = pathlib.Path(
+        sys.argv[1] if len(sys.argv) > 1 else sysconfig.get_paths()['stdlib'])
+    paths = sorted(path for path in project_path.glob('**/*.py')
+                   if 'site-packages' not in path.relative_to(project_path).parts)
+    trees = augment_project(paths)
+    variables = sum(len(field) for field in type_set_fields(trees))
+    type_sets = len({id(value) for field in type_set_fields(trees) for value in field.values()})
+    print('augmented {} of {} files in {}: {} variables with {} distinct type sets'
+          .format(len(trees), len(paths), project_path, variables, type_sets))
+    del trees
+
+    tracemalloc.start()
+    baseline = traced_size()
+    trees = augment_project(paths)
+    with_type_sets = traced_size() - baseline
+    convert_to_ordered_sets(trees)
+    with_ordered_sets = traced_size() - baseline
+    tracemalloc.stop()
+    print('{:<40} {:>10.2f} MiB'.format('augmented ASTs, ordered sets',
+                                        with_ordered_sets / 1024 ** 2))
+    print('{:<40} {:>10.2f} MiB'.format('augmented ASTs, interned type sets',
+                                        with_type_sets / 1024 ** 2))
+    print('saved: {:.2f} MiB, i.e. {:.0f} bytes per variable'.format(
+        (with_ordered_sets - with_type_sets) / 1024 ** 2,
+        (with_ordered_sets - with_type_sets) / max(variables, 1)))
+
+
+if __name__ == '__main__':
+    main()
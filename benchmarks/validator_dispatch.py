@@ -0,0 +1,46 @@
+"""Compare table-driven dispatch in AstValidator with trying all node types for each node."""
+
+import ast
+import itertools
+
+from static_typing.ast_manipulation import AstValidator
+from .common import synthetic_module, count_nodes, measure, report
+
+
+def create_legacy_ast_validator(ast_module):
+
+    class LegacyAstValidator(AstValidator[ast_module]):
+
+        def visit_node(self, node):
+            assert isinstance(node, ast_module.AST), type(node)
+            if isinstance(node, self.empty_nodes):
+                return
+            for node_type in itertools.chain(
+                    self.module_types, self.statement_types, self.expression_types,
+                    self.slice_types, self.inner_types):
+                validator_name = 'validate_{}'.format(node_type.__name__)
+                if isinstance(node, node_type) and hasattr(self, validator_name):
+                    getattr(self, validator_name)(node)
+                    return
+
+    return LegacyAstValidator
+
+
+def main():
+    ast_module = ast
+    legacy_validator = create_legacy_ast_validator(ast_module)
+    for functions, classes, table_rows in ((100, 20, 0), (1000, 200, 0), (1000, 200, 10000)):
+        code = synthetic_module(functions, classes, table_rows)
+        tree = ast_module.parse(code)
+        nodes = count_nodes(tree, ast_module)
+        print('module with {} functions, {} classes and {} table rows, {} nodes'
+              .format(functions, classes, table_rows, nodes))
+        legacy = measure(lambda: legacy_validator().visit(tree))
+        table_driven = measure(lambda: AstValidator[ast_module]().visit(tree))
+        report('dispatch trying all node types', legacy, nodes)
+        report('table-driven dispatch', table_driven, nodes)
+        print('speedup: {:.2f}x'.format(legacy / table_driven))
+
+
+if __name__ == '__main__':
+    main()
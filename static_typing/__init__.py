@@ -5,9 +5,14 @@ from typed_astunparse import dump
 from .generic import GenericVar
 from .numpy_types import ndarray
 
-from .augment import augment
+from .augment import augment, reaugment
+from .augmentation_stats import AugmentationStats
+from .type_index import TypeIndex
 from .parse import parse
+from .parse_files import parse_files
+from .parse_statements import parse_statements
 from .unparse import unparse
 
 __all__ = [
-    'dump', 'GenericVar', 'ndarray', 'augment', 'parse', 'unparse']
+    'dump', 'GenericVar', 'ndarray', 'augment', 'reaugment', 'AugmentationStats', 'TypeIndex',
+    'parse', 'parse_files', 'parse_statements', 'unparse']
@@ -1,11 +1,17 @@
 """Collection of general-purpose tools for AST manipulation."""
 
-from .recursive_ast_visitor import RecursiveAstVisitor
+from .recursive_ast_visitor import RecursiveAstVisitor, EXPRESSION_NODE_TYPES
 from .ast_validator import AstValidator
 from .recursive_ast_transformer import RecursiveAstTransformer
 from .ast_transcriber import AstTranscriber
-from .type_hint_resolver import TypeHintResolver
+from .type_hint_resolver import TypeHintCache, TypeHintResolver
+from .structural_hasher import StructuralHasher
+from .tracing import Tracer, create_logging_tracer
+from .profiling import ProfilingMixin
+from .composite_visitor import CompositeVisitor
 
 __all__ = [
-    'RecursiveAstVisitor', 'AstValidator',
-    'RecursiveAstTransformer', 'AstTranscriber', 'TypeHintResolver']
+    'RecursiveAstVisitor', 'EXPRESSION_NODE_TYPES', 'AstValidator',
+    'RecursiveAstTransformer', 'AstTranscriber', 'TypeHintCache', 'TypeHintResolver',
+    'StructuralHasher', 'Tracer', 'create_logging_tracer', 'ProfilingMixin',
+    'CompositeVisitor']
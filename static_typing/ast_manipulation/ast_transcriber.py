@@ -6,6 +6,7 @@ import logging
 
 import typed_ast.ast3
 
+from .node_schema import field_kinds, known_fields
 from .recursive_ast_transformer import RecursiveAstTransformer
 
 _LOG = logging.getLogger(__name__)
@@ -14,16 +15,27 @@ _LOG = logging.getLogger(__name__)
 def transcribe(from_ast_module, node: object, to_ast_module, target_type: type,
                extra_fields: collections.abc.Iterable = ()) -> object:
     """Forcibly instantiate new AST node type with data from given AST node."""
-    node_fields = {k: v for k, v in from_ast_module.iter_fields(node)}
+    node_fields = {}
+    for name, _ in field_kinds(type(node)):
+        try:
+            node_fields[name] = getattr(node, name)
+        except AttributeError:
+            pass
     for extra_field in extra_fields:
         if hasattr(node, extra_field):
             node_fields[extra_field] = getattr(node, extra_field)
-    _LOG.debug('constructor params are %s', node_fields)
     transcribed_node = target_type(**node_fields)
     to_ast_module.copy_location(transcribed_node, node)
-    custom_fields = set(vars(node)) - set(node._fields) - set(node._attributes)
-    for custom_field in custom_fields:
-        setattr(transcribed_node, custom_field, getattr(node, custom_field))
+    for end_attribute, attribute in (('end_lineno', 'lineno'), ('end_col_offset', 'col_offset')):
+        # end position is required to compile AST but it is not available in typed_ast
+        if end_attribute in getattr(transcribed_node, '_attributes', ()) \
+                and getattr(transcribed_node, end_attribute, None) is None \
+                and getattr(transcribed_node, attribute, None) is not None:
+            setattr(transcribed_node, end_attribute, getattr(transcribed_node, attribute))
+    node_known_fields = known_fields(type(node))
+    for custom_field, value in vars(node).items():
+        if custom_field not in node_known_fields:
+            setattr(transcribed_node, custom_field, value)
     return transcribed_node
 
 
@@ -39,12 +51,27 @@ def create_ast_transcriber(from_ast_module, to_ast_module):
         (at least in case of a given transcribed tree).
         """
 
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._target_types = {}
+
         def visit_node(self, node):
             """Retype given node, assuming type compatibility."""
-            _LOG.info('remapping %s from %s to %s', node, from_ast_module, to_ast_module)
-            target_type = getattr(to_ast_module, type(node).__name__)
-            _LOG.debug('target type is %s', target_type)
+            node_type = type(node)
+            try:
+                target_type = self._target_types[node_type]
+            except KeyError:
+                target_type = getattr(to_ast_module, node_type.__name__)
+                _LOG.debug('target type is %s', target_type)
+                self._target_types[node_type] = target_type
+            if self._tracer is not None:
+                self._tracer('transcribe', node, target_type)
             transcribed_node = transcribe(from_ast_module, node, to_ast_module, target_type)
+            if isinstance(transcribed_node, from_ast_module.AST) \
+                    and not isinstance(transcribed_node, to_ast_module.AST):
+                # target type is only a compatibility shim that returned one of its fields,
+                # e.g. Index in Python 3.9 and later
+                return self.visit_node(transcribed_node)
             return transcribed_node
 
     return AstTranscriberClass
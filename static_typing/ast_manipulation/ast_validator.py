@@ -15,6 +15,15 @@ from .recursive_ast_visitor import RecursiveAstVisitor
 _LOG = logging.getLogger(__name__)
 
 
+def _has_custom_instance_check(type_: type) -> bool:
+    """Check if instances of a given type are recognized by something else than their class.
+
+    That is the case with deprecated node types of built-in ast module, like Num or Str,
+    which since Python 3.8 are recognized among instances of Constant by their values.
+    """
+    return type(type_).__instancecheck__ is not type.__instancecheck__
+
+
 def create_ast_validator(ast_module):
     """Create an AST validator for an AST module assumed to be compatible with latest AST."""
 
@@ -163,6 +172,10 @@ def create_ast_validator(ast_module):
                   | Index(expr value)
         """
 
+        if ast_module is ast and sys.version_info[:2] >= (3, 9):
+            slice_types = (ast_module.Slice,) + expression_types
+            """Since Python 3.9, slices are expressions, and Slice is just one of them."""
+
         boolean_operator_types = (ast_module.And, ast_module.Or)
         """
             boolop = And | Or
@@ -225,6 +238,41 @@ def create_ast_validator(ast_module):
             assert mode is None or mode in {'exec', 'single', 'eval', 'strict'}, mode
             self.mode = mode
             self._working = False
+            self._dispatch_table = self._get_dispatch_table()
+
+        @classmethod
+        def _get_dispatch_table(cls) -> t.Dict[type, tuple]:
+            """Get table of validators by node type, shared by all instances of this class.
+
+            The table is filled lazily by _find_validators().
+            """
+            if '_validators' not in vars(cls):
+                cls._validators = tuple(itertools.chain(
+                    ((node_type, None) for node_type in cls.empty_nodes),
+                    ((node_type, getattr(cls, 'validate_{}'.format(node_type.__name__)))
+                     for node_type in itertools.chain(
+                         cls.module_types, cls.statement_types, cls.expression_types,
+                         cls.slice_types, cls.inner_types)
+                     if hasattr(cls, 'validate_{}'.format(node_type.__name__)))))
+                cls._dispatch_table_of_class = {}
+            return cls._dispatch_table_of_class
+
+        def _find_validators(self, node_type: type) -> tuple:
+            """Find validators that can be applicable to nodes of a given type.
+
+            The result is a sequence of (type, validator) pairs in order of precedence,
+            where validator None means that there is nothing to validate. The type is None
+            in the last pair if the validator applies to all nodes of given type, otherwise
+            the validator applies only to nodes that are instances of the given type.
+            """
+            validators = []
+            for validated_type, validator in self._validators:
+                if issubclass(node_type, validated_type):
+                    validators.append((None, validator))
+                    break
+                if _has_custom_instance_check(validated_type):
+                    validators.append((validated_type, validator))
+            return tuple(validators)
 
         def _validate_items_in(
                 self, syntax, field_name: str, item_validator: t.Union[type, callable],
@@ -724,15 +772,17 @@ def create_ast_validator(ast_module):
             """Validate just the given node."""
             assert isinstance(node, ast_module.AST), type(node)
 
-            if isinstance(node, self.empty_nodes):
-                return
-
-            for node_type in itertools.chain(
-                    self.module_types, self.statement_types, self.expression_types,
-                    self.slice_types, self.inner_types):
-                validator_name = 'validate_{}'.format(node_type.__name__)
-                if isinstance(node, node_type) and hasattr(self, validator_name):
-                    getattr(self, validator_name)(node)
+            node_type = type(node)
+            try:
+                validators = self._dispatch_table[node_type]
+            except KeyError:
+                validators = self._find_validators(node_type)
+                self._dispatch_table[node_type] = validators
+
+            for validated_type, validator in validators:
+                if validated_type is None or isinstance(node, validated_type):
+                    if validator is not None:
+                        validator(self, node)
                     return
 
             _LOG.warning('no validatation available for %s', type(node))
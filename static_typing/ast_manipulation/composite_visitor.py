@@ -0,0 +1,151 @@
+"""Run many visitors over a given AST in a single traversal."""
+
+import ast
+import logging
+import typing as t
+
+import typed_ast.ast3
+
+from .node_schema import FieldKind
+from .recursive_ast_visitor import RecursiveAstVisitor
+
+_LOG = logging.getLogger(__name__)
+
+
+def create_composite_visitor(ast_module):
+    """Create CompositeVisitor class based on a given AST module."""
+
+    class CompositeVisitorClass(RecursiveAstVisitor[ast_module]):
+
+        """Dispatch visit_node() and visit_field() of every node to many visitors in one traversal.
+
+        Given visitors are instances of RecursiveAstVisitor subclasses. Each of them is called
+        in the same order, and with the same arguments, as if it traversed the tree on its own:
+        visit_node() is called before fields of the node are visited, or after that
+        if the visitor was created with fields_first=True. Subtrees rooted at nodes
+        of pruned_node_types of a visitor are skipped for that visitor, and a subtree is not
+        traversed at all if all visitors skip it. Scalar fields are inspected only if any
+        visitor overrides visit_field(), and then they are passed only to such visitors.
+
+        If iterative is True, the tree is traversed using an explicit stack, like in case
+        of RecursiveAstVisitor. If tracer is given, it receives events of the combined traversal,
+        while tracers of the given visitors are not used.
+
+        Custom visit_<NodeType>() methods of the given visitors are not used. Visitors that
+        override visit() (e.g. AstValidator, which checks the root there) are not supported,
+        because the composite traversal never calls it. Transformers are not supported either,
+        because nodes returned by their visit_node() would be lost.
+        """
+
+        def __init__(self, visitors: t.Sequence[t.Any], *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            if self._fields_first:
+                raise ValueError('fields_first is not supported by {}, because order of visiting'
+                                 ' nodes is decided by each visitor'.format(type(self).__name__))
+            for visitor in visitors:
+                if not isinstance(visitor, RecursiveAstVisitor[ast_module]) \
+                        or isinstance(visitor, ast_module.NodeTransformer):
+                    raise TypeError('{} is not a RecursiveAstVisitor[{}]'
+                                    .format(visitor, ast_module.__name__))
+                if type(visitor).visit is not ast_module.NodeVisitor.visit:
+                    raise TypeError('{} overrides visit(), which would be bypassed by {}'
+                                    .format(visitor, type(self).__name__))
+            self.visitors = tuple(visitors)
+            self._visits_scalars = any(visitor._visits_scalars for visitor in self.visitors)
+            self._active_visitors_table = {}
+            self._roles_table = {}
+
+        def _active_visitors(self, visitors: tuple, node) -> tuple:
+            """Get those of the given visitors that do not skip the subtree rooted at the node."""
+            try:
+                return self._active_visitors_table[visitors, type(node)]
+            except KeyError:
+                active = tuple(visitor for visitor in visitors if not visitor._is_pruned(node))
+                self._active_visitors_table[visitors, type(node)] = active
+                return active
+
+        def _roles(self, visitors: tuple) -> t.Tuple[tuple, tuple, tuple]:
+            """Split visitors into those that visit nodes before fields, after fields,
+            and those that visit scalar fields."""
+            try:
+                return self._roles_table[visitors]
+            except KeyError:
+                roles = (tuple(visitor for visitor in visitors if not visitor._fields_first),
+                         tuple(visitor for visitor in visitors if visitor._fields_first),
+                         tuple(visitor for visitor in visitors if visitor._visits_scalars))
+                self._roles_table[visitors] = roles
+                return roles
+
+        def generic_visit(self, node):
+            if not self._iterative:
+                self._visit_subtree(node, self.visitors)
+                return
+            stack = [self._iterate_node(node, self.visitors)]
+            while stack:
+                for child, visitors in stack[-1]:
+                    stack.append(self._iterate_node(child, visitors))
+                    break
+                else:
+                    stack.pop()
+
+        def _visit_subtree(self, node, visitors: tuple):
+            for child, active in self._iterate_node(node, visitors):
+                self._visit_subtree(child, active)
+
+        def _iterate_node(self, node, visitors: tuple):
+            """Visit a given node and its fields, yielding (child, its active visitors) pairs.
+
+            This is the single implementation of the traversal of a node: the yielded children
+            are visited recursively by _visit_subtree(), or in iterative mode using an explicit
+            stack by generic_visit().
+            """
+            tracer = self._tracer
+            nodes_first, fields_first, _ = self._roles(visitors)
+            if tracer is not None:
+                tracer('visit_node', node)
+            for visitor in nodes_first:
+                visitor.visit_node(node)
+            if tracer is not None:
+                tracer('visit_fields', node)
+            for name, kind in self._field_kinds(type(node)):
+                try:
+                    value = getattr(node, name)
+                except AttributeError:
+                    continue
+                if kind is FieldKind.Node and hasattr(value, '_fields'):
+                    active = self._active_visitors(visitors, value)
+                    if active:
+                        yield value, active
+                elif kind is FieldKind.NodeList and isinstance(value, list):
+                    for i, subnode in enumerate(value):
+                        if hasattr(subnode, '_fields'):
+                            active = self._active_visitors(visitors, subnode)
+                            if active:
+                                yield subnode, active
+                        elif self._visits_scalars:
+                            yield from self._iterate_field(value, i, subnode, visitors)
+                elif kind is not FieldKind.Node or self._visits_scalars:
+                    yield from self._iterate_field(node, name, value, visitors)
+            for visitor in fields_first:
+                visitor.visit_node(node)
+
+        def _iterate_field(self, node, name, value: t.Any, visitors: tuple):
+            """Handle a field in the same way as generic_visit_field() of each visitor would."""
+            if self._tracer is not None:
+                self._tracer('visit_field', node, name)
+            if isinstance(value, list):
+                for i, subnode in enumerate(value):
+                    yield from self._iterate_field(value, i, subnode, visitors)
+            elif hasattr(value, '_fields') and not isinstance(value, tuple):
+                active = self._active_visitors(visitors, value)
+                if active:
+                    yield value, active
+            else:
+                for visitor in self._roles(visitors)[2]:
+                    visitor.visit_field(node, name, value)
+
+    return CompositeVisitorClass
+
+
+CompositeVisitor = {ast_module: create_composite_visitor(ast_module)
+                    for ast_module in (ast, typed_ast.ast3)}
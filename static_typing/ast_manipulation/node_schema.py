@@ -0,0 +1,219 @@
+"""Precomputed kinds of fields of AST nodes, derived from ASDL definitions."""
+
+import enum
+import logging
+import re
+import typing as t
+
+_LOG = logging.getLogger(__name__)
+
+ASDL = """
+    mod = Module(stmt* body, type_ignore* type_ignores)
+        | Interactive(stmt* body)
+        | Expression(expr body)
+        | FunctionType(expr* argtypes, expr returns)
+        | Suite(stmt* body)
+
+    stmt = FunctionDef(identifier name, arguments args, stmt* body, expr* decorator_list,
+                       expr? returns, string? type_comment, type_param* type_params)
+          | AsyncFunctionDef(identifier name, arguments args, stmt* body, expr* decorator_list,
+                             expr? returns, string? type_comment, type_param* type_params)
+          | ClassDef(identifier name, expr* bases, keyword* keywords, stmt* body,
+                     expr* decorator_list, type_param* type_params)
+          | Return(expr? value)
+          | Delete(expr* targets)
+          | Assign(expr* targets, expr value, string? type_comment)
+          | TypeAlias(expr name, type_param* type_params, expr value)
+          | AugAssign(expr target, operator op, expr value)
+          | AnnAssign(expr target, expr annotation, expr? value, int simple)
+          | For(expr target, expr iter, stmt* body, stmt* orelse, string? type_comment)
+          | AsyncFor(expr target, expr iter, stmt* body, stmt* orelse, string? type_comment)
+          | While(expr test, stmt* body, stmt* orelse)
+          | If(expr test, stmt* body, stmt* orelse)
+          | With(withitem* items, stmt* body, string? type_comment)
+          | AsyncWith(withitem* items, stmt* body, string? type_comment)
+          | Match(expr subject, match_case* cases)
+          | Raise(expr? exc, expr? cause)
+          | Try(stmt* body, excepthandler* handlers, stmt* orelse, stmt* finalbody)
+          | TryStar(stmt* body, excepthandler* handlers, stmt* orelse, stmt* finalbody)
+          | Assert(expr test, expr? msg)
+          | Import(alias* names)
+          | ImportFrom(identifier? module, alias* names, int? level)
+          | Global(identifier* names)
+          | Nonlocal(identifier* names)
+          | Expr(expr value)
+          | Pass | Break | Continue
+
+    expr = BoolOp(boolop op, expr* values)
+         | NamedExpr(expr target, expr value)
+         | BinOp(expr left, operator op, expr right)
+         | UnaryOp(unaryop op, expr operand)
+         | Lambda(arguments args, expr body)
+         | IfExp(expr test, expr body, expr orelse)
+         | Dict(expr* keys, expr* values)
+         | Set(expr* elts)
+         | ListComp(expr elt, comprehension* generators)
+         | SetComp(expr elt, comprehension* generators)
+         | DictComp(expr key, expr value, comprehension* generators)
+         | GeneratorExp(expr elt, comprehension* generators)
+         | Await(expr value)
+         | Yield(expr? value)
+         | YieldFrom(expr value)
+         | Compare(expr left, cmpop* ops, expr* comparators)
+         | Call(expr func, expr* args, keyword* keywords)
+         | Num(object n)
+         | Str(string s, string kind)
+         | FormattedValue(expr value, int? conversion, expr? format_spec)
+         | JoinedStr(expr* values)
+         | Bytes(bytes s, string? kind)
+         | NameConstant(singleton value, string? kind)
+         | Ellipsis
+         | Constant(constant value, string? kind)
+         | Attribute(expr value, identifier attr, expr_context ctx)
+         | Subscript(expr value, slice slice, expr_context ctx)
+         | Starred(expr value, expr_context ctx)
+         | Name(identifier id, expr_context ctx)
+         | List(expr* elts, expr_context ctx)
+         | Tuple(expr* elts, expr_context ctx)
+         | Slice(expr? lower, expr? upper, expr? step)
+
+    expr_context = Load | Store | Del | AugLoad | AugStore | Param
+
+    slice = ExtSlice(slice* dims)
+          | Index(expr value)
+
+    boolop = And | Or
+
+    operator = Add | Sub | Mult | MatMult | Div | Mod | Pow | LShift
+             | RShift | BitOr | BitXor | BitAnd | FloorDiv
+
+    unaryop = Invert | Not | UAdd | USub
+
+    cmpop = Eq | NotEq | Lt | LtE | Gt | GtE | Is | IsNot | In | NotIn
+
+    comprehension = (expr target, expr iter, expr* ifs, int is_async)
+
+    excepthandler = ExceptHandler(expr? type, identifier? name, stmt* body)
+
+    arguments = (arg* posonlyargs, arg* args, arg? vararg, arg* kwonlyargs,
+                 expr* kw_defaults, arg? kwarg, expr* defaults)
+
+    arg = (identifier arg, expr? annotation, string? type_comment)
+
+    keyword = (identifier? arg, expr value)
+
+    alias = (identifier name, identifier? asname)
+
+    withitem = (expr context_expr, expr? optional_vars)
+
+    match_case = (pattern pattern, expr? guard, stmt* body)
+
+    pattern = MatchValue(expr value)
+            | MatchSingleton(constant value)
+            | MatchSequence(pattern* patterns)
+            | MatchMapping(expr* keys, pattern* patterns, identifier? rest)
+            | MatchClass(expr cls, pattern* patterns, identifier* kwd_attrs,
+                         pattern* kwd_patterns)
+            | MatchStar(identifier? name)
+            | MatchAs(pattern? pattern, identifier? name)
+            | MatchOr(pattern* patterns)
+
+    type_ignore = TypeIgnore(int lineno, string tag)
+
+    type_param = TypeVar(identifier name, expr? bound, expr? default_value)
+               | ParamSpec(identifier name, expr? default_value)
+               | TypeVarTuple(identifier name, expr? default_value)
+"""
+"""Abstract grammar of all supported versions of built-in ast module and of typed_ast.ast3.
+
+It is a union of the definitions, so some of the listed fields might be absent in a given
+AST module. Attributes (like lineno) are omitted, as they are not fields.
+"""
+
+ASDL_BUILTIN_TYPES = {'identifier', 'int', 'string', 'bytes', 'object', 'singleton', 'constant'}
+
+
+class FieldKind(enum.Enum):
+
+    """Kind of values stored in a field of AST node."""
+
+    Node = 'node'
+    """Single node, or None if the field is optional."""
+
+    NodeList = 'node list'
+    """List of nodes."""
+
+    Scalar = 'scalar'
+    """Value of a built-in ASDL type, like identifier or int."""
+
+    ScalarList = 'scalar list'
+    """List of values of a built-in ASDL type."""
+
+    Dynamic = 'dynamic'
+    """Field not described in ASDL, its contents must be inspected at runtime."""
+
+
+_ASDL_COMMENT = re.compile(r'--[^\n]*')
+
+_ASDL_CONSTRUCTOR = re.compile(r'(\w+)\s*(?:=\s*)?\(([^()]*)\)')
+
+
+def parse_asdl(asdl: str) -> t.Dict[str, t.Dict[str, FieldKind]]:
+    """Get kinds of fields of all constructors and product types defined in ASDL."""
+    asdl = _ASDL_COMMENT.sub('', asdl)
+    constructors = {}
+    for name, fields in _ASDL_CONSTRUCTOR.findall(asdl):
+        if name == 'attributes':
+            continue
+        field_kinds = {}
+        for field in fields.split(','):
+            field_type, field_name = field.split()
+            is_sequence = field_type.endswith('*')
+            field_type = field_type.rstrip('*?')
+            if field_type in ASDL_BUILTIN_TYPES:
+                kind = FieldKind.ScalarList if is_sequence else FieldKind.Scalar
+            else:
+                kind = FieldKind.NodeList if is_sequence else FieldKind.Node
+            field_kinds[field_name] = kind
+        constructors[name] = field_kinds
+    return constructors
+
+
+FIELD_KINDS_BY_NODE_NAME = parse_asdl(ASDL)
+
+_FIELD_KINDS = {}
+
+_KNOWN_FIELDS = {}
+
+
+def field_kinds(node_type: type) -> t.Tuple[t.Tuple[str, FieldKind], ...]:
+    """Get names and kinds of all fields of a given AST node type, in order of _fields.
+
+    The node type is matched with ASDL constructors by name of the first class in its MRO
+    that is described in ASDL, so subclasses of AST nodes have the same schema as their bases.
+    Results are cached.
+    """
+    try:
+        return _FIELD_KINDS[node_type]
+    except KeyError:
+        pass
+    kinds = {}
+    for base_type in node_type.__mro__:
+        if base_type.__name__ in FIELD_KINDS_BY_NODE_NAME:
+            kinds = FIELD_KINDS_BY_NODE_NAME[base_type.__name__]
+            break
+    schema = tuple((name, kinds.get(name, FieldKind.Dynamic)) for name in node_type._fields)
+    if any(kind is FieldKind.Dynamic for _, kind in schema):
+        _LOG.debug('some fields of %s are not described in ASDL: %s', node_type, schema)
+    _FIELD_KINDS[node_type] = schema
+    return schema
+
+
+def known_fields(node_type: type) -> t.FrozenSet[str]:
+    """Get names of all fields and attributes of a given AST node type. Results are cached."""
+    try:
+        return _KNOWN_FIELDS[node_type]
+    except KeyError:
+        fields = frozenset(node_type._fields) | frozenset(node_type._attributes)
+        _KNOWN_FIELDS[node_type] = fields
+        return fields
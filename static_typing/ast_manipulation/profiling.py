@@ -0,0 +1,101 @@
+"""Measure how much time custom visitors spend in nodes of each type and in each field."""
+
+import logging
+import time
+import typing as t
+
+from .recursive_ast_visitor import _NO_OP_FIELD_VISITORS
+
+_LOG = logging.getLogger(__name__)
+
+try:
+    _perf_counter_ns = time.perf_counter_ns
+except AttributeError:  # Python < 3.7
+    def _perf_counter_ns() -> int:
+        return int(time.perf_counter() * 1e9)
+
+_LIST_ITEM = '[item]'
+"""Name under which items of lists are profiled, instead of their indices."""
+
+
+class ProfilingMixin:
+
+    """Profile visit_node() and visit_field() of any RecursiveAstVisitor or RecursiveAstTransformer.
+
+    The mixin has to precede the visitor in bases of the profiled class, e.g.:
+
+        class ProfiledVisitor(ProfilingMixin, MyVisitor):
+            pass
+
+    Number of calls and cumulative time (measured using perf_counter_ns(), or perf_counter()
+    where it is not available) are gathered per node type in node_profile, and per field name
+    in field_profile. Only time spent in visit_node() and visit_field() themselves is measured --
+    traversal of children is not included. Custom visit_<NodeType>() methods are not profiled.
+
+    If visit_field() of the visitor does nothing, it is not profiled, so that the visitor
+    still skips scalar fields entirely.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if type(self).visit_field is ProfilingMixin.visit_field \
+                and self._profiled_visit_field() in _NO_OP_FIELD_VISITORS \
+                and not self._visits_fields_generically:
+            self._visits_scalars = False
+        self.node_profile = {}  # type: t.Dict[type, t.List[int]]
+        self.field_profile = {}  # type: t.Dict[str, t.List[int]]
+
+    def _profiled_visit_field(self) -> t.Optional[t.Callable]:
+        """Get visit_field() which is wrapped by this mixin."""
+        mro = type(self).__mro__
+        for base in mro[mro.index(ProfilingMixin) + 1:]:
+            if 'visit_field' in vars(base):
+                return vars(base)['visit_field']
+        return None
+
+    def visit_node(self, node):
+        start = _perf_counter_ns()
+        try:
+            return super().visit_node(node)
+        finally:
+            elapsed = _perf_counter_ns() - start
+            entry = self.node_profile.get(type(node))
+            if entry is None:
+                entry = self.node_profile[type(node)] = [0, 0]
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def visit_field(self, node, name, value):
+        start = _perf_counter_ns()
+        try:
+            return super().visit_field(node, name, value)
+        finally:
+            elapsed = _perf_counter_ns() - start
+            if not isinstance(name, str):
+                name = _LIST_ITEM
+            entry = self.field_profile.get(name)
+            if entry is None:
+                entry = self.field_profile[name] = [0, 0]
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def profile(self) -> t.List[t.Tuple[str, str, int, int]]:
+        """Get (kind, name, calls, nanoseconds) tuples, sorted by time in descending order.
+
+        Kind is either 'node' (and then name is name of node type) or 'field'.
+        """
+        rows = [('node', node_type.__name__, calls, nanoseconds)
+                for node_type, (calls, nanoseconds) in self.node_profile.items()]
+        rows += [('field', name, calls, nanoseconds)
+                 for name, (calls, nanoseconds) in self.field_profile.items()]
+        rows.sort(key=lambda row: (-row[3], -row[2], row[0], row[1]))
+        return rows
+
+    def profile_report(self, limit: t.Optional[int] = None) -> str:
+        """Format profile as a table, optionally limited to a given number of hottest rows."""
+        lines = ['{:<6} {:<30} {:>10} {:>12} {:>12}'.format(
+            'kind', 'name', 'calls', 'total ms', 'per call us')]
+        for kind, name, calls, nanoseconds in self.profile()[:limit]:
+            lines.append('{:<6} {:<30} {:>10} {:>12.3f} {:>12.3f}'.format(
+                kind, name, calls, nanoseconds / 1e6, nanoseconds / calls / 1e3))
+        return '\n'.join(lines)
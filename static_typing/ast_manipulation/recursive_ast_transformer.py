@@ -6,7 +6,8 @@ import typing as t
 
 import typed_ast.ast3
 
-from .recursive_ast_visitor import RecursiveAstVisitor
+from .recursive_ast_visitor import \
+    _DEFAULT_GENERIC_FIELD_VISITORS, _NO_OP_FIELD_VISITORS, RecursiveAstVisitor
 
 _LOG = logging.getLogger(__name__)
 
@@ -16,32 +17,27 @@ def create_recursive_ast_transformer(ast_module):
 
     class RecursiveAstTransformerClass(RecursiveAstVisitor[ast_module], ast_module.NodeTransformer):
 
-        """Recursively overwrite all nodes in a given AST."""
-
-        def generic_visit(self, node):
-            """Transform all fields of a given node."""
-            if not self._fields_first:
-                _LOG.debug('visiting node %s', node)
-                node = self.visit_node(node)
-                if isinstance(node, list):
-                    raise NotImplementedError('rewriting one node into many is supported'
-                                              ' only for field-first transformers')
-            _LOG.debug('visiting all fields of node %s', node)
-            for name, value in ast_module.iter_fields(node):
-                setattr(node, name, self.generic_visit_field(node, name, value))
-            if self._fields_first:
-                _LOG.debug('visiting node %s', node)
-                node = self.visit_node(node)
-            return node
+        """Recursively overwrite all nodes in a given AST.
+
+        Traversal is the same as in RecursiveAstVisitor, but every visited field is overwritten
+        with the result of visiting it, and every node with the result of visit_node().
+        In iterative mode, the tree is rewritten using an explicit stack instead of recursion.
+        """
+
+        _rewrites = True
 
         def generic_visit_field(self, node, name: str, value: t.Any):
             """Transform given field of a given node."""
-            _LOG.debug('visiting field %s of %s', name, node)
+            if self._tracer is not None:
+                self._tracer('visit_field', node, name)
             if isinstance(value, (str, tuple)):
                 return self.visit_field(node, name, value)
             if isinstance(value, list):
                 values = []
                 for subnode in value:
+                    if self._is_pruned(subnode):
+                        values.append(subnode)
+                        continue
                     subnode = self.visit(subnode)
                     if isinstance(subnode, list):
                         for actual_subnode in subnode:
@@ -51,6 +47,8 @@ def create_recursive_ast_transformer(ast_module):
                 # values = [self.visit(subnode) for subnode in value]
                 return values
             if hasattr(value, '_fields'):
+                if self._is_pruned(value):
+                    return value
                 return self.visit(value)
             return self.visit_field(node, name, value)
 
@@ -60,6 +58,9 @@ def create_recursive_ast_transformer(ast_module):
         def visit_field(self, node, name: str, value: t.Any):
             return value
 
+    _NO_OP_FIELD_VISITORS.add(RecursiveAstTransformerClass.visit_field)
+    _DEFAULT_GENERIC_FIELD_VISITORS.add(RecursiveAstTransformerClass.generic_visit_field)
+
     return RecursiveAstTransformerClass
 
 
@@ -6,42 +6,208 @@ import typing as t
 
 import typed_ast.ast3
 
+from .node_schema import FieldKind, field_kinds
+from .tracing import Tracer
+
 _LOG = logging.getLogger(__name__)
 
+_NO_OP_FIELD_VISITORS = set()
+"""Implementations of visit_field() that do nothing, and therefore scalar fields can be skipped."""
+
+_DEFAULT_GENERIC_FIELD_VISITORS = set()
+"""Implementations of generic_visit_field() that are equivalent to the traversal of fields."""
+
 
 def create_recursive_ast_visitor(ast_module):
     """Create RecursiveAstVisitor class based on a given AST module."""
 
     class RecursiveAstVisitorClass(ast_module.NodeVisitor):
 
-        """Perform a custom action on all nodes in a given AST."""
+        """Perform a custom action on all nodes in a given AST.
+
+        Subtrees rooted at nodes of pruned_node_types are skipped entirely, unless such node
+        is the root of the traversal.
+
+        If iterative is True, the tree is traversed using an explicit stack instead of recursion,
+        and therefore depth of the tree is not limited by the recursion limit. The order
+        of calls to visit_node() and visit_field() is the same in both modes, and nodes are
+        dispatched to visit_<NodeType>() methods like in case of NodeVisitor.visit().
+        However, overridden visit() is not used for inner nodes.
+
+        Kinds of fields are known in advance from ASDL (see node_schema module), so unless
+        visit_field() is overridden, fields that cannot contain nodes are not even inspected.
+        If generic_visit_field() is overridden, every field is visited using it instead
+        (and then child nodes are visited recursively even in iterative mode).
 
-        def __init__(self, fields_first: bool = False, *args, **kwargs):
+        If tracer is given, it is called on every visited node and field (see tracing module).
+        By default there is no tracer, and then traversal makes no tracing calls at all.
+        """
+
+        pruned_node_types = ()
+
+        _rewrites = False
+
+        def __init__(self, fields_first: bool = False, *args, iterative: bool = False,
+                     tracer: t.Optional[Tracer] = None, **kwargs):
             super().__init__(*args, **kwargs)
             self._fields_first = fields_first
+            self._iterative = iterative
+            self._tracer = tracer
+            self._pruning_table = {}
+            self._visit_methods = {}
+            self._visits_fields_generically = \
+                type(self).generic_visit_field not in _DEFAULT_GENERIC_FIELD_VISITORS
+            self._visits_scalars = self._visits_fields_generically \
+                or type(self).visit_field not in _NO_OP_FIELD_VISITORS
+            self._field_kinds_table = {}
 
-        def generic_visit(self, node):
-            """Visit a given node and all of its fields."""
+        def _field_kinds(self, node_type: type) -> t.Tuple[t.Tuple[str, FieldKind], ...]:
+            """Get names and kinds of fields that have to be visited in nodes of a given type."""
+            try:
+                return self._field_kinds_table[node_type]
+            except KeyError:
+                kinds = field_kinds(node_type)
+                if not self._visits_scalars:
+                    kinds = tuple((name, kind) for name, kind in kinds
+                                  if kind is not FieldKind.Scalar
+                                  and kind is not FieldKind.ScalarList)
+                self._field_kinds_table[node_type] = kinds
+                return kinds
+
+        def _is_pruned(self, node) -> bool:
+            """Check if subtree rooted at a given node can be skipped, in O(1) time."""
+            node_type = type(node)
+            try:
+                return self._pruning_table[node_type]
+            except KeyError:
+                pruned = issubclass(node_type, self.pruned_node_types)
+                self._pruning_table[node_type] = pruned
+                return pruned
+
+        def _visit_method(self, node) -> t.Optional[t.Callable]:
+            """Get custom method that visits a given node, or None if it is visited generically."""
+            node_type = type(node)
+            try:
+                return self._visit_methods[node_type]
+            except KeyError:
+                visit_method = getattr(self, 'visit_{}'.format(node_type.__name__), None)
+                self._visit_methods[node_type] = visit_method
+                return visit_method
+
+        def _traverse(self, node):
+            """Drive traversal of a subtree without recursion, see _iterate_node()."""
+            result = [None]
+            stack = [(self._iterate_node(node, result), result)]
+            while stack:
+                traversal, result = stack[-1]
+                for child in traversal:
+                    visit_method = self._visit_method(child)
+                    if visit_method is None:
+                        child_result = [None]
+                        stack.append((self._iterate_node(child, child_result), child_result))
+                        break
+                    result[0] = visit_method(child)
+                else:
+                    stack.pop()
+                    if stack:
+                        stack[-1][1][0] = result[0]
+            return result[0]
+
+        def _iterate_node(self, node, result: list):
+            """Visit a given node and all of its fields, yielding child nodes to be visited.
+
+            This is the single implementation of the traversal of a node: generic_visit() visits
+            yielded children recursively, or in iterative mode _traverse() visits them using
+            an explicit stack. Result of visiting each child is put into the result list
+            before the traversal is resumed, and the traversal puts its own result there
+            before it ends.
+
+            If _rewrites is True, results of visiting children overwrite the fields, and the node
+            is replaced by the result of visit_node() -- see RecursiveAstTransformer.
+            """
+            rewrites = self._rewrites
+            tracer = self._tracer
             if not self._fields_first:
-                _LOG.debug('visiting node %s', node)
-                self.visit_node(node)
-            _LOG.debug('visiting all fields of node %s', node)
-            for name, value in ast_module.iter_fields(node):
-                self.generic_visit_field(node, name, value)
+                if tracer is not None:
+                    tracer('visit_node', node)
+                visited = self.visit_node(node)
+                if rewrites:
+                    if isinstance(visited, list):
+                        raise NotImplementedError('rewriting one node into many is supported'
+                                                  ' only for field-first transformers')
+                    node = visited
+            if tracer is not None:
+                tracer('visit_fields', node)
+            if self._visits_fields_generically:
+                for name, value in ast_module.iter_fields(node):
+                    value = self.generic_visit_field(node, name, value)
+                    if rewrites:
+                        setattr(node, name, value)
+            else:
+                visits_scalars = self._visits_scalars
+                is_pruned = self._is_pruned
+                for name, kind in self._field_kinds(type(node)):
+                    try:
+                        value = getattr(node, name)
+                    except AttributeError:
+                        continue
+                    if kind is FieldKind.Node and hasattr(value, '_fields'):
+                        if is_pruned(value):
+                            continue
+                        yield value
+                        value = result[0]
+                    elif kind is FieldKind.NodeList and isinstance(value, list):
+                        values = [] if rewrites else None
+                        for i, subnode in enumerate(value):
+                            if hasattr(subnode, '_fields'):
+                                if not is_pruned(subnode):
+                                    yield subnode
+                                    subnode = result[0]
+                            elif visits_scalars:
+                                subnode = self.generic_visit_field(value, i, subnode)
+                            if not rewrites:
+                                continue
+                            if isinstance(subnode, list):
+                                values.extend(subnode)
+                            else:
+                                values.append(subnode)
+                        value = values
+                    elif kind is not FieldKind.Node or visits_scalars:
+                        value = self.generic_visit_field(node, name, value)
+                    else:
+                        continue
+                    if rewrites:
+                        setattr(node, name, value)
             if self._fields_first:
-                _LOG.debug('visiting node %s', node)
-                self.visit_node(node)
+                if tracer is not None:
+                    tracer('visit_node', node)
+                visited = self.visit_node(node)
+                if rewrites:
+                    node = visited
+            result[0] = node if rewrites else None
+
+        def generic_visit(self, node):
+            """Visit a given node and all of its fields."""
+            if self._iterative:
+                return self._traverse(node)
+            result = [None]
+            visit = self.visit
+            for child in self._iterate_node(node, result):
+                result[0] = visit(child)
+            return result[0]
 
         def generic_visit_field(self, node, name: str, value: t.Any):
             """Visit given field of a given node."""
-            _LOG.debug('visiting field %s of %s', name, node)
+            if self._tracer is not None:
+                self._tracer('visit_field', node, name)
             if isinstance(value, (str, tuple)):
                 self.visit_field(node, name, value)
             elif isinstance(value, list):
                 for i, subnode in enumerate(value):
                     self.generic_visit_field(value, i, subnode)
             elif hasattr(value, '_fields'):
-                self.visit(value)
+                if not self._is_pruned(value):
+                    self.visit(value)
             else:
                 self.visit_field(node, name, value)
 
@@ -51,8 +217,24 @@ def create_recursive_ast_visitor(ast_module):
         def visit_field(self, node, name: str, value: t.Any):
             pass
 
+    _NO_OP_FIELD_VISITORS.add(RecursiveAstVisitorClass.visit_field)
+    _DEFAULT_GENERIC_FIELD_VISITORS.add(RecursiveAstVisitorClass.generic_visit_field)
+
     return RecursiveAstVisitorClass
 
 
 RecursiveAstVisitor = {ast_module: create_recursive_ast_visitor(ast_module)
                        for ast_module in (ast, typed_ast.ast3)}
+
+EXPRESSION_NODE_TYPES = {
+    ast_module: tuple(
+        getattr(ast_module, type_name) for type_name in (
+            'expr', 'expr_context', 'slice', 'boolop', 'operator', 'unaryop', 'cmpop',
+            'comprehension', 'keyword', 'alias', 'withitem')
+        if hasattr(ast_module, type_name))
+    for ast_module in (ast, typed_ast.ast3)}
+"""Base types of nodes that can never contain any statements, nor arguments of functions.
+
+Therefore, they also can never contain type comments nor type annotations that are
+not already available in their parents.
+"""
@@ -0,0 +1,92 @@
+"""Compute structural (Merkle) hashes of all subtrees of a given AST."""
+
+import ast
+import hashlib
+import logging
+
+import typed_ast.ast3
+
+from .node_schema import FIELD_KINDS_BY_NODE_NAME, FieldKind, field_kinds
+from .recursive_ast_visitor import RecursiveAstVisitor
+
+_LOG = logging.getLogger(__name__)
+
+DIGEST_SIZE = 16
+"""Size (in bytes) of structural hashes."""
+
+_NONE_DIGEST = bytes(DIGEST_SIZE)
+
+_NODE_NAMES = {}
+
+
+def _node_name(node_type: type) -> str:
+    """Get name of the ASDL constructor of a given node type, or of the type itself."""
+    try:
+        return _NODE_NAMES[node_type]
+    except KeyError:
+        name = node_type.__name__
+        for base_type in node_type.__mro__:
+            if base_type.__name__ in FIELD_KINDS_BY_NODE_NAME:
+                name = base_type.__name__
+                break
+        _NODE_NAMES[node_type] = name
+        return name
+
+
+def create_structural_hasher(ast_module):
+    """Create StructuralHasher class based on a given AST module."""
+
+    class StructuralHasherClass(RecursiveAstVisitor[ast_module]):
+
+        """Compute structural hashes of all subtrees of a given AST in one bottom-up pass.
+
+        Structural hash of a node depends on its type and on all its fields (including names,
+        constants and type comments), but not on its location in the source code nor on any
+        custom attributes. Subtrees that differ only by location have identical hashes.
+        Statically typed nodes have the same hashes as the nodes they were created from.
+
+        Hashes are computed with SHA-256 (truncated to DIGEST_SIZE) from hashes of children,
+        i.e. it is a Merkle tree, so they are stable between interpreter runs and can be used
+        as keys in persistent caches.
+        They are stored in the hashes dict, which maps nodes (by identity) to digests.
+        """
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, fields_first=True, **kwargs)
+            self.hashes = {}
+
+        def _field_parts(self, value):
+            if hasattr(value, '_fields'):
+                return [self.hashes[value]]
+            if isinstance(value, list):
+                parts = [b'[%d]' % len(value)]
+                for item in value:
+                    parts += self._field_parts(item)
+                return parts
+            return [repr(value).encode()]
+
+        def visit_node(self, node):
+            hashes = self.hashes
+            parts = [_node_name(type(node)).encode()]
+            for name, kind in field_kinds(type(node)):
+                value = getattr(node, name, None)
+                if kind is FieldKind.Node:
+                    parts.append(_NONE_DIGEST if value is None else hashes[value])
+                elif kind is FieldKind.Scalar or kind is FieldKind.ScalarList:
+                    parts.append(repr(value).encode())
+                else:
+                    parts += self._field_parts(value)
+            hashes[node] = hashlib.sha256(b'\0'.join(parts)).digest()[:DIGEST_SIZE]
+
+    return StructuralHasherClass
+
+
+StructuralHasher = {ast_module: create_structural_hasher(ast_module)
+                    for ast_module in (ast, typed_ast.ast3)}
+
+
+def structural_hash(ast_module, tree) -> bytes:
+    """Compute structural hash of a given AST."""
+    hasher = StructuralHasher[ast_module]()
+    hasher.visit(tree)
+    return hasher.hashes[tree]
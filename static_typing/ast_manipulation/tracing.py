@@ -0,0 +1,38 @@
+"""Hooks for tracing traversals of ASTs, which cost nothing when they are not used."""
+
+import logging
+import typing as t
+
+_LOG = logging.getLogger(__name__)
+
+Tracer = t.Callable[..., None]
+"""Function called as tracer(event, node, *details) on every traced event.
+
+Events are:
+
+- 'visit_node' -- node is about to be visited;
+- 'visit_fields' -- all fields of node are about to be visited;
+- 'visit_field' -- field of node is about to be visited, details are: name of the field;
+- 'transcribe' -- node is about to be transcribed, details are: target type;
+- 'resolve_type_hint' -- type hint of node was resolved, details are: name of the field
+  that holds the hint, resolved hint.
+"""
+
+_MESSAGES = {
+    'visit_node': 'visiting node %s',
+    'visit_fields': 'visiting all fields of node %s',
+    'visit_field': 'visiting field of %s: %s',
+    'transcribe': 'transcribing %s into %s',
+    'resolve_type_hint': 'resolved type hint of %s in %s: %s'}
+
+
+def create_logging_tracer(logger: logging.Logger = _LOG, level: int = logging.DEBUG) -> Tracer:
+    """Create tracer that logs all events, like traversals did before tracers were introduced.
+
+    Since every event is logged, the tracer should be used only for debugging.
+    """
+
+    def logging_tracer(event: str, node, *details) -> None:
+        logger.log(level, _MESSAGES.get(event, event + ' %s' * (1 + len(details))), node, *details)
+
+    return logging_tracer
@@ -1,16 +1,123 @@
 """Resolve type hints present in a given AST."""
 
 import ast
+import collections
 import itertools
 import logging
+import re
+import typing as t
 
 import typed_ast.ast3
 
+from .recursive_ast_visitor import EXPRESSION_NODE_TYPES
 from .recursive_ast_transformer import RecursiveAstTransformer
 from .ast_transcriber import AstTranscriber
 
 _LOG = logging.getLogger(__name__)
 
+_MISSING = object()
+
+_SPACE_AROUND_PUNCTUATION = re.compile(r'\s*([][(),.|:])\s*')
+
+_NAME_TYPES = (ast.Name, typed_ast.ast3.Name)
+
+
+def _walk(node):
+    """Walk the tree of either built-in ast or typed_ast nodes."""
+    return (typed_ast.ast3 if isinstance(node, typed_ast.ast3.AST) else ast).walk(node)
+
+
+TypeHintCacheInfo = collections.namedtuple(
+    'TypeHintCacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class TypeHintCache:
+
+    """Bounded memo of resolved type hints with least-recently-used eviction.
+
+    Keys are built by TypeHintResolver from the normalized hint and a fingerprint of the namespace
+    in which the hint is evaluated. One cache can be shared by many resolvers. Each entry keeps
+    alive only the objects that its hint refers to by name.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        assert isinstance(maxsize, int) and maxsize > 0, maxsize
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+
+    def get(self, key, default=None, is_valid: t.Optional[t.Callable[[t.Any], bool]] = None):
+        """Return cached value for the given key and mark it as most recently used.
+
+        If is_valid is given and it returns False for the cached value, the lookup is counted
+        as a miss and default is returned.
+        """
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        if is_valid is not None and not is_valid(value):
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value) -> None:
+        """Store a value, evicting the least recently used entry if the cache is full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> TypeHintCacheInfo:
+        """Get numbers of hits and misses, maximum size and current size of the cache."""
+        return TypeHintCacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+
+class NamespaceFingerprint:
+
+    """Snapshot of namespaces, equal to another one if same names refer to objects with same ids.
+
+    Only names and identities of objects are kept, so the objects are not kept alive. An id can
+    be reused by another object once the original one is freed -- therefore entries of the type
+    hint cache also hold the objects their hints refer to, and check them on each hit.
+    """
+
+    __slots__ = ('_items', '_hash')
+
+    def __init__(self, globals_: dict, locals_: dict):
+        self._items = tuple(tuple((name, id(value)) for name, value in namespace.items())
+                            for namespace in (globals_, locals_))
+        self._hash = hash(self._items)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, NamespaceFingerprint):
+            return NotImplemented
+        return self is other or self._hash == other._hash and self._items == other._items
+
+
+def namespace_fingerprint(globals_: dict, locals_: dict) -> NamespaceFingerprint:
+    """Identify a snapshot of namespaces by names and identities of objects available in them."""
+    return NamespaceFingerprint(globals_, locals_)
+
 
 def create_type_hint_resolver(ast_module, parser_ast_module):
     """Create TypeHintResolver class based on given AST modules."""
@@ -22,9 +129,15 @@ def create_type_hint_resolver(ast_module, parser_ast_module):
         Transform type comments from strings (and type annotations from strings or ASTs)
         into evaluated and compiled ASTs according to given snapshot of globally and locally
         available types.
+
+        Expression subtrees are not traversed, because type hints are attached only
+        to statements and function arguments.
         """
 
-        def __init__(self, eval_: bool = True, globals_=None, locals_=None, *args, **kwargs):
+        pruned_node_types = EXPRESSION_NODE_TYPES[ast_module]
+
+        def __init__(self, eval_: bool = True, globals_=None, locals_=None, *args,
+                     cache: t.Optional[TypeHintCache] = None, **kwargs):
             super().__init__(*args, **kwargs)
             self._eval = eval_
             if self._eval and parser_ast_module is not ast:
@@ -37,7 +150,32 @@ def create_type_hint_resolver(ast_module, parser_ast_module):
                 locals_ = {}
             self._locals = locals_
             if ast_module is not parser_ast_module:
-                self._transcriber = AstTranscriber[ast_module, parser_ast_module]()
+                self._transcriber = AstTranscriber[ast_module, parser_ast_module](
+                    tracer=self._tracer)
+            if cache is None:
+                cache = TypeHintCache()
+            self.cache = cache
+            self._namespace_fingerprint = namespace_fingerprint(self._globals, self._locals)
+
+        def _cache_key(self, hint) -> t.Optional[tuple]:
+            """Create a key under which the evaluated hint can be cached.
+
+            Return None if the hint should not be cached at all.
+            """
+            if not self._eval:
+                return None  # unevaluated hints are AST nodes that must not be shared
+            if isinstance(hint, str):
+                if '"' in hint or "'" in hint:
+                    normalized_hint = hint.strip()
+                else:
+                    normalized_hint = _SPACE_AROUND_PUNCTUATION.sub(
+                        r'\1', ' '.join(hint.split()))
+                return 'str', normalized_hint, self._namespace_fingerprint
+            if isinstance(hint, ast_module.AST):
+                return 'ast', ast_module.dump(hint), self._namespace_fingerprint
+            if isinstance(hint, parser_ast_module.AST):
+                return 'ast', parser_ast_module.dump(hint), self._namespace_fingerprint
+            return None
 
         def resolve_type_hint(self, hint):
             """Resolve a given type hint.
@@ -51,7 +189,40 @@ def create_type_hint_resolver(ast_module, parser_ast_module):
             `With`, `AsyncWith`, and `arg`
             - type annotations: `AnnAssign` and `arg`
             - return type annotations: `FunctionDef` and `AsyncFunctionDef`
+
+            Evaluated hints are memoized in the cache, so that each distinct hint
+            is compiled and evaluated only once per namespace.
             """
+            key = self._cache_key(hint)
+            if key is None:
+                return self._resolve_type_hint(hint)
+            entry = self.cache.get(key, _MISSING, self._refers_to_same_objects)
+            if entry is not _MISSING:
+                return entry[0]
+            if isinstance(hint, str):
+                hint = ast_module.parse(hint, mode='eval').body
+            resolved_hint = self._resolve_type_hint(hint)
+            names = {node.id for node in _walk(hint) if isinstance(node, _NAME_TYPES)}
+            self.cache.put(key, (resolved_hint, tuple(
+                (name, self._lookup(name)) for name in sorted(names))))
+            return resolved_hint
+
+        def _lookup(self, name: str):
+            """Get object which the name refers to in the namespaces, or a placeholder if none."""
+            value = self._locals.get(name, _MISSING)
+            if value is _MISSING:
+                value = self._globals.get(name, _MISSING)
+            return value
+
+        def _refers_to_same_objects(self, entry) -> bool:
+            """Check if names used by a cached hint still refer to the objects it was resolved with.
+
+            Fingerprints of namespaces compare only ids, so this guards against ids reused
+            by new objects.
+            """
+            return all(self._lookup(name) is value for name, value in entry[1])
+
+        def _resolve_type_hint(self, hint):
             if isinstance(hint, str):
                 hint = ast_module.parse(hint, mode='eval').body
             if not isinstance(hint, (ast_module.AST, parser_ast_module.AST)):
@@ -74,17 +245,18 @@ def create_type_hint_resolver(ast_module, parser_ast_module):
                                                         (ast_module.AST, parser_ast_module.AST)) \
                         else logging.WARNING
                     _LOG.log(level, 'type comment is not a str but %s', type(node.type_comment))
-                _LOG.debug('resolving type comment "%s" of %s', node.type_comment, node)
                 node.resolved_type_comment = self.resolve_type_hint(node.type_comment)
-                _LOG.info('resolved type comment of %s', node)
+                if self._tracer is not None:
+                    self._tracer('resolve_type_hint', node, 'type_comment',
+                                 node.resolved_type_comment)
             if getattr(node, 'annotation', None) is not None:
-                _LOG.debug('resolving type annotation of %s', node)
                 node.resolved_annotation = self.resolve_type_hint(node.annotation)
-                _LOG.info('resolved type annotation of %s', node)
+                if self._tracer is not None:
+                    self._tracer('resolve_type_hint', node, 'annotation', node.resolved_annotation)
             if getattr(node, 'returns', None) is not None:
-                _LOG.debug('resolving return type annotation of %s', node)
                 node.resolved_returns = self.resolve_type_hint(node.returns)
-                _LOG.info('resolved return type annotation of %s', node)
+                if self._tracer is not None:
+                    self._tracer('resolve_type_hint', node, 'returns', node.resolved_returns)
             return node
 
     return TypeHintResolverClass
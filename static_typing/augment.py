@@ -2,26 +2,237 @@
 
 import ast
 import logging
+import sys
+import textwrap
+import typing as t
 
 import typed_ast.ast3
 
-from .ast_manipulation import TypeHintResolver
+from .ast_manipulation import Tracer, TypeHintCache, TypeHintResolver
+from .ast_manipulation.node_schema import FieldKind, field_kinds
+from .augmentation_stats import AugmentationStats
+from .nodes import StaticallyTyped
 from .static_typer import StaticTyper
+from .type_index import TypeIndex
 
 _LOG = logging.getLogger(__name__)
 
+DEFAULT_AST_MODULE = ast if sys.version_info[:2] >= (3, 8) else typed_ast.ast3
+"""AST module used by default -- built-in one whenever it provides type comments."""
 
-def augment(tree, eval_: bool = True, globals_=None, locals_=None, ast_module=typed_ast.ast3):
-    """Add static type information to the given AST."""
 
+def augment(tree, eval_: bool = True, globals_=None, locals_=None, ast_module=None,
+            *, type_hint_cache: t.Optional[TypeHintCache] = None, in_place: bool = True,
+            mode: str = 'tree', tracer: t.Optional[Tracer] = None,
+            stats: t.Optional[AugmentationStats] = None):
+    """Add static type information to the given AST.
+
+    If ast_module is not given, it is inferred from the type of the tree.
+
+    Type hints are resolved and nodes are statically typed in a single bottom-up traversal.
+    Resolved type hints are memoized in type_hint_cache, which can be shared between calls.
+
+    If the tree comes from built-in ast module, type hints are compiled directly,
+    without transcribing them from typed_ast first.
+
+    If in_place is True, nodes of the given tree are upgraded to statically typed nodes
+    in place. Otherwise, statically typed nodes are created as copies of the original ones --
+    in both cases, the given tree is modified.
+
+    If mode is 'index', the given tree is left intact, and instead of a statically typed
+    tree, a read-only TypeIndex is returned -- it maps nodes of the given tree to their static
+    type information. Many analyses can therefore share one parsed tree. Nodes are typed
+    in place regardless of in_place, and restored once the index is built, so no nodes
+    are copied, but the index costs a bit more time and memory than the typed tree itself.
+
+    If tracer is given, all visited nodes and resolved type hints are reported to it
+    (see create_logging_tracer() for an example).
+
+    If stats are given, time spent in each phase of augmentation and counts of visited nodes
+    and resolved type hints are added to them (see AugmentationStats).
+    """
+
+    if mode not in ('tree', 'index'):
+        raise ValueError('mode must be either "tree" or "index", but it is {}'.format(repr(mode)))
+    if stats is None:
+        return _augment(tree, eval_, globals_, locals_, ast_module, type_hint_cache, in_place,
+                        mode, tracer, None)
+    with stats.phase('augment'):
+        return _augment(tree, eval_, globals_, locals_, ast_module, type_hint_cache, in_place,
+                        mode, tracer, stats)
+
+
+def _create_typer(eval_, globals_, locals_, ast_module, type_hint_cache, in_place, detached,
+                  tracer, stats):
+    """Create type hint resolver and static typer that use it.
+
+    Both can be reused to augment many trees within the same namespaces.
+    """
     parser_ast_module = ast if eval_ else ast_module
     type_hint_resolver = TypeHintResolver[ast_module, parser_ast_module](
-        eval_=eval_, globals_=globals_, locals_=locals_)
-    tree = type_hint_resolver.visit(tree)
-    _LOG.debug('%s', ast_module.dump(tree))
+        eval_=eval_, globals_=globals_, locals_=locals_, cache=type_hint_cache,
+        tracer=tracer)
+    typer = StaticTyper[ast_module](
+        type_hint_resolver=type_hint_resolver, in_place=in_place, detached=detached,
+        tracer=tracer, stats=stats)
+    return type_hint_resolver, typer
+
+
+def _augment(tree, eval_, globals_, locals_, ast_module, type_hint_cache, in_place, mode,
+             tracer, stats):
+    if stats is not None:
+        tracer = stats if tracer is None else stats.followed_by(tracer)
+    if ast_module is None:
+        ast_module = typed_ast.ast3 if isinstance(tree, typed_ast.ast3.AST) else ast
+    type_hint_resolver, typer = _create_typer(
+        eval_, globals_, locals_, ast_module, type_hint_cache, in_place, mode == 'index', tracer,
+        stats)
+    cache = type_hint_resolver.cache
+    hits, misses = cache.hits, cache.misses
+    if mode == 'index':
+        try:
+            typer.visit(tree)
+            result = TypeIndex(typer.typed_nodes)
+        finally:
+            typer.restore_nodes()
+    else:
+        result = typer.visit(tree)
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug('%s', ast_module.dump(result))
+    if stats is not None:
+        stats.type_hint_cache_hits += cache.hits - hits
+        stats.type_hint_cache_misses += cache.misses - misses
+
+    return result
+
+
+def _find_ancestors(ast_module, tree, node) -> t.List[t.Tuple[t.Any, str, int]]:
+    """Find path from the root of the tree to the given statement nested in it.
+
+    Return list of (ancestor, name of its field, index in that field) tuples, from the root
+    to the direct parent of the given node. Only lists of nodes that are not expressions
+    are searched, and subtrees that do not span the line of the node are skipped.
+    """
+    lineno = getattr(node, 'lineno', None)
+    parents = {}
+    stack = [tree]
+    while stack:
+        ancestor = stack.pop()
+        for name, kind in field_kinds(type(ancestor)):
+            if kind is not FieldKind.NodeList:
+                continue
+            for index, child in enumerate(getattr(ancestor, name, None) or ()):
+                if child is node:
+                    path = [(ancestor, name, index)]
+                    while path[0][0] in parents:
+                        path.insert(0, parents[path[0][0]])
+                    return path
+                if isinstance(child, ast_module.expr) or not hasattr(child, '_fields'):
+                    continue
+                end_lineno = getattr(child, 'end_lineno', None)
+                if lineno is not None and end_lineno is not None \
+                        and not child.lineno <= lineno <= end_lineno:
+                    continue
+                parents[child] = ancestor, name, index
+                stack.append(child)
+    raise ValueError('{} is not a statement within {}'.format(node, tree))
+
+
+def _last_lineno(ast_module, node) -> t.Optional[int]:
+    """Get last line of the node -- estimated from its descendants if end_lineno is missing."""
+    end_lineno = getattr(node, 'end_lineno', None)
+    if end_lineno is not None:
+        return end_lineno
+    return max((descendant.lineno for descendant in ast_module.walk(node)
+                if getattr(descendant, 'lineno', None) is not None), default=None)
+
+
+def _increment_col_offset(ast_module, node, offset: int) -> None:
+    """Move all columns of the node and its descendants by offset, e.g. to indent them."""
+    for descendant in ast_module.walk(node):
+        for name in ('col_offset', 'end_col_offset'):
+            col_offset = getattr(descendant, name, None)
+            if col_offset is not None:
+                setattr(descendant, name, col_offset + offset)
+
+
+def _end_position(node) -> t.Optional[t.Tuple[int, int]]:
+    """Get (end_lineno, end_col_offset) of the node, or None if they are missing."""
+    end_lineno = getattr(node, 'end_lineno', None)
+    end_col_offset = getattr(node, 'end_col_offset', None)
+    if end_lineno is None or end_col_offset is None:
+        return None
+    return end_lineno, end_col_offset
+
+
+def _shift_following(ast_module, ancestors, end_lineno: int, offset: int) -> None:
+    """Move everything after the given line in the ancestors by offset lines.
+
+    End lines of the ancestors themselves are moved too, so that they still span their bodies.
+    """
+    for ancestor, _, _ in ancestors:
+        if getattr(ancestor, 'end_lineno', None) is not None:
+            ancestor.end_lineno += offset
+        for name, kind in field_kinds(type(ancestor)):
+            value = getattr(ancestor, name, None)
+            for child in (value if kind is FieldKind.NodeList and isinstance(value, list)
+                          else (value,)):
+                if getattr(child, 'lineno', None) is not None and child.lineno > end_lineno:
+                    ast_module.increment_lineno(child, offset)
+
+
+def reaugment(tree, old_node, new_node, eval_: bool = True, globals_=None, locals_=None,
+              *, type_hint_cache: t.Optional[TypeHintCache] = None):
+    """Replace a statement in an augmented tree, and add static type information incrementally.
+
+    The old_node (e.g. a FunctionDef or ClassDef) must be a statement somewhere within the tree,
+    and new_node is either an AST of its replacement or the source code of it. Only the new node
+    is augmented, and then static type information of its statically typed ancestors (e.g.
+    functions of the module, or methods and fields of the class) is rebuilt from their
+    direct children. Therefore, the cost depends on size of the edit, not of the whole tree.
+
+    Arguments eval_, globals_, locals_ and type_hint_cache are like in augment(), and they
+    should be the same as when the tree was augmented.
+
+    If the new node is given as source code, it is placed at the line and column of the old one,
+    regardless of its own indentation. If it spans a different number of lines than the old one,
+    statements that follow it are moved accordingly, so that the tree can be edited again.
+    Ancestors that ended with the old node are made to end with the new one.
 
-    typer = StaticTyper[ast_module]()
-    tree = typer.visit(tree)
-    _LOG.debug('%s', ast_module.dump(tree))
+    Return the statically typed new node.
+    """
 
-    return tree
+    ast_module = typed_ast.ast3 if isinstance(tree, typed_ast.ast3.AST) else ast
+    ancestors = _find_ancestors(ast_module, tree, old_node)
+    if isinstance(new_node, str):
+        kwargs = {'type_comments': True} if ast_module is ast else {}
+        new_tree = ast_module.parse(textwrap.dedent(new_node), **kwargs)
+        if len(new_tree.body) != 1:
+            raise ValueError('expected source code of exactly one statement, but got {}'
+                             .format(len(new_tree.body)))
+        new_node = new_tree.body[0]
+        if getattr(old_node, 'lineno', None) is not None:
+            ast_module.increment_lineno(new_node, old_node.lineno - new_node.lineno)
+        if getattr(old_node, 'col_offset', None) is not None:
+            _increment_col_offset(ast_module, new_node, old_node.col_offset - new_node.col_offset)
+    new_node = augment(new_node, eval_, globals_, locals_, ast_module,
+                       type_hint_cache=type_hint_cache)
+    old_end = _end_position(old_node)
+    ending_ancestors = [ancestor for ancestor, _, _ in ancestors
+                        if old_end is not None and _end_position(ancestor) == old_end]
+    parent, field_name, index = ancestors[-1]
+    getattr(parent, field_name)[index] = new_node
+    old_end_lineno = _last_lineno(ast_module, old_node)
+    new_end_lineno = _last_lineno(ast_module, new_node)
+    if old_end_lineno is not None and new_end_lineno is not None \
+            and new_end_lineno != old_end_lineno:
+        _shift_following(ast_module, ancestors, old_end_lineno, new_end_lineno - old_end_lineno)
+    new_end = _end_position(new_node)
+    if new_end is not None:
+        for ancestor in ending_ancestors:
+            ancestor.end_col_offset = new_end[1]
+    for ancestor, _, _ in reversed(ancestors):
+        if isinstance(ancestor, StaticallyTyped[ast_module]):
+            ancestor._init_type_fields()
+            ancestor._add_type_info()
+    return new_node
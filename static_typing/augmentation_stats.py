@@ -0,0 +1,103 @@
+"""Opt-in statistics of parsing and adding static type information to ASTs."""
+
+import collections
+import contextlib
+import functools
+import logging
+import time
+import typing as t
+
+_LOG = logging.getLogger(__name__)
+
+
+class AugmentationStats:
+
+    """Statistics gathered by parse() and augment(), when an instance is given to them.
+
+    Wall time is accumulated per phase in phase_seconds, in particular:
+
+    - 'parse' -- parsing source code into AST, in parse();
+    - 'augment' -- whole augmentation, in augment();
+    - 'resolve_type_hints' -- parsing, compiling and evaluating type hints;
+    - 'type_nodes' -- creating statically typed nodes and combining their type information
+      (including collecting variables stored in their bodies).
+
+    Phases of other steps (e.g. validation with AstValidator) can be timed using phase().
+
+    Visited nodes are counted per node type in nodes_visited. Expressions are not visited
+    by the typer, because they cannot contain any nodes that are typed -- but nodes of type hints
+    are visited when they are transcribed between AST modules. Also numbers of resolved type
+    hints, of hits and misses of the type hint cache, and of transcribed nodes are counted.
+
+    One instance can be given to many calls, and then the statistics are summed up.
+    Instance is also a tracer (see static_typing.ast_manipulation.tracing), and it receives
+    events from all visitors used in augment().
+    """
+
+    def __init__(self):
+        self.phase_seconds = collections.defaultdict(float)  # type: t.Dict[str, float]
+        self.nodes_visited = collections.Counter()  # type: t.Dict[str, int]
+        self.type_hints_resolved = 0
+        self.type_hint_cache_hits = 0
+        self.type_hint_cache_misses = 0
+        self.nodes_transcribed = 0
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Add time spent in the body of the with statement to the given phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_seconds[name] += time.perf_counter() - start
+
+    def timed(self, name: str, function: t.Callable) -> t.Callable:
+        """Wrap function so that time spent in it is added to the given phase."""
+        phase_seconds = self.phase_seconds
+        perf_counter = time.perf_counter
+
+        @functools.wraps(function)
+        def timed_function(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                phase_seconds[name] += perf_counter() - start
+
+        return timed_function
+
+    def __call__(self, event: str, node, *details) -> None:
+        if event == 'visit_node':
+            self.nodes_visited[type(node).__name__] += 1
+        elif event == 'resolve_type_hint':
+            self.type_hints_resolved += 1
+        elif event == 'transcribe':
+            self.nodes_transcribed += 1
+
+    def followed_by(self, tracer: t.Callable[..., None]) -> t.Callable[..., None]:
+        """Create tracer that passes every event to these stats and then to the given tracer."""
+
+        def stats_and_tracer(*args) -> None:
+            self(*args)
+            tracer(*args)
+
+        return stats_and_tracer
+
+    def as_dict(self, prefix: str = 'static_typing_') -> t.Dict[str, float]:
+        """Export statistics as a flat dict, in which keys are Prometheus-style metric names.
+
+        For example: {'static_typing_phase_seconds{phase="parse"}': 0.25, ...}.
+        """
+        metrics = collections.OrderedDict()
+        for name, seconds in sorted(self.phase_seconds.items()):
+            metrics['{}phase_seconds{{phase="{}"}}'.format(prefix, name)] = seconds
+        for node_type, count in sorted(self.nodes_visited.items()):
+            metrics['{}nodes_visited_total{{node_type="{}"}}'.format(prefix, node_type)] = count
+        metrics[prefix + 'type_hints_resolved_total'] = self.type_hints_resolved
+        metrics[prefix + 'type_hint_cache_hits_total'] = self.type_hint_cache_hits
+        metrics[prefix + 'type_hint_cache_misses_total'] = self.type_hint_cache_misses
+        metrics[prefix + 'nodes_transcribed_total'] = self.nodes_transcribed
+        return metrics
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, dict(self.as_dict(prefix='')))
@@ -0,0 +1,227 @@
+"""Persistent on-disk cache of statically typed ASTs."""
+
+import hashlib
+import logging
+import os
+import pathlib
+import pickle
+import re
+import sys
+import tempfile
+import types
+import typing as t
+
+_LOG = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+"""Version of the cache entries format -- increment it whenever statically typed nodes change."""
+
+
+_CONSTANT_TYPES = (type(None), type(Ellipsis), bool, int, float, complex, str, bytes)
+
+_TYPING_MODULES = {'typing', 'typing_extensions', 'types'}
+
+_IGNORED_NAMES = {'__loader__', '__spec__', '__warningregistry__'}
+"""Names of bookkeeping objects of the interpreter (e.g. describing how a module was imported,
+or which warnings were already shown) -- they are never used in type hints."""
+
+_IDENTIFIER = re.compile(r'\w+')
+
+
+def referenced_names(source: str) -> t.Set[str]:
+    """Get all names that type hints in a given source code can look up in namespaces.
+
+    Type hints, including type comments and string annotations, are part of the source text,
+    so every identifier-like word of the text is included -- and builtins, since evaluation
+    of any hint looks them up.
+    """
+    names = set(_IDENTIFIER.findall(source))
+    names.add('__builtins__')
+    return names
+
+
+def _describe_object(value) -> t.Optional[str]:
+    """Describe object in a way that is stable between interpreter runs.
+
+    Modules, classes and functions are described by reference, and constants and typing constructs
+    (e.g. t.List[int]) by their representation. Return None if the object cannot be described
+    reliably, e.g. if it is an arbitrary instance or a class defined in a function.
+    """
+    if isinstance(value, types.ModuleType):
+        return 'module {}'.format(value.__name__)
+    if isinstance(value, dict) and value.get('__name__') == 'builtins':
+        return 'module builtins'
+    if isinstance(value, _CONSTANT_TYPES):
+        return '{} {}'.format(type(value).__qualname__, repr(value))
+    if isinstance(value, (tuple, frozenset)):
+        items = [_describe_object(item) for item in value]
+        if None in items:
+            return None
+        if isinstance(value, frozenset):
+            items.sort()
+        return '{}({})'.format(type(value).__qualname__, ', '.join(items))
+    if type(value).__module__ in _TYPING_MODULES \
+            and not isinstance(value, (type, types.FunctionType, types.BuiltinFunctionType)):
+        return 'typing {}'.format(repr(value))
+    if isinstance(value, (type, types.FunctionType, types.BuiltinFunctionType)):
+        module = getattr(value, '__module__', None)
+        qualname = getattr(value, '__qualname__', None)
+        if isinstance(module, str) and isinstance(qualname, str) and '<locals>' not in qualname:
+            return '{}.{}'.format(module, qualname)
+    return None
+
+
+def stable_namespace_fingerprint(globals_: t.Optional[dict], locals_: t.Optional[dict],
+                                 names: t.Optional[t.AbstractSet[str]] = None) -> t.Optional[str]:
+    """Identify namespaces by names and descriptions of objects available in them.
+
+    Unlike the fingerprint used by TypeHintCache, this one does not depend on object identities,
+    and therefore it is the same in different interpreter runs. If names are given, only those
+    names are considered (see referenced_names()). Return None if any considered object
+    in the namespaces cannot be described reliably (see _describe_object()).
+    """
+    digest = hashlib.sha256()
+    for namespace in (globals_, locals_):
+        digest.update(b'\0namespace\0')
+        if namespace is None:
+            continue
+        for name, value in sorted(namespace.items(), key=lambda item: str(item[0])):
+            if name in _IGNORED_NAMES or names is not None and name not in names:
+                continue
+            description = _describe_object(value)
+            if description is None:
+                _LOG.debug('namespaces cannot be fingerprinted because of %s=%r', name, value)
+                return None
+            digest.update('{}={}\0'.format(name, description).encode())
+    return digest.hexdigest()
+
+
+class ModuleCache:
+
+    """Directory with pickled statically typed ASTs, similar to __pycache__.
+
+    Each entry is keyed by a hash of the source code, the AST module, the fingerprint
+    of namespaces used to resolve type hints, and any other parameters that influence the result.
+    Only names that occur in the source code are fingerprinted. If any of them refers to
+    an object that cannot be fingerprinted, there is no key, and the result is not cached.
+
+    Entries are written atomically. When total size of entries exceeds max_size bytes,
+    least recently used entries are removed until the total size drops below 3/4 of max_size.
+
+    The cache object is picklable, so it can be given to parse_files().
+    """
+
+    suffix = '.pickle'
+
+    def __init__(self, directory: t.Union[str, os.PathLike], max_size: int = 256 * 1024 ** 2):
+        assert isinstance(max_size, int) and max_size > 0, max_size
+        self.directory = pathlib.Path(directory)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+
+    def key(self, source: str, eval_: bool, globals_, locals_, ast_module,
+            *args) -> t.Optional[str]:
+        """Create a cache key for the given source and parameters of parsing.
+
+        Return None if the namespaces cannot be fingerprinted.
+        """
+        fingerprint = stable_namespace_fingerprint(globals_, locals_, referenced_names(source))
+        if fingerprint is None:
+            return None
+        digest = hashlib.sha256()
+        for part in (CACHE_FORMAT_VERSION, sys.version, ast_module.__name__, eval_,
+                     fingerprint, args, source):
+            digest.update(repr(part).encode())
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.directory.joinpath(key + self.suffix)
+
+    def get(self, key: str):
+        """Return the cached tree for a given key, or None if there is no such entry."""
+        path = self._path(key)
+        try:
+            with path.open('rb') as cache_file:
+                tree = pickle.load(cache_file)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:  # pylint: disable=broad-except
+            _LOG.warning('removing unreadable cache entry "%s"', path, exc_info=True)
+            self._remove(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(str(path))
+        except OSError:
+            pass
+        self.hits += 1
+        return tree
+
+    def put(self, key: str, tree) -> bool:
+        """Store the tree under a given key. Return False if the tree could not be stored."""
+        try:
+            data = pickle.dumps(tree, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:  # pylint: disable=broad-except
+            _LOG.warning('tree cannot be cached because it is not picklable', exc_info=True)
+            return False
+        self.directory.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            suffix='.tmp', prefix=key, dir=str(self.directory))
+        try:
+            with os.fdopen(file_descriptor, 'wb') as temporary_file:
+                temporary_file.write(data)
+            os.replace(temporary_path, str(self._path(key)))
+        except BaseException:
+            self._remove(pathlib.Path(temporary_path))
+            raise
+        if self._size is None:
+            self._size = self._scan_size()
+        else:
+            self._size += len(data)
+        if self._size > self.max_size:
+            self.evict()
+        return True
+
+    def evict(self, target_size: t.Optional[int] = None) -> None:
+        """Remove least recently used entries until their total size is at most target_size."""
+        if target_size is None:
+            target_size = self.max_size * 3 // 4
+        entries = []
+        for path in self.directory.glob('*' + self.suffix):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in entries:
+            if size <= target_size:
+                break
+            self._remove(path)
+            size -= entry_size
+        self._size = size
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self.evict(0)
+
+    def _scan_size(self) -> int:
+        size = 0
+        for path in self.directory.glob('*' + self.suffix):
+            try:
+                size += path.stat().st_size
+            except FileNotFoundError:
+                pass
+        return size
+
+    @staticmethod
+    def _remove(path: pathlib.Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
@@ -6,10 +6,11 @@ from .function_def import StaticallyTypedFunctionDef
 from .class_def import StaticallyTypedClassDef
 from .declaration import StaticallyTypedAssign, StaticallyTypedAnnAssign
 from .context import StaticallyTypedFor, StaticallyTypedWith
+from .type_set import TypeSet
 # , StaticallyTypedWhile, StaticallyTypedIf
 
 __all__ = [
     'StaticallyTyped', 'StaticallyTypedModule',
     'StaticallyTypedFunctionDef', 'StaticallyTypedClassDef',
     'StaticallyTypedAssign', 'StaticallyTypedAnnAssign',
-    'StaticallyTypedFor', 'StaticallyTypedWith']
+    'StaticallyTypedFor', 'StaticallyTypedWith', 'TypeSet']
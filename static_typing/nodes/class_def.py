@@ -4,12 +4,12 @@ import ast
 import sys
 import typing as t
 
-import ordered_set
 import typed_ast.ast3
 
-from .statically_typed import StaticallyTyped
+from .statically_typed import StaticallyTyped, StoreChain, find_all_stores
 from .function_def import FunctionKind, StaticallyTypedFunctionDef
 from .declaration import StaticallyTypedAssign, StaticallyTypedAnnAssign
+from .type_set import TypeSet
 
 
 def create_class_def(ast_module):
@@ -28,18 +28,9 @@ def create_class_def(ast_module):
             FunctionKind.Constructor: '_instance_methods',
             FunctionKind.InstanceMethod: '_instance_methods'}
 
-        def __init__(self, *args, **kwargs):
-            self._class_fields = {}
-            self._instance_fields = {}
-            self._methods = {}
-            self._static_methods = {}
-            self._class_methods = {}
-            self._instance_methods = {}
-            super().__init__(*args, **kwargs)
-
         def _add_method(self, method: StaticallyTypedFunctionDef[ast_module]):
-            self._methods[method.name] = method
-            getattr(self, self.kind_mapping[method._kind])[method.name] = method
+            self._writable_type_field('_methods')[method.name] = method
+            self._writable_type_field(self.kind_mapping[method._kind])[method.name] = method
             if method._kind is not FunctionKind.Constructor:
                 return
             for key, value_set in method._nonlocal_assignments.items():
@@ -53,16 +44,16 @@ def create_class_def(ast_module):
 
         def _add_var(self, var_place: str, var_name: str, type_info: t.Any):
             # , scope: t.Any = None
-            vars_ = getattr(self, var_place)
-            if var_name not in vars_:
-                vars_[var_name] = ordered_set.OrderedSet()
-            var_type_info = vars_[var_name]
+            vars_ = self._writable_type_field(var_place)
+            var_type_info = vars_.get(var_name, TypeSet())
             if type_info is not None:
-                var_type_info.add(type_info)
+                var_type_info = var_type_info.union((type_info,))
+            vars_[var_name] = var_type_info
 
         def _add_type_info(self):
             if not getattr(self, 'body', None):
                 return
+            stores = []
             for node in self.body:
                 if isinstance(node, ast_module.FunctionDef):
                     assert isinstance(node, StaticallyTypedFunctionDef[ast_module]), type(node)
@@ -78,6 +69,10 @@ def create_class_def(ast_module):
                     for key, values in node._vars.items():
                         if isinstance(key, ast_module.Name):
                             self._add_var('_class_fields', key.id, values)
+                stores.append(find_all_stores[ast_module](node))
+            stores = StoreChain(stores)
+            if stores:
+                self._stores = stores
 
     return StaticallyTypedClassDefClass
 
@@ -4,7 +4,7 @@ import ast
 
 import typed_ast.ast3
 
-from .statically_typed import StaticallyTyped
+from .statically_typed import StaticallyTyped, StoreChain, find_all_stores
 
 
 def create_for(ast_module):
@@ -16,16 +16,15 @@ def create_for(ast_module):
 
         _type_fields = ('index_vars',)
 
-        def __init__(self, *args, **kwargs):
-            self._index_vars = {}
-            # self._scope_vars = {}
-            super().__init__(*args, **kwargs)
-
         def _add_type_info(self):
             if not getattr(self, 'body', None):
                 return
-            self._index_vars[self.target] = getattr(self, 'resolved_type_comment', None)
+            self._writable_type_field('_index_vars')[self.target] = \
+                getattr(self, 'resolved_type_comment', None)
             # TODO: multiple index variables
+            self._stores = StoreChain(
+                [self._index_vars]
+                + [find_all_stores[ast_module](stmt) for stmt in self.body + self.orelse])
 
     return StaticallyTypedForClass
 
@@ -68,20 +67,20 @@ def create_with(ast_module):
 
         _type_fields = ('context_vars',)
 
-        def __init__(self, *args, **kwargs):
-            self._context_vars = {}
-            # self._scope_vars = {}
-            super().__init__(*args, **kwargs)
-
         def _add_type_info(self):
             if not getattr(self, 'body', None):
                 return
             for item in self.items:
                 if isinstance(item.optional_vars, ast_module.Name):
                     name = item.optional_vars
-                    self._context_vars[name] = getattr(self, 'resolved_type_comment', None)
+                    self._writable_type_field('_context_vars')[name] = \
+                        getattr(self, 'resolved_type_comment', None)
                 # TODO: proper type hint decomposition in case of many context managers
                 # TODO: multiple context variables from one context manager
+            stores = StoreChain(
+                [self._context_vars] + [find_all_stores[ast_module](stmt) for stmt in self.body])
+            if stores:
+                self._stores = stores
 
     return StaticallyTypedWithClass
 
@@ -7,7 +7,7 @@ import sys
 
 import typed_ast.ast3
 
-from .statically_typed import StaticallyTyped
+from .statically_typed import StaticallyTyped, StoreChain
 
 _LOG = logging.getLogger(__name__)
 
@@ -21,9 +21,13 @@ def create_declaration(ast_module):
 
         _type_fields = ('vars',)
 
-        def __init__(self, *args, **kwargs):
+        def _init_type_fields(self):
+            super()._init_type_fields()
             self._vars = collections.OrderedDict()
-            super().__init__(*args, **kwargs)
+
+        @property
+        def _stores(self):
+            return StoreChain((self._vars,))
 
         def _add_declaration(self, target, type_hint):
             if isinstance(target, ast_module.Tuple):
@@ -59,6 +63,8 @@ def create_assign(ast_module):
 
         """Statically typed version of Assign AST node."""
 
+        resolved_type_comment = None
+
         def __init__(self, *args, resolved_type_comment=None, **kwargs):
             self.resolved_type_comment = resolved_type_comment
             super().__init__(*args, **kwargs)
@@ -83,6 +89,8 @@ def create_ann_assign(ast_module):
 
         """Statically typed version of AnnAssign AST node."""
 
+        resolved_annotation = None
+
         def __init__(self, *args, resolved_annotation=None, **kwargs):
             self.resolved_annotation = resolved_annotation
             super().__init__(*args, **kwargs)
@@ -3,16 +3,13 @@
 import ast
 import enum
 import logging
-import sys
 import typing as t
 
-import ordered_set
 import typed_ast.ast3
 import typed_astunparse
 
-from .statically_typed import StaticallyTyped
-from .declaration import StaticallyTypedAssign, StaticallyTypedAnnAssign
-from .context import StaticallyTypedFor, StaticallyTypedWith
+from .statically_typed import StaticallyTyped, StoreChain, find_all_stores
+from .type_set import TypeSet
 
 _LOG = logging.getLogger(__name__)
 
@@ -39,15 +36,17 @@ def create_function_def(ast_module):
 
         _type_fields = 'params', 'local_vars', 'nonlocal_assignments'
 
+        resolved_returns = None
+
         def __init__(self, *args, resolved_returns=None, **kwargs):
             self.resolved_returns = resolved_returns
+            super().__init__(*args, **kwargs)
+
+        def _init_type_fields(self):
+            super()._init_type_fields()
             self._kind = FunctionKind.Undetermined
-            self._params = {}
-            self._returns = ordered_set.OrderedSet()
-            self._local_vars = {}
-            self._nonlocal_assignments = {}
+            self._returns = TypeSet()
             # self._scopes = []
-            super().__init__(*args, **kwargs)
 
         def _add_kind_info(self):
             if len(self.decorator_list) == 0:
@@ -92,20 +91,18 @@ def create_function_def(ast_module):
                         continue
                     if self._kind is FunctionKind.ClassMethod and arg.arg == 'cls':
                         continue
-                type_info = ordered_set.OrderedSet()
-                if getattr(arg, 'resolved_annotation', None) is not None:
-                    type_info.add(arg.resolved_annotation)
-                if getattr(arg, 'resolved_type_comment', None) is not None:
-                    type_info.add(arg.resolved_type_comment)
-                self._params[arg.arg] = type_info
-
-        def _add_var_type_info(self, fld, var_name: str, type_info: t.Any):
+                self._writable_type_field('_params')[arg.arg] = TypeSet(
+                    type_info for type_info in (getattr(arg, 'resolved_annotation', None),
+                                                getattr(arg, 'resolved_type_comment', None))
+                    if type_info is not None)
+
+        def _add_var_type_info(self, fld: str, var_name: str, type_info: t.Any):
             # , scope: t.Any=None
-            if var_name not in fld:
-                fld[var_name] = ordered_set.OrderedSet()
-            var_type_info = fld[var_name]
+            fld = self._writable_type_field(fld)
+            var_type_info = fld.get(var_name, TypeSet())
             if type_info is not None:
-                var_type_info.add(type_info)
+                var_type_info = var_type_info.union((type_info,))
+            fld[var_name] = var_type_info
 
         def _add_type_info(self):
             if not getattr(self, 'body', None):
@@ -115,46 +112,20 @@ def create_function_def(ast_module):
             self._add_params_type_info()
 
             if self.returns is not None:
-                self._returns.add(self.resolved_returns)
+                self._returns = self._returns.union((self.resolved_returns,))
 
-            variables = []
-            for stmt in self.body:
-                variables += find_all_stores[ast_module](stmt)
+            stores = StoreChain(find_all_stores[ast_module](stmt) for stmt in self.body)
+            if stores:
+                self._stores = stores
 
-            for var, values in variables:
+            for var, values in stores:
                 if isinstance(var, ast_module.Name):
-                    self._add_var_type_info(self._local_vars, var.id, values)
+                    self._add_var_type_info('_local_vars', var.id, values)
                 else:
-                    self._add_var_type_info(self._nonlocal_assignments, var, values)
+                    self._add_var_type_info('_nonlocal_assignments', var, values)
 
     return StaticallyTypedFunctionDefClass
 
 
 StaticallyTypedFunctionDef = {ast_module: create_function_def(ast_module)
                               for ast_module in (ast, typed_ast.ast3)}
-
-
-def create_find_all_stores(ast_module):
-    def find_all_stores(tree: StaticallyTyped[ast_module]) -> t.List[StaticallyTyped[ast_module]]:
-        variables = []
-        for node in ast_module.walk(tree):
-            if isinstance(node, ast_module.Assign):
-                assert isinstance(node, StaticallyTypedAssign[ast_module]), type(node)
-                variables += list(node._vars.items())
-            elif (ast_module is not ast or sys.version_info[:2] >= (3, 6)) \
-                    and isinstance(node, ast_module.AnnAssign):
-                assert isinstance(node, StaticallyTypedAnnAssign[ast_module]), type(node)
-                variables += list(node._vars.items())
-            elif isinstance(node, ast_module.For):
-                assert isinstance(node, StaticallyTypedFor[ast_module]), type(node)
-                variables += list(node._index_vars.items())
-            elif isinstance(node, ast_module.With):
-                assert isinstance(node, StaticallyTypedWith[ast_module]), type(node)
-                variables += list(node._context_vars.items())
-        return variables
-
-    return find_all_stores
-
-
-find_all_stores = {ast_module: create_find_all_stores(ast_module)
-                   for ast_module in (ast, typed_ast.ast3)}
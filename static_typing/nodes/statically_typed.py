@@ -1,12 +1,76 @@
 """Base class of any statically typed node."""
 
 import ast
+import importlib
+import typing as t
 
 import typed_ast.ast3
 
 from ..ast_manipulation.ast_transcriber import transcribe
 
 
+def _create_empty(family_module: str, family_name: str, ast_module_name: str):
+    """Create uninitialized statically typed node, so that it can be unpickled.
+
+    Statically typed node classes are created dynamically for each AST module, and therefore
+    they cannot be pickled by reference. Instead, they are found in the dict of the node family,
+    e.g. StaticallyTypedModule[typed_ast.ast3] for StaticallyTypedModule family.
+    """
+    family = getattr(importlib.import_module(family_module), family_name)
+    cls = family[importlib.import_module(ast_module_name)]
+    return cls.__new__(cls)
+
+
+class _FrozenDict(dict):
+
+    """Dict that cannot be modified."""
+
+    def _modify(self, *args, **kwargs):
+        raise TypeError('{} cannot be modified'.format(type(self).__name__))
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _modify
+
+
+EMPTY_TYPE_FIELD = _FrozenDict()
+"""Value of every type field of statically typed nodes, until something is written to it."""
+
+TYPE_FIELD_NAMES = (
+    'module_vars', 'nonlocal_assignments', 'classes', 'functions',
+    'class_fields', 'instance_fields', 'methods', 'static_methods', 'class_methods',
+    'instance_methods', 'params', 'local_vars', 'vars', 'index_vars', 'context_vars')
+"""Names of type fields of all statically typed nodes."""
+
+
+class StoreChain:
+
+    """Declarations of variables stored within a subtree, in source order.
+
+    The chain consists of type fields that hold the declarations (e.g. vars of an assignment)
+    and of chains of subtrees, and it flattens them only when iterated. Each node therefore
+    shares the stores of its children instead of copying them, and aggregating stores
+    bottom-up takes linear time.
+    """
+
+    __slots__ = ('_parts',)
+
+    def __init__(self, parts: t.Iterable[t.Union[t.Mapping[t.Any, t.Any], 'StoreChain']] = ()):
+        self._parts = tuple(part for part in parts if part)
+
+    def __bool__(self):
+        return bool(self._parts)
+
+    def __iter__(self) -> t.Iterator[t.Tuple[t.Any, t.Any]]:
+        stack = [iter(self._parts)]
+        while stack:
+            for part in stack[-1]:
+                if isinstance(part, StoreChain):
+                    stack.append(iter(part._parts))
+                    break
+                yield from part.items()
+            else:
+                stack.pop()
+
+
 def create_statically_typed(ast_module):
     """Create statically typed AST node template class based on a given AST module."""
 
@@ -18,18 +82,62 @@ def create_statically_typed(ast_module):
 
         _resolved_fields = ('resolved_type_comment', 'resolved_annotation', 'resolved_returns')
 
+        _stores = StoreChain()
+        """Declarations of all variables stored within this node, including its descendants."""
+
         @classmethod
-        def from_other(cls, node: ast_module.AST):
+        def from_other(cls, node: ast_module.AST, in_place: bool = False):
+            """Create statically typed version of a given node.
+
+            If in_place is True, the given node is upgraded by changing its class, so that
+            its fields and attributes are reused instead of being copied into a new node.
+            """
+            if in_place:
+                try:
+                    node.__class__ = cls
+                except TypeError:
+                    pass
+                else:
+                    node._init_type_fields()
+                    node._add_type_info()
+                    return node
             new_node = transcribe(ast_module, node, ast_module, cls, cls._resolved_fields)
             return new_node
 
         def __init__(self, *args, **kwargs):
+            self._init_type_fields()
             super().__init__(*args, **kwargs)
             self._add_type_info()
 
+        def _init_type_fields(self):
+            """Initialize containers for static type information.
+
+            Type fields (and stores) are allocated only when something is written to them,
+            see _writable_type_field(). Until then, they are read from the class, where all of
+            them are EMPTY_TYPE_FIELD. Therefore, initialization just drops the allocated ones.
+            """
+            for field_name in type(self)._type_fields:
+                self.__dict__.pop('_{}'.format(field_name), None)
+            self.__dict__.pop('_stores', None)
+
+        def _writable_type_field(self, name: str) -> dict:
+            """Get a type field with a given attribute name for writing, allocating it if needed."""
+            field = self.__dict__.get(name)
+            if field is None:
+                field = self.__dict__[name] = {}
+            return field
+
         def _add_type_info(self):
             raise NotImplementedError()
 
+        def __reduce__(self):
+            cls = type(self)
+            if '<locals>' not in cls.__qualname__:
+                return super().__reduce__()
+            assert cls.__name__.endswith('Class'), cls
+            return _create_empty, (cls.__module__, cls.__name__[:-len('Class')],
+                                   ast_module.__name__), vars(self)
+
         def __repr__(self):
             return '<{}@{}>'.format(type(self).__name__, id(self))
 
@@ -39,8 +147,42 @@ def create_statically_typed(ast_module):
                       for field_name in type(self)._type_fields]
             return '{}({})'.format(short_type_name, ' '.join(fields))
 
+    for field_name in TYPE_FIELD_NAMES:
+        setattr(StaticallyTypedClass, '_{}'.format(field_name), EMPTY_TYPE_FIELD)
+
     return StaticallyTypedClass
 
 
 StaticallyTyped = {ast_module: create_statically_typed(ast_module)
                    for ast_module in (ast, typed_ast.ast3)}
+
+
+def create_find_all_stores(ast_module):
+    """Create find_all_stores function based on a given AST module."""
+
+    untyped_store_types = (ast_module.Assign, ast_module.For, ast_module.With)
+
+    def find_all_stores(tree: ast_module.AST) -> StoreChain:
+        """Get declarations of all variables stored within a given tree, in source order.
+
+        Statically typed nodes already hold declarations of their whole subtrees, which they
+        collect from their children when they are created. Therefore, the traversal stops at
+        them, and only the nodes that are not statically typed are visited -- each of them
+        by its nearest statically typed ancestor only. Expressions are never visited.
+        """
+        variables = []
+        nodes = [tree]
+        while nodes:
+            node = nodes.pop()
+            if isinstance(node, StaticallyTyped[ast_module]):
+                variables.append(node._stores)
+            elif not isinstance(node, ast_module.expr):
+                assert not isinstance(node, untyped_store_types), type(node)
+                nodes += reversed(list(ast_module.iter_child_nodes(node)))
+        return StoreChain(variables)
+
+    return find_all_stores
+
+
+find_all_stores = {ast_module: create_find_all_stores(ast_module)
+                   for ast_module in (ast, typed_ast.ast3)}
@@ -0,0 +1,69 @@
+"""Immutable and interned ordered sets of type hints."""
+
+import collections.abc
+import typing as t
+import weakref
+
+
+class TypeSet(collections.abc.Sequence):
+
+    """Immutable ordered set of type hints, e.g. of all hints of one variable.
+
+    Type sets are interned: creating a type set equal to an existing one returns the existing
+    one, so all variables with identical type hints share a single type set. A type set is
+    removed from the intern table when it is no longer used.
+
+    Type hints must be hashable. Like a set, type set compares equal to another type set,
+    set or frozenset of the same hints regardless of their order, and never to a tuple or list.
+    """
+
+    __slots__ = ('_hints', '__weakref__')
+
+    _interned = weakref.WeakValueDictionary()  # type: t.MutableMapping[tuple, TypeSet]
+
+    def __new__(cls, hints: t.Iterable[t.Any] = ()):
+        hints = tuple(dict.fromkeys(hints))
+        try:
+            return cls._interned[hints]
+        except KeyError:
+            type_set = super().__new__(cls)
+            type_set._hints = hints
+            cls._interned[hints] = type_set
+            return type_set
+
+    def union(self, *others: t.Iterable[t.Any]) -> 'TypeSet':
+        """Get type set with all hints of this set, followed by new hints from others."""
+        hints = tuple(hint for other in others for hint in other if hint not in self._hints)
+        if not hints:
+            return self
+        return type(self)(self._hints + hints)
+
+    def __getitem__(self, index):
+        return self._hints[index]
+
+    def __len__(self):
+        return len(self._hints)
+
+    def __contains__(self, hint):
+        return hint in self._hints
+
+    def __iter__(self):
+        return iter(self._hints)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, TypeSet):
+            other = other._hints
+        elif not isinstance(other, (set, frozenset)):
+            return NotImplemented
+        return len(self._hints) == len(other) and frozenset(self._hints) == frozenset(other)
+
+    def __hash__(self):
+        return hash(frozenset(self._hints))
+
+    def __reduce__(self):
+        return type(self), (self._hints,)
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, self._hints)
@@ -7,13 +7,24 @@ import numpy as np
 from .generic import GenericVar
 
 
-def create_typed_numpy_ndarray(
-        dims: int, data_type: t.ClassVar, required_shape: t.Optional[t.Sequence[int]] = None):
-    """Create a statically typed version of numpy.ndarray."""
+class typed_numpy_ndarray:
+
+    """Statically typed version of numpy.ndarray.
 
-    def typed_ndarray(*args, **kwargs):
+    Instances are pickled by reference to the ndarray factory, i.e. by their type parameters.
+    """
+
+    def __init__(self, dims: int, data_type: t.ClassVar,
+                 required_shape: t.Optional[t.Sequence[int]] = None):
+        self._dims = dims
+        self._data_type = data_type
+        self._required_shape = required_shape
+
+    def __call__(self, *args, **kwargs):
         """Create an instance of numpy.ndarray which must conform to declared type constraints."""
 
+        dims, data_type, required_shape = self._dims, self._data_type, self._required_shape
+
         shape_loc = (args, 0) if len(args) > 0 else (kwargs, 'shape')
         dtype_loc = (args, 1) if len(args) > 1 else (kwargs, 'dtype')
 
@@ -48,7 +59,21 @@ def create_typed_numpy_ndarray(
         # print('np.ndarray', args, kwargs)
         return np.ndarray(*args, **kwargs)
 
-    return typed_ndarray
+    def __reduce__(self):
+        key = (self._dims, self._data_type)
+        if self._required_shape is not None:
+            key += (self._required_shape,)
+        return _get_typed_numpy_ndarray, (key,)
+
+    def __repr__(self):
+        return 'ndarray[{}]'.format(', '.join(
+            repr(_) for _ in (self._dims, self._data_type, self._required_shape) if _ is not None))
+
+
+def create_typed_numpy_ndarray(
+        dims: int, data_type: t.ClassVar, required_shape: t.Optional[t.Sequence[int]] = None):
+    """Create a statically typed version of numpy.ndarray."""
+    return typed_numpy_ndarray(dims, data_type, required_shape)
 
 
 class typed_numpy_ndarray_factory(dict):
@@ -88,3 +113,7 @@ class typed_numpy_ndarray_factory(dict):
 
 
 ndarray = typed_numpy_ndarray_factory()
+
+
+def _get_typed_numpy_ndarray(key):
+    return ndarray[key]
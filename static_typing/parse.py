@@ -1,31 +1,86 @@
 """High-level functions for parsing and adding static type information to AST."""
 
+import ast
 import inspect
 import logging
+import sys
+import typing as t
 
-import typed_ast.ast3
-
-from .augment import augment
+from .ast_manipulation import TypeHintCache
+from .augment import DEFAULT_AST_MODULE, augment
+from .augmentation_stats import AugmentationStats
+from .module_cache import ModuleCache
 
 _LOG = logging.getLogger(__name__)
 
 
-def parse(source: str, eval_: bool = True, globals_=None, locals_=None, ast_module=typed_ast.ast3,
-          *args, **kwargs):
-    """Act like ast_module.parse() but also put static type info into AST."""
+def _caller_frame(stack_depth: int):
+    """Get frame that is stack_depth frames above the caller of this function."""
+    try:
+        return sys._getframe(stack_depth + 1)  # pylint: disable=protected-access
+    except AttributeError:
+        pass
+    frame = inspect.currentframe()
+    for _ in range(stack_depth + 1):
+        frame = frame.f_back
+    return frame
+
+
+def parse(source: str, eval_: bool = True, globals_=None, locals_=None,
+          ast_module=DEFAULT_AST_MODULE, *args, type_hint_cache: t.Optional[TypeHintCache] = None,
+          module_cache: t.Optional[ModuleCache] = None, stack_depth: int = 1,
+          stats: t.Optional[AugmentationStats] = None, **kwargs):
+    """Act like ast_module.parse() but also put static type info into AST.
+
+    If globals_ or locals_ are not given, they are taken from the frame of the caller.
+    Libraries that wrap parse() can set stack_depth to 2 (or more) to use the namespaces
+    of their own callers instead.
+
+    By default, built-in ast module is used when it is capable of parsing type comments,
+    and then type_comments=True is passed to ast.parse() unless specified otherwise.
 
+    If module_cache is given, the statically typed AST is loaded from it when available,
+    and stored in it otherwise -- unless the namespaces contain objects that cannot be
+    fingerprinted reliably (see ModuleCache).
+
+    If stats are given, time of parsing is added to them, and they are passed to augment().
+    """
+
+    assert isinstance(stack_depth, int) and stack_depth > 0, stack_depth
     if globals_ is None or locals_ is None:
-        frame_info = inspect.getouterframes(inspect.currentframe())[1]
-        caller_frame = frame_info[0]
+        caller_frame = _caller_frame(stack_depth)
         if globals_ is None:
             globals_ = caller_frame.f_globals
         if locals_ is None:
             locals_ = caller_frame.f_locals
+        del caller_frame
+
+    if ast_module is ast and sys.version_info[:2] >= (3, 8):
+        kwargs.setdefault('type_comments', True)
+
+    cache_key = None
+    if module_cache is not None:
+        cache_key = module_cache.key(source, eval_, globals_, locals_, ast_module,
+                                     args, sorted(kwargs.items()))
+    if cache_key is not None:
+        tree = module_cache.get(cache_key)
+        if tree is not None:
+            return tree
+
+    if stats is None:
+        tree = ast_module.parse(source, *args, **kwargs)
+    else:
+        with stats.phase('parse'):
+            tree = ast_module.parse(source, *args, **kwargs)
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug('%s', ast_module.dump(tree))
 
-    tree = ast_module.parse(source, *args, **kwargs)
-    _LOG.debug('%s', ast_module.dump(tree))
+    tree = augment(tree, eval_, globals_, locals_, ast_module, type_hint_cache=type_hint_cache,
+                   stats=stats)
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug('%s', ast_module.dump(tree))
 
-    tree = augment(tree, eval_, globals_, locals_, ast_module)
-    _LOG.debug('%s', ast_module.dump(tree))
+    if cache_key is not None:
+        module_cache.put(cache_key, tree)
 
     return tree
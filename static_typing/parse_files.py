@@ -0,0 +1,148 @@
+"""Parse and add static type information to many source files, using many processes."""
+
+import builtins
+import collections
+import concurrent.futures
+import importlib
+import itertools
+import logging
+import os
+import pathlib
+import tokenize
+import types
+import typing as t
+
+from .ast_manipulation import TypeHintCache
+from .augment import DEFAULT_AST_MODULE
+from .module_cache import ModuleCache
+from .parse import parse
+
+_LOG = logging.getLogger(__name__)
+
+ParsedFile = collections.namedtuple('ParsedFile', ['path', 'result', 'error'])
+"""Outcome of processing a single file.
+
+Result is either the augmented tree or the value returned by the function given to parse_files().
+If processing of the file failed, result is None and error holds the exception.
+"""
+
+_ModuleReference = collections.namedtuple('_ModuleReference', ['name'])
+
+_TYPE_HINT_CACHE = None
+"""Type hint cache shared by all files processed within one worker process."""
+
+
+def _pack_namespace(namespace: t.Optional[dict]) -> t.Optional[dict]:
+    """Prepare namespace for sending to another process by replacing modules with their names."""
+    if namespace is None:
+        return None
+    packed = {}
+    for name, value in namespace.items():
+        if value is vars(builtins):
+            value = builtins
+        if isinstance(value, types.ModuleType):
+            value = _ModuleReference(value.__name__)
+        packed[name] = value
+    return packed
+
+
+def _unpack_namespace(packed: t.Optional[dict]) -> t.Optional[dict]:
+    if packed is None:
+        return None
+    return {name: importlib.import_module(value.name) if isinstance(value, _ModuleReference)
+            else value for name, value in packed.items()}
+
+
+def _parse_file(path, eval_: bool, globals_, locals_, ast_module, function,
+                module_cache) -> ParsedFile:
+    global _TYPE_HINT_CACHE  # pylint: disable=global-statement
+    if _TYPE_HINT_CACHE is None:
+        _TYPE_HINT_CACHE = TypeHintCache()
+    if globals_ is None:
+        globals_ = {'__builtins__': builtins}
+    if locals_ is None:
+        locals_ = {}
+    try:
+        with tokenize.open(str(path)) as source_file:
+            source = source_file.read()
+        tree = parse(source, eval_, globals_, locals_, ast_module, str(path),
+                     type_hint_cache=_TYPE_HINT_CACHE, module_cache=module_cache)
+        result = tree if function is None else function(tree)
+    except Exception as err:  # pylint: disable=broad-except
+        _LOG.debug('failed to process "%s"', path, exc_info=True)
+        return ParsedFile(path, None, err)
+    return ParsedFile(path, result, None)
+
+
+def _parse_chunk(paths, eval_: bool, packed_globals, packed_locals, ast_module_name: str,
+                 function, module_cache) -> t.List[ParsedFile]:
+    globals_ = _unpack_namespace(packed_globals)
+    locals_ = _unpack_namespace(packed_locals)
+    ast_module = importlib.import_module(ast_module_name)
+    return [_parse_file(path, eval_, globals_, locals_, ast_module, function, module_cache)
+            for path in paths]
+
+
+def parse_files(
+        paths: t.Iterable[t.Union[str, pathlib.PurePath]], eval_: bool = True, globals_=None,
+        locals_=None, ast_module=DEFAULT_AST_MODULE, *, function: t.Optional[t.Callable] = None,
+        max_workers: t.Optional[int] = None, chunksize: int = 1, ordered: bool = True,
+        module_cache: t.Optional[ModuleCache] = None) -> t.Iterator[ParsedFile]:
+    """Act like parse() on contents of each of given files, distributing work among processes.
+
+    Files are sent to a process pool in chunks of chunksize paths. At most twice as many chunks
+    as there are workers are processed or waiting to be consumed at any time, so that results
+    do not pile up in memory when they are consumed slowly. If ordered is True, results are
+    yielded in order of given paths, otherwise they are yielded as soon as they are completed.
+
+    A failure to process one file does not stop processing of others -- instead, the exception
+    is captured in the error field of the result.
+
+    Augmented trees are pickled to be sent back from worker processes. If function is given,
+    it is applied to each augmented tree within the worker process and its result is returned
+    instead of the tree. The function, and the values in globals_
+    and locals_, must be picklable -- with the exception of modules, which are sent by name.
+    Unlike in case of parse(), globals_ and locals_ default to built-ins only.
+
+    If max_workers is 1, all files are processed in the current process.
+
+    If module_cache is given, it is used by each worker like in case of parse().
+    """
+    assert isinstance(chunksize, int) and chunksize > 0, chunksize
+    assert max_workers is None or isinstance(max_workers, int) and max_workers > 0, max_workers
+    paths = list(paths)
+    chunks = [paths[i:i + chunksize] for i in range(0, len(paths), chunksize)]
+    if max_workers == 1:
+        return (parsed_file for chunk in chunks
+                for parsed_file in _parse_chunk(chunk, eval_, globals_, locals_,
+                                                ast_module.__name__, function, module_cache))
+    return _parse_chunks_in_pool(
+        chunks, max_workers, ordered, eval_, _pack_namespace(globals_),
+        _pack_namespace(locals_), ast_module.__name__, function, module_cache)
+
+
+def _parse_chunks_in_pool(chunks, max_workers: t.Optional[int], ordered: bool,
+                          *args) -> t.Iterator[ParsedFile]:
+    max_pending = 2 * (max_workers or os.cpu_count() or 1)
+    chunks = iter(chunks)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = collections.OrderedDict()  # type: t.Dict[concurrent.futures.Future, list]
+        for chunk in itertools.islice(chunks, max_pending):
+            pending[executor.submit(_parse_chunk, chunk, *args)] = chunk
+        while pending:
+            if ordered:
+                done = [next(iter(pending))]
+            else:
+                done, _ = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                chunk = pending.pop(future)
+                for next_chunk in itertools.islice(chunks, 1):
+                    pending[executor.submit(_parse_chunk, next_chunk, *args)] = next_chunk
+                try:
+                    results = future.result()
+                except Exception as err:  # pylint: disable=broad-except
+                    _LOG.warning('failed to process chunk of %i files starting with "%s": %s',
+                                 len(chunk), chunk[0], err)
+                    results = [ParsedFile(path, None, err) for path in chunk]
+                yield from results
@@ -0,0 +1,137 @@
+"""Parse and add static type information to a module incrementally, statement by statement."""
+
+import ast
+import io
+import logging
+import sys
+import tokenize
+import typing as t
+
+from .ast_manipulation import TypeHintCache
+from .augment import DEFAULT_AST_MODULE, _create_typer
+from .nodes import StaticallyTypedModule
+from .parse import _caller_frame
+
+_LOG = logging.getLogger(__name__)
+
+_CONTINUATION_KEYWORDS = {'elif', 'else', 'except', 'finally'}
+"""Keywords which start a clause of the preceding compound statement instead of a new one."""
+
+_NON_CODE_TOKENS = {
+    tokenize.NL, tokenize.COMMENT, tokenize.INDENT, tokenize.DEDENT, tokenize.NEWLINE,
+    tokenize.ENDMARKER}
+
+
+def split_statements(readline: t.Callable[[], str]) -> t.Iterator[t.Tuple[int, str]]:
+    """Split source code into top-level statements, without parsing it as a whole.
+
+    The code is read line by line using the given readline function, and it is tokenized
+    to find where each top-level statement starts. Decorators and clauses like else, except
+    or finally stay together with their statements, and comments and blank lines are attached
+    to the preceding statement (or to the first one, if there is none).
+
+    Yield (line number, source code) tuples, where line number is the number of the first line
+    of the source code in the whole module. Only lines of the current statement are kept
+    in memory.
+    """
+    lines = []
+    first_lineno = 1
+
+    def read_and_keep_line():
+        line = readline()
+        lines.append(line)
+        return line
+
+    depth = 0
+    has_statement = False
+    at_line_start = True
+    after_decorator = False
+    for token in tokenize.generate_tokens(read_and_keep_line):
+        if token.type == tokenize.INDENT:
+            depth += 1
+        elif token.type == tokenize.DEDENT:
+            depth -= 1
+        elif token.type == tokenize.NEWLINE:
+            at_line_start = True
+        if token.type in _NON_CODE_TOKENS or not at_line_start:
+            continue
+        lineno = token.start[0]
+        if depth == 0 and has_statement and not after_decorator \
+                and token.string not in _CONTINUATION_KEYWORDS:
+            yield first_lineno, ''.join(lines[:lineno - first_lineno])
+            del lines[:lineno - first_lineno]
+            first_lineno = lineno
+        has_statement = True
+        after_decorator = token.string == '@'
+        at_line_start = False
+    if has_statement:
+        yield first_lineno, ''.join(lines)
+
+
+def _augment_statements(source, ast_module, typer, module, kwargs):
+    readline = io.StringIO(source).readline if isinstance(source, str) else source.readline
+    for lineno, code in split_statements(readline):
+        try:
+            tree = ast_module.parse(code, **kwargs)
+        except SyntaxError as error:
+            if error.lineno is not None:
+                error.lineno += lineno - 1
+            if getattr(error, 'end_lineno', None) is not None:
+                error.end_lineno += lineno - 1
+            raise
+        ast_module.increment_lineno(tree, lineno - 1)
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug('%s', ast_module.dump(tree))
+        if getattr(tree, 'type_ignores', None):
+            module.type_ignores += tree.type_ignores
+        for stmt in tree.body:
+            stmt = typer.visit(stmt)
+            module._add_statement_type_info(stmt)
+            yield stmt
+    return module
+
+
+def parse_statements(
+        source: t.Union[str, t.TextIO], eval_: bool = True, globals_=None, locals_=None,
+        ast_module=DEFAULT_AST_MODULE, *, type_hint_cache: t.Optional[TypeHintCache] = None,
+        module=None, stack_depth: int = 1, **kwargs) -> t.Generator[t.Any, None, t.Any]:
+    """Parse and put static type info into AST incrementally, one top-level statement at a time.
+
+    Source code is given either as a string, or as a text file, which is then read line by line.
+    Return a generator of statically typed top-level statements. When the generator finishes,
+    it returns the module.
+
+    Module is a statically typed Module, by default a new one with an empty body. Its tables
+    (module_vars, nonlocal_assignments, classes and functions) are updated as statements are
+    generated, but statements are not added to its body. Therefore, only the current statement
+    is kept in memory, and the rest are freed as soon as the caller drops them, except classes
+    and functions referenced from the tables.
+
+    Syntax errors are raised when the statement that contains them is reached, with line numbers
+    relative to the whole source code.
+
+    Other arguments are like in parse(), and globals_ and locals_ are taken from the frame
+    of the caller of this function (not of the one that iterates over the generator).
+    All statements share a single type hint resolver, created when this function is called,
+    so the namespaces should not be changed while statements are generated.
+    """
+
+    assert isinstance(stack_depth, int) and stack_depth > 0, stack_depth
+    if globals_ is None or locals_ is None:
+        caller_frame = _caller_frame(stack_depth)
+        if globals_ is None:
+            globals_ = caller_frame.f_globals
+        if locals_ is None:
+            locals_ = caller_frame.f_locals
+        del caller_frame
+
+    if ast_module is ast and sys.version_info[:2] >= (3, 8):
+        kwargs.setdefault('type_comments', True)
+
+    if module is None:
+        module = StaticallyTypedModule[ast_module](body=[], type_ignores=[])
+
+    _, typer = _create_typer(eval_, globals_, locals_, ast_module, type_hint_cache, True, False,
+                             None, None)
+
+    return _augment_statements(source, ast_module, typer, module, kwargs)
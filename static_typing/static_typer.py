@@ -5,7 +5,7 @@ import sys
 
 import typed_ast.ast3
 
-from .ast_manipulation import RecursiveAstTransformer
+from .ast_manipulation import RecursiveAstTransformer, EXPRESSION_NODE_TYPES
 from .nodes import \
     StaticallyTypedModule, StaticallyTypedFunctionDef, StaticallyTypedClassDef, \
     StaticallyTypedAssign, StaticallyTypedAnnAssign, StaticallyTypedFor, StaticallyTypedWith
@@ -21,10 +21,76 @@ def create_static_typer(ast_module):
 
         Substitute all nodes that are supposed to be statically typed (i.e. nodes_to_be_typed)
         with their statically typed versions.
+
+        If type_hint_resolver is given, type hints of each node are resolved right before
+        the node is typed, so that type hint resolution and typing are done in a single pass.
+        Since the traversal is bottom-up, hints of all descendants of a node (e.g. arguments
+        of a function) are always resolved before that node is typed.
+
+        Expression subtrees are not traversed, because they never contain nodes to be typed.
+
+        If in_place is True, nodes are upgraded to their statically typed versions in place,
+        instead of being copied -- see StaticallyTyped.from_other().
+
+        If detached is True, nodes are typed in place but fields of the tree are never rewritten,
+        and state of every node that is about to be resolved or typed is recorded first.
+        Typed nodes are gathered in typed_nodes, and once their type information is extracted,
+        restore_nodes() reverts them to exactly what they were, so that the tree is left intact
+        without copying any of its nodes.
+
+        If stats are given (see AugmentationStats), time of resolving type hints and of typing
+        nodes is added to them.
         """
 
-        def __init__(self, *args, **kwargs):
+        pruned_node_types = EXPRESSION_NODE_TYPES[ast_module]
+
+        def __init__(self, *args, type_hint_resolver=None, in_place: bool = False,
+                     detached: bool = False, stats=None, **kwargs):
             super().__init__(*args, fields_first=True, **kwargs)
+            self._resolve_type_hints = None
+            if type_hint_resolver is not None:
+                self._resolve_type_hints = type_hint_resolver.visit_node
+            self._in_place = in_place or detached
+            self._detached = detached
+            self._rewrites = not detached
+            self._saved_states = []
+            self._plain_names = {}
+            self.typed_nodes = []
+            if stats is not None:
+                if self._resolve_type_hints is not None:
+                    self._resolve_type_hints = stats.timed(
+                        'resolve_type_hints', self._resolve_type_hints)
+                self._type_node = stats.timed('type_nodes', self._type_node)
+
+        def _save_state(self, node) -> None:
+            """Record state of a node that is about to be changed in detached mode.
+
+            Nodes that have nothing but their fields and attributes are common, and they are
+            restored just by dropping everything else, so only other nodes are copied.
+            """
+            node_type = type(node)
+            try:
+                plain_names = self._plain_names[node_type]
+            except KeyError:
+                plain_names = frozenset(node_type._fields + node_type._attributes)
+                self._plain_names[node_type] = plain_names
+            if node.__dict__.keys() <= plain_names:
+                self._saved_states.append((node, node_type, plain_names, None))
+            else:
+                self._saved_states.append((node, node_type, None, node.__dict__.copy()))
+
+        def restore_nodes(self) -> None:
+            """Revert all nodes changed in detached mode to their state before typing."""
+            while self._saved_states:
+                node, node_type, plain_names, node_vars = self._saved_states.pop()
+                node.__class__ = node_type
+                if node_vars is None:
+                    for name in node.__dict__.keys() - plain_names:
+                        del node.__dict__[name]
+                else:
+                    node.__dict__.clear()
+                    node.__dict__.update(node_vars)
+            self.typed_nodes = []
 
         nodes_to_be_typed = {
             ast_module.Module: StaticallyTypedModule,
@@ -42,10 +108,29 @@ def create_static_typer(ast_module):
 
         def visit_node(self, node):
             """Introduce static typing information to compatible nodes of the AST."""
+            if self._detached and self._is_changed(node):
+                self._save_state(node)
+            if self._resolve_type_hints is not None:
+                node = self._resolve_type_hints(node)
             node_type = type(node)
-            if node_type in self.nodes_to_be_typed:
-                return self.nodes_to_be_typed[node_type][ast_module].from_other(node)
-            return node
+            if node_type not in self.nodes_to_be_typed:
+                return node
+            typed_node = self._type_node(node_type, node)
+            if self._detached:
+                if typed_node is not node:
+                    raise TypeError('{} cannot be typed in place, and therefore it cannot be'
+                                    ' typed in detached mode'.format(node_type.__name__))
+                self.typed_nodes.append(typed_node)
+            return typed_node
+
+        def _is_changed(self, node) -> bool:
+            """Check if resolving or typing will change a given node."""
+            return type(node) in self.nodes_to_be_typed or self._resolve_type_hints is not None \
+                and any(getattr(node, name, None) is not None
+                        for name in ('type_comment', 'annotation', 'returns'))
+
+        def _type_node(self, node_type: type, node):
+            return self.nodes_to_be_typed[node_type][ast_module].from_other(node, self._in_place)
 
     return StaticTyperClass
 
@@ -0,0 +1,59 @@
+"""Static type information about an AST, kept apart from the AST itself."""
+
+import collections.abc
+import types
+import typing as t
+
+from .nodes import StaticallyTyped
+from .nodes.statically_typed import EMPTY_TYPE_FIELD
+
+_EMPTY_FIELD = types.MappingProxyType(EMPTY_TYPE_FIELD)
+
+
+class TypeIndex(collections.abc.Mapping):
+
+    """Read-only mapping from nodes of an AST to static type information about them.
+
+    Only nodes that would be statically typed by augment() are in the index. For each of them,
+    the index holds a read-only mapping from names of type fields (e.g. 'module_vars',
+    'functions', 'params', 'local_vars' or 'instance_fields') to their contents. Wherever
+    the contents refer to statically typed nodes (e.g. functions of a module), they refer to
+    nodes of the original tree, so that the index can be used together with that tree.
+
+    The index is built from nodes that are temporarily typed in place (see StaticTyper),
+    and it takes over their type fields without copying them.
+
+    Nodes are looked up by identity, therefore the index is valid only as long as nodes
+    of the original tree are alive.
+    """
+
+    __slots__ = ('_entries',)
+
+    def __init__(self, typed_nodes: t.Iterable[StaticallyTyped]):
+        self._entries = {}
+        for node in typed_nodes:
+            type_info = {}
+            for field_name in type(node)._type_fields:
+                field = getattr(node, '_{}'.format(field_name))
+                if field is EMPTY_TYPE_FIELD:
+                    field = _EMPTY_FIELD
+                elif isinstance(field, dict):
+                    field = types.MappingProxyType(field)
+                type_info[field_name] = field
+            self._entries[id(node)] = node, types.MappingProxyType(type_info)
+
+    def __getitem__(self, node) -> t.Mapping[str, t.Any]:
+        indexed_node, type_info = self._entries[id(node)]
+        if indexed_node is not node:
+            raise KeyError(node)
+        return type_info
+
+    def __iter__(self):
+        for node, _ in self._entries.values():
+            yield node
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return '<{} of {} nodes>'.format(type(self).__name__, len(self))
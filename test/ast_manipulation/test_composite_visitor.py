@@ -0,0 +1,115 @@
+"""Unit tests for composite_visitor module."""
+
+import itertools
+import logging
+import sys
+import unittest
+
+from static_typing.ast_manipulation import \
+    AstValidator, CompositeVisitor, EXPRESSION_NODE_TYPES, RecursiveAstTransformer, \
+    RecursiveAstVisitor, StructuralHasher
+from test.examples import AST_MODULES, SOURCE_CODES
+
+_LOG = logging.getLogger(__name__)
+
+
+def create_recorders(ast_module):
+
+    class NodeRecorder(RecursiveAstVisitor[ast_module]):
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.calls = []
+
+        def visit_node(self, node):
+            self.calls.append(node)
+
+    class FieldRecorder(NodeRecorder):
+
+        def visit_field(self, node, name, value):
+            self.calls.append((node, name, value))
+
+    class StatementRecorder(NodeRecorder):
+
+        pruned_node_types = EXPRESSION_NODE_TYPES[ast_module]
+
+    return NodeRecorder, FieldRecorder, StatementRecorder
+
+
+class Tests(unittest.TestCase):
+
+    def test_same_calls_as_separate_visitors(self):
+        for ast_module in AST_MODULES:
+            node_recorder, field_recorder, statement_recorder = create_recorders(ast_module)
+
+            def create_visitors():
+                return [node_recorder(), node_recorder(fields_first=True), field_recorder(),
+                        statement_recorder(), statement_recorder(fields_first=True)]
+
+            for description, example in SOURCE_CODES.items():
+                with self.subTest(ast_module=ast_module, msg=description, example=example):
+                    tree = ast_module.parse(example)
+                    separate_visitors = create_visitors()
+                    for visitor in separate_visitors:
+                        visitor.visit(tree)
+                    for iterative in (False, True):
+                        visitors = create_visitors()
+                        CompositeVisitor[ast_module](visitors, iterative=iterative).visit(tree)
+                        for visitor, separate_visitor in zip(visitors, separate_visitors):
+                            self.assertListEqual(visitor.calls, separate_visitor.calls)
+                        self.assertNotIn(ast_module.Name,
+                                         {type(node) for node in visitors[3].calls})
+
+    def test_iterative_deep_tree(self):
+        for ast_module in AST_MODULES:
+            node_recorder, _, statement_recorder = create_recorders(ast_module)
+            with self.subTest(ast_module=ast_module):
+                tree = ast_module.parse('x = 0')
+                expression = tree.body[0].value
+                for _ in range(sys.getrecursionlimit() * 2):
+                    expression = ast_module.UnaryOp(ast_module.USub(), expression)
+                tree.body[0].value = expression
+                visitors = [node_recorder(), statement_recorder()]
+                CompositeVisitor[ast_module](visitors, iterative=True).visit(tree)
+                self.assertEqual(len(visitors[0].calls), len(list(ast_module.walk(tree))))
+                self.assertListEqual(visitors[1].calls, [tree, tree.body[0]])
+
+    def test_tracer(self):
+        for ast_module in AST_MODULES:
+            node_recorder, field_recorder, _ = create_recorders(ast_module)
+            for (description, example), recorder, iterative in itertools.product(
+                    SOURCE_CODES.items(), (node_recorder, field_recorder), (False, True)):
+                with self.subTest(ast_module=ast_module, msg=description, example=example,
+                                  recorder=recorder, iterative=iterative):
+                    tree = ast_module.parse(example)
+                    separate_events = []
+                    recorder(tracer=lambda *event: separate_events.append(event)).visit(tree)
+                    events = []
+                    CompositeVisitor[ast_module](
+                        [recorder()], iterative=iterative,
+                        tracer=lambda *event: events.append(event)).visit(tree)
+                    self.assertListEqual(events, separate_events)
+
+    def test_structural_hasher(self):
+        for ast_module in AST_MODULES:
+            for description, example in SOURCE_CODES.items():
+                with self.subTest(ast_module=ast_module, msg=description, example=example):
+                    tree = ast_module.parse(example)
+                    hasher = StructuralHasher[ast_module]()
+                    hasher.visit(tree)
+                    hashers = [StructuralHasher[ast_module](), StructuralHasher[ast_module]()]
+                    CompositeVisitor[ast_module](hashers).visit(tree)
+                    for composite_hasher in hashers:
+                        self.assertDictEqual(composite_hasher.hashes, hasher.hashes)
+
+    def test_only_visitors(self):
+        for ast_module in AST_MODULES:
+            with self.subTest(ast_module=ast_module):
+                with self.assertRaises(TypeError):
+                    CompositeVisitor[ast_module]([RecursiveAstTransformer[ast_module]()])
+                with self.assertRaises(TypeError):
+                    CompositeVisitor[ast_module]([ast_module.NodeVisitor()])
+                with self.assertRaises(TypeError):
+                    CompositeVisitor[ast_module]([AstValidator[ast_module](mode='exec')])
+                with self.assertRaises(ValueError):
+                    CompositeVisitor[ast_module]([], fields_first=True)
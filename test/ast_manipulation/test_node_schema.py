@@ -0,0 +1,70 @@
+"""Unit tests for node_schema module."""
+
+import logging
+import unittest
+
+from static_typing.ast_manipulation.node_schema import FieldKind, field_kinds, parse_asdl
+from static_typing.ast_manipulation.recursive_ast_visitor import RecursiveAstVisitor
+from static_typing.nodes import StaticallyTypedAssign
+from test.examples import AST_MODULES, SOURCE_CODES
+
+_LOG = logging.getLogger(__name__)
+
+
+class Tests(unittest.TestCase):
+
+    def test_parse_asdl(self):
+        field_kinds_by_node_name = parse_asdl('''
+            stmt = Global(identifier* names) -- comment
+                 | Return(expr? value)
+                 | If(expr test, stmt* body, stmt* orelse)
+                 | Pass
+            alias = (identifier name, identifier? asname)
+                    attributes (int lineno, int col_offset)''')
+        self.assertDictEqual(field_kinds_by_node_name, {
+            'Global': {'names': FieldKind.ScalarList},
+            'Return': {'value': FieldKind.Node},
+            'If': {'test': FieldKind.Node, 'body': FieldKind.NodeList,
+                   'orelse': FieldKind.NodeList},
+            'alias': {'name': FieldKind.Scalar, 'asname': FieldKind.Scalar}})
+
+    def test_field_kinds(self):
+        for ast_module in AST_MODULES:
+            with self.subTest(ast_module=ast_module):
+                for node_type in (
+                        ast_module.Module, ast_module.FunctionDef, ast_module.Assign,
+                        ast_module.Name, ast_module.arguments, ast_module.Load):
+                    kinds = field_kinds(node_type)
+                    self.assertTupleEqual(tuple(name for name, _ in kinds), node_type._fields)
+                    self.assertIs(field_kinds(node_type), kinds)
+                    for name, kind in kinds:
+                        self.assertIsNot(kind, FieldKind.Dynamic, msg=(node_type, name))
+                self.assertEqual(dict(field_kinds(ast_module.Name)),
+                                 {'id': FieldKind.Scalar, 'ctx': FieldKind.Node})
+                self.assertEqual(dict(field_kinds(StaticallyTypedAssign[ast_module]))['targets'],
+                                 FieldKind.NodeList)
+
+    def test_skip_scalar_fields(self):
+        for ast_module in AST_MODULES:
+            for description, example in SOURCE_CODES.items():
+                with self.subTest(ast_module=ast_module, msg=description, example=example):
+                    class VisitorClass(RecursiveAstVisitor[ast_module]):
+                        def visit_node(self, node):
+                            self.nodes.append(node)
+
+                    class FieldVisitorClass(VisitorClass):
+                        def visit_field(self, node, name, value):
+                            self.fields.append(value)
+
+                    visitor = VisitorClass()
+                    visitor.nodes = []
+                    field_visitor = FieldVisitorClass()
+                    field_visitor.nodes = []
+                    field_visitor.fields = []
+                    tree = ast_module.parse(example)
+                    visitor.visit(tree)
+                    field_visitor.visit(tree)
+                    self.assertListEqual(visitor.nodes, field_visitor.nodes)
+                    self.assertTrue(field_visitor.fields)
+                    self.assertFalse(visitor._visits_scalars)
+                    self.assertTrue(field_visitor._visits_scalars)
@@ -0,0 +1,64 @@
+"""Unit tests for profiling module."""
+
+import logging
+import unittest
+
+from static_typing.ast_manipulation import \
+    ProfilingMixin, RecursiveAstTransformer, RecursiveAstVisitor
+from test.examples import AST_MODULES, SOURCE_CODES
+
+_LOG = logging.getLogger(__name__)
+
+
+class Tests(unittest.TestCase):
+
+    def test_profile_visitor(self):
+        for ast_module in AST_MODULES:
+
+            class FieldCounter(RecursiveAstVisitor[ast_module]):
+
+                def __init__(self, *args, **kwargs):
+                    super().__init__(*args, **kwargs)
+                    self.fields = 0
+
+                def visit_field(self, node, name, value):
+                    self.fields += 1
+
+            class ProfiledFieldCounter(ProfilingMixin, FieldCounter):
+                pass
+
+            for description, example in SOURCE_CODES.items():
+                with self.subTest(ast_module=ast_module, msg=description, example=example):
+                    tree = ast_module.parse(example)
+                    visitor = ProfiledFieldCounter()
+                    visitor.visit(tree)
+                    node_types = [type(node) for node in ast_module.walk(tree)]
+                    self.assertDictEqual(
+                        {node_type: calls
+                         for node_type, (calls, _) in visitor.node_profile.items()},
+                        {node_type: node_types.count(node_type)
+                         for node_type in set(node_types)})
+                    self.assertEqual(
+                        sum(calls for calls, _ in visitor.field_profile.values()),
+                        visitor.fields)
+                    self.assertIn('id', visitor.field_profile)
+                    self.assertNotIn(0, visitor.field_profile)
+                    profile = visitor.profile()
+                    self.assertListEqual(profile, sorted(profile, key=lambda row: -row[3]))
+                    report = visitor.profile_report(limit=3).splitlines()
+                    self.assertEqual(len(report), 4)
+                    self.assertTrue(report[0].startswith('kind'))
+
+    def test_profile_transformer(self):
+        for ast_module in AST_MODULES:
+
+            class ProfiledTransformer(ProfilingMixin, RecursiveAstTransformer[ast_module]):
+                pass
+
+            with self.subTest(ast_module=ast_module):
+                tree = ast_module.parse('spam = ham + 1')
+                transformer = ProfiledTransformer()
+                self.assertFalse(transformer._visits_scalars)
+                self.assertIs(transformer.visit(tree), tree)
+                self.assertEqual(transformer.node_profile[ast_module.Module][0], 1)
+                self.assertDictEqual(transformer.field_profile, {})
@@ -0,0 +1,67 @@
+"""Unit tests for structural_hasher module."""
+
+import ast
+import logging
+import unittest
+
+from static_typing.ast_manipulation import StructuralHasher
+from static_typing.ast_manipulation.structural_hasher import DIGEST_SIZE, structural_hash
+from static_typing.augment import augment
+from test.examples import AST_MODULES, SOURCE_CODES, GLOBALS_EXTERNAL
+
+_LOG = logging.getLogger(__name__)
+
+
+class Tests(unittest.TestCase):
+
+    def test_ignore_locations(self):
+        for ast_module in AST_MODULES:
+            for description, example in SOURCE_CODES.items():
+                with self.subTest(ast_module=ast_module, msg=description, example=example):
+                    tree = ast_module.parse(example)
+                    moved_tree = ast_module.parse(example)
+                    ast_module.increment_lineno(moved_tree, 10)
+                    hasher = StructuralHasher[ast_module]()
+                    hasher.visit(tree)
+                    hasher.visit(moved_tree)
+                    for node, moved_node in zip(ast_module.walk(tree), ast_module.walk(moved_tree)):
+                        self.assertEqual(len(hasher.hashes[node]), DIGEST_SIZE)
+                        self.assertEqual(hasher.hashes[node], hasher.hashes[moved_node])
+                    iterative_hasher = StructuralHasher[ast_module](iterative=True)
+                    iterative_hasher.visit(tree)
+                    self.assertDictEqual(iterative_hasher.hashes,
+                                         {node: hasher.hashes[node]
+                                          for node in ast_module.walk(tree)})
+
+    def test_distinguish_structures(self):
+        examples = [
+            'def spam(x):\n    return x + 1\n',
+            'def spam(x):\n    return x + 2\n',
+            'def spam(x):\n    return x - 1\n',
+            'def spam(y):\n    return y + 1\n',
+            'def ham(x):\n    return x + 1\n',
+            'def spam(x):\n    return x + 1.0\n',
+            'def spam(x):\n    return x + "1"\n',
+            'def spam(x):\n    return (x + 1)\n    pass\n',
+            'def spam(x):\n    y = x + 1  # type: int\n',
+            'def spam(x):\n    y = x + 1  # type: float\n',
+            'def spam(x):\n    y = x + 1\n',
+            'def spam(x):\n    x, = x + 1,\n']
+        for ast_module in AST_MODULES:
+            kwargs = {'type_comments': True} if ast_module is ast else {}
+            with self.subTest(ast_module=ast_module):
+                hashes = [structural_hash(ast_module, ast_module.parse(example, **kwargs))
+                          for example in examples]
+                self.assertEqual(len(set(hashes)), len(examples))
+                self.assertEqual(structural_hash(ast_module, ast_module.parse(examples[0])),
+                                 structural_hash(ast_module, ast_module.parse(
+                                     '\n\ndef spam(x):\n    return (x +\n            1)\n')))
+
+    def test_statically_typed_nodes(self):
+        for ast_module in AST_MODULES:
+            for description, example in SOURCE_CODES.items():
+                with self.subTest(ast_module=ast_module, msg=description, example=example):
+                    tree_hash = structural_hash(ast_module, ast_module.parse(example))
+                    augmented_tree = augment(ast_module.parse(example), globals_=GLOBALS_EXTERNAL,
+                                             ast_module=ast_module, in_place=False)
+                    self.assertEqual(structural_hash(ast_module, augmented_tree), tree_hash)
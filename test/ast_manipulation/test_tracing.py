@@ -0,0 +1,82 @@
+"""Unit tests for tracing module."""
+
+import ast
+import logging
+import unittest
+
+from static_typing.ast_manipulation import \
+    AstTranscriber, RecursiveAstTransformer, RecursiveAstVisitor, create_logging_tracer
+from static_typing.augment import augment
+from test.examples import AST_MODULES, SOURCE_CODES, GLOBALS_EXTERNAL
+
+_LOG = logging.getLogger(__name__)
+
+
+class Recorder:
+
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, event, node, *details):
+        self.events.append((event, node) + details)
+
+    def nodes(self, event):
+        return [node for event_, node, *_ in self.events if event_ == event]
+
+
+class Tests(unittest.TestCase):
+
+    def test_visitors(self):
+        for ast_module in AST_MODULES:
+            for description, example in SOURCE_CODES.items():
+                tree = ast_module.parse(example)
+                all_nodes = list(ast_module.walk(tree))
+                for visitor_type, iterative in [
+                        (visitor_type, iterative)
+                        for visitor_type in (RecursiveAstVisitor, RecursiveAstTransformer)
+                        for iterative in (False, True)]:
+                    with self.subTest(ast_module=ast_module, msg=description, example=example,
+                                      visitor_type=visitor_type, iterative=iterative):
+                        tracer = Recorder()
+                        visitor_type[ast_module](iterative=iterative, tracer=tracer).visit(tree)
+                        self.assertCountEqual(tracer.nodes('visit_node'), all_nodes)
+                        self.assertCountEqual(tracer.nodes('visit_fields'), all_nodes)
+
+    def test_transcriber(self):
+        for from_ast_module, to_ast_module in zip(AST_MODULES, reversed(AST_MODULES)):
+            for description, example in SOURCE_CODES.items():
+                with self.subTest(from_ast_module=from_ast_module, msg=description,
+                                  example=example):
+                    tree = from_ast_module.parse(example)
+                    all_nodes = list(from_ast_module.walk(tree))
+                    tracer = Recorder()
+                    AstTranscriber[from_ast_module, to_ast_module](tracer=tracer).visit(tree)
+                    transcribed = tracer.nodes('transcribe')
+                    self.assertCountEqual(transcribed, all_nodes)
+                    for _, node, target_type in (
+                            event for event in tracer.events if event[0] == 'transcribe'):
+                        self.assertEqual(target_type.__name__, type(node).__name__)
+
+    def test_augment(self):
+        example = 'def spam(x: int) -> float:\n    y = x  # type: float\n    return y\n'
+        tracer = Recorder()
+        tree = augment(ast.parse(example, type_comments=True), globals_=GLOBALS_EXTERNAL,
+                       tracer=tracer)
+        function = tree.body[0]
+        resolved = [event[1:] for event in tracer.events if event[0] == 'resolve_type_hint']
+        self.assertListEqual(resolved, [
+            (function.args.args[0], 'annotation', int),
+            (function.body[0], 'type_comment', float),
+            (function, 'returns', float)])
+        self.assertIn(tree, tracer.nodes('visit_node'))
+
+    def test_logging_tracer(self):
+        tree = ast.parse('spam = 1')
+        logger = logging.getLogger('test.tracing')
+        with self.assertLogs(logger, level=logging.DEBUG) as logs:
+            RecursiveAstVisitor[ast](tracer=create_logging_tracer(logger)).visit(tree)
+        self.assertEqual(len(logs.records), 2 * len(list(ast.walk(tree))))
+        self.assertTrue(logs.output[0].startswith('DEBUG:test.tracing:visiting node <'))
+        with self.assertLogs(logger, level=logging.DEBUG) as logs:
+            create_logging_tracer(logger)('custom event', tree, 'detail')
+        self.assertTrue(logs.output[0].endswith(' detail'), msg=logs.output)
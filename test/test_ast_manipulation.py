@@ -1,26 +1,38 @@
 """Unit tests for ast_manipulation module."""
 
 import ast
+import collections
 import collections.abc
+import gc
 import itertools
 import logging
 import sys
 import unittest
+import unittest.mock
+import weakref
 
 import typed_ast.ast3 as typed_ast3
 
-from static_typing.ast_manipulation.recursive_ast_visitor import RecursiveAstVisitor
+from static_typing.ast_manipulation.recursive_ast_visitor import \
+    RecursiveAstVisitor, EXPRESSION_NODE_TYPES
 from static_typing.ast_manipulation.ast_validator import AstValidator
 from static_typing.ast_manipulation.recursive_ast_transformer import RecursiveAstTransformer
 from static_typing.ast_manipulation.ast_transcriber import AstTranscriber
-from static_typing.ast_manipulation.type_hint_resolver import TypeHintResolver
+from static_typing.ast_manipulation.type_hint_resolver import TypeHintCache, TypeHintResolver
 from .examples import \
-    AST_MODULES, FUNCTIONS_SOURCE_CODES, SOURCE_CODES, TYPE_HINTS, GLOBALS_EXTERNAL, \
-    GLOBALS_EXAMPLES, LOCALS_EXTERNAL, LOCALS_EXAMPLES, VARIETY_EXAMPLES
+    AST_MODULES, FUNCTIONS_SOURCE_CODES, SOURCE_CODES, TYPE_HINTS, GLOBALS_CLEAR, \
+    GLOBALS_EXTERNAL, GLOBALS_EXAMPLES, LOCALS_EXTERNAL, LOCALS_EXAMPLES, VARIETY_EXAMPLES
 
 _LOG = logging.getLogger(__name__)
 
 
+def _walk_in_order(ast_module, node):
+    """Yield all nodes of a tree in depth-first pre-order."""
+    yield node
+    for child in ast_module.iter_child_nodes(node):
+        yield from _walk_in_order(ast_module, child)
+
+
 class Tests(unittest.TestCase):
 
     maxDiff = None
@@ -76,6 +88,150 @@ class Tests(unittest.TestCase):
                     ast_module.dump(tree, include_attributes=True),
                     ast_module.dump(original_tree, include_attributes=True))
 
+    def test_pruning(self):
+        for ast_module, fields_first, (description, example) in itertools.product(
+                AST_MODULES, (False, True), SOURCE_CODES.items()):
+            with self.subTest(ast_module=ast_module, msg=description, example=example):
+                class VisitorClass(RecursiveAstVisitor[ast_module]):
+                    pruned_node_types = EXPRESSION_NODE_TYPES[ast_module]
+                    visited_nodes = []
+
+                    def visit_node(self, node):
+                        self.visited_nodes.append(node)
+
+                class TransformerClass(RecursiveAstTransformer[ast_module]):
+                    pruned_node_types = EXPRESSION_NODE_TYPES[ast_module]
+                    visited_nodes = []
+
+                    def visit_node(self, node):
+                        self.visited_nodes.append(node)
+                        return node
+                tree = ast_module.parse(example)
+                VisitorClass(fields_first).visit(tree)
+                TransformerClass(fields_first).visit(tree)
+                self.assertListEqual(
+                    [type(node) for node in VisitorClass.visited_nodes],
+                    [type(node) for node in TransformerClass.visited_nodes])
+                self.assertTrue(VisitorClass.visited_nodes)
+                for node in VisitorClass.visited_nodes:
+                    self.assertNotIsInstance(node, EXPRESSION_NODE_TYPES[ast_module])
+                self.assertEqual(ast_module.dump(tree),
+                                 ast_module.dump(ast_module.parse(example)))
+                expression = next(node for node in ast_module.walk(tree)
+                                  if isinstance(node, ast_module.expr))
+                VisitorClass.visited_nodes.clear()
+                VisitorClass().visit(expression)
+                self.assertIs(VisitorClass.visited_nodes[0], expression)
+
+    def test_iterative_traversal(self):
+        for ast_module, fields_first, (description, example) in itertools.product(
+                AST_MODULES, (False, True), SOURCE_CODES.items()):
+            with self.subTest(ast_module=ast_module, msg=description, example=example):
+                class VisitorClass(RecursiveAstVisitor[ast_module]):
+                    def __init__(self, *args, **kwargs):
+                        super().__init__(*args, **kwargs)
+                        self.calls = []
+
+                    def visit_node(self, node):
+                        self.calls.append(('node', type(node)))
+
+                    def visit_field(self, node, name, value):
+                        self.calls.append(('field', name, value))
+
+                    def visit_Return(self, node):
+                        self.calls.append(('return',))
+                        self.generic_visit(node)
+
+                class TransformerClass(RecursiveAstTransformer[ast_module]):
+                    def visit_node(self, node):
+                        if isinstance(node, ast_module.Name):
+                            node.id = '{}_{}'.format(node.id, self._fields_first)
+                        if self._fields_first and isinstance(node, ast_module.Assign):
+                            return [node, node]
+                        return node
+
+                recursive_visitor = VisitorClass(fields_first)
+                iterative_visitor = VisitorClass(fields_first, iterative=True)
+                recursive_visitor.visit(ast_module.parse(example))
+                iterative_visitor.visit(ast_module.parse(example))
+                self.assertTrue(iterative_visitor.calls)
+                self.assertListEqual(recursive_visitor.calls, iterative_visitor.calls)
+                recursive_tree = TransformerClass(fields_first).visit(ast_module.parse(example))
+                iterative_tree = TransformerClass(fields_first, iterative=True).visit(
+                    ast_module.parse(example))
+                self.assertEqual(ast_module.dump(recursive_tree), ast_module.dump(iterative_tree))
+
+    def test_overridden_generic_visit_field(self):
+        for ast_module, iterative, (description, example) in itertools.product(
+                AST_MODULES, (False, True), SOURCE_CODES.items()):
+            with self.subTest(ast_module=ast_module, msg=description, example=example):
+                class VisitorClass(RecursiveAstVisitor[ast_module]):
+                    def __init__(self, *args, **kwargs):
+                        super().__init__(*args, **kwargs)
+                        self.nodes = []
+                        self.fields = []
+
+                    def visit_node(self, node):
+                        self.nodes.append(node)
+
+                    def generic_visit_field(self, node, name, value):
+                        if isinstance(name, str):
+                            self.fields.append((type(node), name))
+                        super().generic_visit_field(node, name, value)
+
+                class TransformerClass(RecursiveAstTransformer[ast_module]):
+                    fields = []
+
+                    def generic_visit_field(self, node, name, value):
+                        if isinstance(name, str):
+                            self.fields.append((type(node), name))
+                        return super().generic_visit_field(node, name, value)
+
+                tree = ast_module.parse(example)
+                visitor = VisitorClass(iterative=iterative)
+                visitor.visit(tree)
+                self.assertListEqual(visitor.nodes, list(_walk_in_order(ast_module, tree)))
+                expected_fields = collections.Counter(
+                    (type(node), name) for node in visitor.nodes
+                    for name, _ in ast_module.iter_fields(node))
+                self.assertEqual(collections.Counter(visitor.fields), expected_fields)
+                TransformerClass.fields = []
+                tree = TransformerClass(iterative=iterative).visit(tree)
+                self.assertListEqual(TransformerClass.fields, visitor.fields)
+                self.assertEqual(ast_module.dump(tree), ast_module.dump(ast_module.parse(example)))
+
+    def test_iterative_traversal_of_deep_tree(self):
+        depth = 100000
+        for ast_module in AST_MODULES:
+            with self.subTest(ast_module=ast_module):
+                expression = ast_module.Name('a', ast_module.Load())
+                for _ in range(depth):
+                    expression = ast_module.BinOp(
+                        expression, ast_module.Add(), ast_module.Name('a', ast_module.Load()))
+                tree = ast_module.Expression(expression)
+
+                class VisitorClass(RecursiveAstVisitor[ast_module]):
+                    names = 0
+
+                    def visit_node(self, node):
+                        if isinstance(node, ast_module.Name):
+                            type(self).names += 1
+
+                class TransformerClass(RecursiveAstTransformer[ast_module]):
+                    def visit_node(self, node):
+                        if isinstance(node, ast_module.Name):
+                            node.id = 'b'
+                        return node
+
+                with self.assertRaises(RecursionError):
+                    VisitorClass().visit(tree)
+                VisitorClass.names = 0
+                VisitorClass(True, iterative=True).visit(tree)
+                self.assertEqual(VisitorClass.names, depth + 1)
+                tree = TransformerClass(iterative=True).visit(tree)
+                self.assertEqual(tree.body.right.id, 'b')
+                self.assertEqual(tree.body.left.left.right.id, 'b')
+
     def test_transform_one_to_many(self):
         for ast_module, fields_first, (description, example) in itertools.product(
                 AST_MODULES, (False, True), FUNCTIONS_SOURCE_CODES.items()):
@@ -147,6 +303,40 @@ class Tests(unittest.TestCase):
                 with self.assertLogs(None, logging.WARNING):
                     validator.visit(tree)
 
+    def test_ast_validator_dispatch(self):
+        for ast_module in AST_MODULES:
+            with self.subTest(ast_module=ast_module):
+                validated = []
+
+                class MyValidator(AstValidator[ast_module]):
+                    def validate_Name(self, name):
+                        validated.append(name.id)
+                        super().validate_Name(name)
+
+                tree = ast_module.parse('x = y + z', mode='exec')
+                MyValidator().visit(tree)
+                AstValidator[ast_module]().visit(tree)
+                self.assertListEqual(validated, ['x', 'y', 'z'])
+                validator1, validator2 = MyValidator(), MyValidator()
+                self.assertIs(validator1._dispatch_table, validator2._dispatch_table)
+                self.assertIsNot(validator1._dispatch_table,
+                                 AstValidator[ast_module]()._dispatch_table)
+                self.assertIn(ast_module.Name, validator1._dispatch_table)
+
+    @unittest.skipIf(sys.version_info[:2] < (3, 8), 'requires Constant nodes in built-in ast')
+    def test_ast_validator_dispatch_by_value(self):
+        examples = {'42': 'Num', '"spam"': 'Str', 'b"ham"': 'Bytes', 'None': 'NameConstant'}
+        for example, validator_name in examples.items():
+            with self.subTest(example=example):
+                tree = ast.parse(example, mode='eval')
+                validator_class = type('MyValidator', (AstValidator[ast],), {})
+                with unittest.mock.patch.multiple(validator_class, **{
+                        'validate_{}'.format(name): unittest.mock.DEFAULT
+                        for name in examples.values()}) as mocks:
+                    validator_class().visit(tree)
+                for name, mock in mocks.items():
+                    self.assertEqual(mock.called, name == 'validate_{}'.format(validator_name))
+
     def test_ast_transcriber(self):
         for from_ast_module, to_ast_module in itertools.product(AST_MODULES, AST_MODULES):
             if from_ast_module is to_ast_module:
@@ -259,3 +449,70 @@ class Tests(unittest.TestCase):
                                     # TODO: validate non-flat resolved hints
                             else:
                                 self.assertIsInstance(hint, parser_ast_module.AST)
+
+    def test_type_hint_cache(self):
+        cache = TypeHintCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertNotIn('b', cache)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.info(), (2, 1, 2, 2))
+        cache.clear()
+        self.assertEqual(cache.info(), (0, 0, 2, 0))
+
+    def test_type_hint_resolver_cache(self):
+        for ast_module in AST_MODULES:
+            with self.subTest(ast_module=ast_module):
+                cache = TypeHintCache()
+                resolver = TypeHintResolver[ast_module, ast](globals_=GLOBALS_EXTERNAL, cache=cache)
+                for hint in ('int', ' int', 't.Any', 't . Any ', 'int'):
+                    resolver.resolve_type_hint(hint)
+                self.assertEqual(cache.misses, 2)
+                self.assertEqual(cache.hits, 3)
+                resolver = TypeHintResolver[ast_module, ast](globals_=GLOBALS_CLEAR, cache=cache)
+                self.assertIs(resolver.resolve_type_hint('int'), int)
+                self.assertEqual(cache.misses, 3)
+                resolver = TypeHintResolver[ast_module, ast_module](eval_=False, cache=cache)
+                self.assertIsNot(resolver.resolve_type_hint('int'),
+                                 resolver.resolve_type_hint('int'))
+                self.assertEqual(len(cache), 3)
+
+    def test_type_hint_resolver_cache_with_reused_ids(self):
+        class Spam:
+            pass
+
+        class Ham:
+            pass
+        for ast_module in AST_MODULES:
+            with self.subTest(ast_module=ast_module):
+                cache = TypeHintCache()
+                with unittest.mock.patch(
+                        'static_typing.ast_manipulation.type_hint_resolver.id',
+                        create=True, return_value=0):
+                    for value in (Spam, Ham, Spam):
+                        resolver = TypeHintResolver[ast_module, ast](
+                            globals_={'V': value}, cache=cache)
+                        self.assertIs(resolver.resolve_type_hint('V'), value)
+                        self.assertIs(resolver.resolve_type_hint('V'), value)
+                self.assertEqual((cache.hits, cache.misses), (3, 3))
+
+    def test_type_hint_cache_keeps_referenced_objects_alive(self):
+        class Spam:
+            pass
+
+        class Ham:
+            pass
+        references = weakref.ref(Spam), weakref.ref(Ham)
+        cache = TypeHintCache()
+        resolver = TypeHintResolver[ast, ast](globals_={'V': Spam, 'W': Ham}, cache=cache)
+        self.assertIs(resolver.resolve_type_hint('V'), Spam)
+        del Spam, Ham, resolver
+        gc.collect()
+        self.assertIsNotNone(references[0]())
+        self.assertIsNone(references[1]())
+        cache.clear()
+        gc.collect()
+        self.assertIsNone(references[0]())
@@ -1,12 +1,23 @@
 """Unit tests for augment() and parse() functions."""
 
+import ast
 import itertools
 import logging
 import sys
+import typing as t
 import unittest
+import unittest.mock
 
-from static_typing.augment import augment
+import typed_ast.ast3
+
+from static_typing.ast_manipulation import AstTranscriber, TypeHintCache, TypeHintResolver
+from static_typing.augment import DEFAULT_AST_MODULE, augment, reaugment
+from static_typing.augmentation_stats import AugmentationStats
+from static_typing.nodes import StaticallyTyped
 from static_typing.parse import parse
+from static_typing.static_typer import StaticTyper
+from static_typing.type_index import TypeIndex
+from static_typing.unparse import unparse
 from .examples import \
     AST_MODULES, FUNCTIONS_SOURCE_CODES, CLASSES_SOURCE_CODES, SOURCE_CODES, GLOBALS_EXTERNAL, \
     GLOBALS_EXAMPLES, LOCALS_EXTERNAL, LOCALS_EXAMPLES
@@ -76,6 +87,219 @@ class Tests(unittest.TestCase):
                     tree = parse(example, True, globals_, locals_, ast_module)
                     # TODO: validate tree
 
+    def test_augment_like_separate_passes(self):
+        for ast_module in AST_MODULES:
+            for description, example in SOURCE_CODES.items():
+                with self.subTest(ast_module=ast_module, msg=description, example=example):
+                    tree = ast_module.parse(example)
+                    tree = TypeHintResolver[ast_module, ast](globals_=GLOBALS_EXTERNAL).visit(tree)
+                    tree = StaticTyper[ast_module]().visit(tree)
+                    augmented_tree = augment(ast_module.parse(example), globals_=GLOBALS_EXTERNAL,
+                                             ast_module=ast_module)
+                    self.assertEqual(ast_module.dump(augmented_tree), ast_module.dump(tree))
+                    self.assertEqual(str(augmented_tree), str(tree))
+                    for typed, augmented in zip(ast_module.walk(tree),
+                                                ast_module.walk(augmented_tree)):
+                        self.assertIs(type(typed), type(augmented))
+                        for field in ('resolved_type_comment', 'resolved_annotation',
+                                      'resolved_returns'):
+                            self.assertEqual(getattr(augmented, field, None),
+                                             getattr(typed, field, None))
+
+    def test_augment_in_place(self):
+        for ast_module in AST_MODULES:
+            for description, example in SOURCE_CODES.items():
+                with self.subTest(ast_module=ast_module, msg=description, example=example):
+                    tree = ast_module.parse(example)
+                    nodes = list(ast_module.walk(tree))
+                    augmented_tree = augment(tree, globals_=GLOBALS_EXTERNAL,
+                                             ast_module=ast_module)
+                    self.assertIs(augmented_tree, tree)
+                    self.assertListEqual(list(ast_module.walk(augmented_tree)), nodes)
+                    copied_tree = augment(ast_module.parse(example), globals_=GLOBALS_EXTERNAL,
+                                          ast_module=ast_module, in_place=False)
+                    self.assertEqual(ast_module.dump(augmented_tree), ast_module.dump(copied_tree))
+                    self.assertEqual(str(augmented_tree), str(copied_tree))
+
+    def test_augment_index(self):
+        for ast_module in AST_MODULES:
+            for description, example in SOURCE_CODES.items():
+                with self.subTest(ast_module=ast_module, msg=description, example=example):
+                    tree = ast_module.parse(example)
+                    dump = ast_module.dump(tree, include_attributes=True)
+                    nodes = {node: {name: id(value) for name, value in vars(node).items()}
+                             for node in ast_module.walk(tree)}
+                    index = augment(tree, globals_=GLOBALS_EXTERNAL, ast_module=ast_module,
+                                    mode='index')
+                    self.assertIsInstance(index, TypeIndex)
+                    self.assertEqual(ast_module.dump(tree, include_attributes=True), dump)
+                    for node, node_vars in nodes.items():
+                        self.assertNotIsInstance(node, StaticallyTyped[ast_module])
+                        self.assertDictEqual(
+                            {name: id(value) for name, value in vars(node).items()}, node_vars)
+                    augmented_tree = augment(ast_module.parse(example), globals_=GLOBALS_EXTERNAL,
+                                             ast_module=ast_module)
+                    typed_nodes = [
+                        (node, typed_node) for node, typed_node in zip(
+                            ast_module.walk(tree), ast_module.walk(augmented_tree))
+                        if isinstance(typed_node, StaticallyTyped[ast_module])]
+                    self.assertEqual(len(index), len(typed_nodes))
+                    for node, typed_node in typed_nodes:
+                        type_info = index[node]
+                        self.assertIn(node, index)
+                        self.assertSetEqual(set(type_info), set(type(typed_node)._type_fields))
+                        for field_name, field in type_info.items():
+                            typed_field = getattr(typed_node, '_{}'.format(field_name))
+                            self.assertEqual(len(field), len(typed_field))
+                            if field_name in ('module_vars', 'local_vars', 'params'):
+                                self.assertDictEqual(dict(field), typed_field)
+                        with self.assertRaises(TypeError):
+                            type_info['spam'] = {}
+                    for function in index[tree]['functions'].values():
+                        self.assertIn(function, nodes)
+                    self.assertNotIn(augmented_tree, index)
+        with self.assertRaises(ValueError):
+            augment(ast.parse(''), mode='spam')
+
+    def test_augment_index_failure(self):
+        def tracer(event, node, *details):
+            if event == 'visit_node' and isinstance(node, ast_module.Module):
+                raise RuntimeError('failing after all statements are typed')
+
+        for ast_module in AST_MODULES:
+            for description, example in SOURCE_CODES.items():
+                with self.subTest(ast_module=ast_module, msg=description, example=example):
+                    tree = ast_module.parse(example)
+                    dump = ast_module.dump(tree, include_attributes=True)
+                    with self.assertRaises(RuntimeError):
+                        augment(tree, globals_=GLOBALS_EXTERNAL, ast_module=ast_module,
+                                mode='index', tracer=tracer)
+                    self.assertEqual(ast_module.dump(tree, include_attributes=True), dump)
+                    for node in ast_module.walk(tree):
+                        self.assertNotIsInstance(node, StaticallyTyped[ast_module])
+                        self.assertFalse(hasattr(node, 'resolved_type_comment'))
+
+    def test_reaugment(self):
+        example = (
+            'x = 1  # type: int\n'
+            'def spam(a):\n    b = a  # type: int\n'
+            'def ham():\n    pass\n'
+            'class Eggs:\n    def __init__(self):\n        self.y = 0  # type: float\n'
+            'for i in range(3):  # type: int\n    def nested():\n        c = 1  # type: int\n')
+        edits = [
+            ('spam', 'def spam(a):\n    b = a  # type: str\n    z = 2  # type: int\n'),
+            ('Eggs.__init__', '    def __init__(self):\n        self.y = 0  # type: str\n'),
+            ('nested', '    def nested():\n        d = 1  # type: float\n')]
+        for ast_module in AST_MODULES:
+            if ast_module is ast and sys.version_info[:2] < (3, 8):
+                continue
+            kwargs = {'type_comments': True} if ast_module is ast else {}
+            for name, new_source in edits:
+                with self.subTest(ast_module=ast_module, name=name):
+                    tree = augment(ast_module.parse(example, **kwargs))
+                    ham = tree._functions['ham']
+                    old_node = {
+                        'spam': tree._functions['spam'],
+                        'Eggs.__init__': tree._classes['Eggs']._methods['__init__'],
+                        'nested': tree.body[4].body[0]}[name]
+                    old_lines = unparse(old_node).strip().count('\n') + 1
+                    lines = example.splitlines(keepends=True)
+                    lines[old_node.lineno - 1:old_node.lineno - 1 + old_lines] = [new_source]
+                    expected_tree = augment(ast_module.parse(''.join(lines), **kwargs))
+                    resolver_type = TypeHintResolver[ast_module, ast]
+                    with unittest.mock.patch.object(
+                            resolver_type, 'visit_node', autospec=True,
+                            side_effect=resolver_type.visit_node) as visit_node:
+                        new_node = reaugment(tree, old_node, new_source)
+                    self.assertFalse([node for (_, node), _ in visit_node.call_args_list
+                                      if node is ham or node is tree])
+                    self.assertIsInstance(new_node, type(old_node))
+                    self.assertEqual(new_node.lineno, old_node.lineno)
+                    self.assertNotIn(old_node, list(ast_module.walk(tree)))
+                    self.assertEqual(ast_module.dump(tree), ast_module.dump(expected_tree))
+                    for node, expected_node in zip(ast_module.walk(tree),
+                                                   ast_module.walk(expected_tree)):
+                        self.assertIs(type(node), type(expected_node))
+                        if isinstance(node, StaticallyTyped[ast_module]):
+                            self.assertEqual(str(node), str(expected_node))
+                    self.assertDictEqual(tree._module_vars, expected_tree._module_vars)
+                    self.assertDictEqual(
+                        tree._classes['Eggs']._instance_fields,
+                        expected_tree._classes['Eggs']._instance_fields)
+                    self.assertIs(tree._functions['ham'], ham)
+        tree = augment(ast.parse(example, type_comments=True))
+        with self.assertRaises(ValueError):
+            reaugment(tree, ast.parse('pass').body[0], 'pass')
+        with self.assertRaises(ValueError):
+            reaugment(tree, tree.body[0], 'x = 1\ny = 2')
+
+    def test_reaugment_repeatedly(self):
+        example = (
+            'class Eggs:\n    def spam(self):\n        a = 1  # type: int\n'
+            '    def ham(self):\n        pass\n'
+            'x = 1  # type: int\n')
+        expected_example = (
+            'class Eggs:\n    def spam(self):\n        a = 1  # type: int\n'
+            '        for i in range(a):  # type: int\n            b = i  # type: float\n'
+            '        c = 2  # type: str\n'
+            '    def ham(self):\n        pass\n'
+            'x = 1  # type: int\n')
+        for ast_module in AST_MODULES:
+            if ast_module is ast and sys.version_info[:2] < (3, 8):
+                continue
+            with self.subTest(ast_module=ast_module):
+                kwargs = {'type_comments': True} if ast_module is ast else {}
+                tree = augment(ast_module.parse(example, **kwargs))
+                spam = reaugment(tree, tree._classes['Eggs']._methods['spam'], (
+                    'def spam(self):\n    a = 1  # type: int\n    b = 2  # type: float\n'
+                    '    c = 2  # type: int\n'))
+                reaugment(tree, spam.body[1], (
+                    'for i in range(a):  # type: int\n    b = i  # type: float\n'))
+                spam = tree._classes['Eggs']._methods['spam']
+                reaugment(tree, spam.body[2], 'c = 2  # type: str')
+                expected_tree = augment(ast_module.parse(expected_example, **kwargs))
+                self.assertEqual(ast_module.dump(tree), ast_module.dump(expected_tree))
+                for node, expected_node in zip(ast_module.walk(tree),
+                                               ast_module.walk(expected_tree)):
+                    if isinstance(node, ast_module.stmt):
+                        self.assertEqual(node.lineno, expected_node.lineno)
+                        self.assertEqual(getattr(node, 'end_lineno', None),
+                                         getattr(expected_node, 'end_lineno', None))
+                    if isinstance(node, StaticallyTyped[ast_module]):
+                        self.assertEqual(str(node), str(expected_node))
+                spam = tree._classes['Eggs']._methods['spam']
+                self.assertDictEqual({k: set(v) for k, v in spam._local_vars.items()},
+                                     {'a': {int}, 'i': {int}, 'b': {float}, 'c': {str}})
+
+    def test_reaugment_nested_method(self):
+        example = (
+            'def outer():\n'
+            '    class Inner:\n'
+            '        def method(self):\n'
+            '            a = 1  # type: int\n'
+            '    return Inner\n')
+        new_source = 'def method(self):\n    a = "1"  # type: str\n    b = [a, a]  # type: list\n'
+        expected_example = (
+            'def outer():\n'
+            '    class Inner:\n'
+            '        def method(self):\n'
+            '            a = "1"  # type: str\n'
+            '            b = [a, a]  # type: list\n'
+            '    return Inner\n')
+        for ast_module in AST_MODULES:
+            if ast_module is ast and sys.version_info[:2] < (3, 8):
+                continue
+            with self.subTest(ast_module=ast_module):
+                kwargs = {'type_comments': True} if ast_module is ast else {}
+                tree = augment(ast_module.parse(example, **kwargs))
+                inner = tree._functions['outer'].body[0]
+                method = reaugment(tree, inner._methods['method'], new_source)
+                self.assertIs(inner._methods['method'], method)
+                self.assertEqual(method.col_offset, 8)
+                expected_tree = augment(ast_module.parse(expected_example, **kwargs))
+                self.assertEqual(ast_module.dump(tree, include_attributes=True),
+                                 ast_module.dump(expected_tree, include_attributes=True))
+
     def test_without_eval(self):
         for ast_module, globals_, locals_ in itertools.product(
                 AST_MODULES, GLOBALS_EXAMPLES, LOCALS_EXAMPLES):
@@ -99,3 +323,104 @@ class Tests(unittest.TestCase):
         tree = parse(example)
         assign = tree.body[0]
         self.assertDictEqual({k.id: v for k, v in assign._vars.items()}, {'my_object': MyClass})
+
+    def test_parse_in_context_of_caller_of_wrapper(self):
+        example = 'my_object = MyClass() # type: MyClass'
+
+        def wrapper(source):
+            MyClass = None  # pylint: disable=invalid-name,unused-variable
+            return parse(source, stack_depth=2)
+
+        class MyClass:
+            pass
+        tree = wrapper(example)
+        assign = tree.body[0]
+        self.assertDictEqual({k.id: v for k, v in assign._vars.items()}, {'my_object': MyClass})
+
+    def test_default_ast_module(self):
+        example = 'x = 0  # type: int\n'
+        tree = parse(example, globals_=GLOBALS_EXTERNAL)
+        self.assertIsInstance(tree, DEFAULT_AST_MODULE.Module)
+        self.assertIs(tree.body[0]._vars[tree.body[0].targets[0]], int)
+        for ast_module in AST_MODULES:
+            if ast_module is ast and sys.version_info[:2] < (3, 8):
+                continue
+            with self.subTest(ast_module=ast_module):
+                kwargs = {'type_comments': True} if ast_module is ast else {}
+                tree = augment(ast_module.parse(example, **kwargs), globals_=GLOBALS_EXTERNAL)
+                self.assertIsInstance(tree, ast_module.Module)
+                self.assertIs(tree.body[0]._vars[tree.body[0].targets[0]], int)
+
+    @unittest.skipIf(sys.version_info[:2] < (3, 8), 'requires type comments in built-in ast')
+    def test_native_ast_without_transcription(self):
+        example = 'def spam(x: t.List[int]):\n    y = x  # type: t.Sequence[int]\n'
+        with unittest.mock.patch.object(
+                AstTranscriber[typed_ast.ast3, ast], 'visit') as transcribe:
+            tree = parse(example, globals_=GLOBALS_EXTERNAL, ast_module=ast)
+        transcribe.assert_not_called()
+        self.assertIn(t.Sequence[int], tree._functions['spam']._local_vars['y'])
+
+    def test_augment_shared_type_hint_cache(self):
+        example = ('x = 0  # type: int\ny = 1  # type: int\n'
+                   'z = 2  # type: float\nw = x  # type: int\n')
+        for ast_module in AST_MODULES:
+            if ast_module is ast and sys.version_info[:2] < (3, 8):
+                continue
+            with self.subTest(ast_module=ast_module):
+                kwargs = {'type_comments': True} if ast_module is ast else {}
+                cache = TypeHintCache()
+                for _ in range(3):
+                    augment(ast_module.parse(example, **kwargs), globals_=GLOBALS_EXTERNAL,
+                            ast_module=ast_module, type_hint_cache=cache)
+                self.assertEqual(cache.misses, 2)
+                self.assertEqual(cache.hits, 10)
+
+    def test_no_dumps_without_debug_logging(self):
+        example = 'x = 0  # type: int\n'
+        for ast_module in AST_MODULES:
+            for level, expected_dumps in ((logging.INFO, 0), (logging.DEBUG, 3)):
+                with self.subTest(ast_module=ast_module, level=level):
+                    loggers = [logging.getLogger(name) for name in (
+                        'static_typing.augment', 'static_typing.parse')]
+                    levels = [logger.level for logger in loggers]
+                    for logger in loggers:
+                        logger.setLevel(level)
+                    try:
+                        with unittest.mock.patch.object(
+                                ast_module, 'dump', wraps=ast_module.dump) as dump:
+                            parse(example, globals_=GLOBALS_EXTERNAL, ast_module=ast_module)
+                    finally:
+                        for logger, logger_level in zip(loggers, levels):
+                            logger.setLevel(logger_level)
+                    self.assertEqual(dump.call_count, expected_dumps)
+
+    def test_augmentation_stats(self):
+        example = 'def spam(x: int) -> int:\n    y = x  # type: int\n    return y\n'
+        for ast_module in AST_MODULES:
+            with self.subTest(ast_module=ast_module):
+                kwargs = {'type_comments': True} if ast_module is ast else {}
+                stats = AugmentationStats()
+                tracer = unittest.mock.Mock()
+                for _ in range(2):
+                    parse(example, globals_=GLOBALS_EXTERNAL, ast_module=ast_module, stats=stats)
+                augment(ast_module.parse(example, **kwargs), globals_=GLOBALS_EXTERNAL,
+                        ast_module=ast_module, mode='index', stats=stats, tracer=tracer)
+                self.assertSetEqual(set(stats.phase_seconds), {
+                    'parse', 'augment', 'resolve_type_hints', 'type_nodes'})
+                for phase in ('resolve_type_hints', 'type_nodes'):
+                    self.assertLess(stats.phase_seconds[phase], stats.phase_seconds['augment'])
+                self.assertEqual(stats.nodes_visited['FunctionDef'], 3)
+                self.assertEqual(stats.nodes_visited['Module'], 3)
+                self.assertEqual(stats.type_hints_resolved, 9)
+                self.assertEqual(stats.type_hint_cache_hits + stats.type_hint_cache_misses, 9)
+                self.assertEqual(stats.nodes_transcribed > 0, ast_module is not ast)
+                self.assertEqual(len([call for call in tracer.call_args_list
+                                      if call[0][0] == 'resolve_type_hint']), 3)
+                metrics = stats.as_dict()
+                self.assertEqual(metrics['static_typing_type_hints_resolved_total'], 9)
+                self.assertEqual(
+                    metrics['static_typing_nodes_visited_total{node_type="FunctionDef"}'], 3)
+                self.assertEqual(metrics['static_typing_phase_seconds{phase="parse"}'],
+                                 stats.phase_seconds['parse'])
+                self.assertTrue(all(isinstance(value, (int, float))
+                                    for value in metrics.values()))
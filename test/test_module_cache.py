@@ -0,0 +1,125 @@
+"""Unit tests for module_cache module."""
+
+import logging
+import os
+import pickle
+import tempfile
+import typing as t
+import unittest
+
+import numpy as np
+
+from static_typing.module_cache import ModuleCache, stable_namespace_fingerprint
+from static_typing.parse import parse
+from .examples import AST_MODULES, GLOBALS_EXTERNAL, LOCALS_EXTERNAL
+
+_LOG = logging.getLogger(__name__)
+
+EXAMPLE = 'x = 0  # type: int\n\ndef spam():\n    y = None  # type: np.float32\n'
+
+
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.directory = self._tmpdir.name
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def test_stable_namespace_fingerprint(self):
+        self.assertEqual(stable_namespace_fingerprint(GLOBALS_EXTERNAL, None),
+                         stable_namespace_fingerprint(dict(GLOBALS_EXTERNAL), None))
+        self.assertNotEqual(stable_namespace_fingerprint(GLOBALS_EXTERNAL, None),
+                            stable_namespace_fingerprint(None, GLOBALS_EXTERNAL))
+        self.assertNotEqual(stable_namespace_fingerprint({'np': np}, None),
+                            stable_namespace_fingerprint({'np': np.float32}, None))
+        for value, other_value in [(t.List[int], t.List[float]), (1, 2), (1, 1.0), ('1', 1),
+                                   ((int, 'spam'), (int, 'ham')), (None, False)]:
+            with self.subTest(value=value, other_value=other_value):
+                fingerprint = stable_namespace_fingerprint({'V': value}, None)
+                self.assertIsNotNone(fingerprint)
+                self.assertNotEqual(fingerprint,
+                                    stable_namespace_fingerprint({'V': other_value}, None))
+
+        self.assertEqual(
+            stable_namespace_fingerprint(GLOBALS_EXTERNAL, None),
+            stable_namespace_fingerprint(dict(GLOBALS_EXTERNAL, __warningregistry__={}), None))
+
+        class Local:
+            pass
+        for value in (object(), [int], Local, (Local,)):
+            with self.subTest(value=value):
+                self.assertIsNone(stable_namespace_fingerprint(GLOBALS_EXTERNAL, {'V': value}))
+                self.assertEqual(
+                    stable_namespace_fingerprint(GLOBALS_EXTERNAL, {'V': value}, {'np', 't'}),
+                    stable_namespace_fingerprint(GLOBALS_EXTERNAL, {}, {'np', 't'}))
+
+    def test_parse_with_cache(self):
+        for ast_module in AST_MODULES:
+            with self.subTest(ast_module=ast_module):
+                cache = ModuleCache(os.path.join(self.directory, ast_module.__name__))
+                tree = parse(EXAMPLE, globals_=GLOBALS_EXTERNAL, locals_={},
+                             ast_module=ast_module, module_cache=cache)
+                self.assertEqual((cache.hits, cache.misses), (0, 1))
+                cached_tree = parse(EXAMPLE, globals_=GLOBALS_EXTERNAL, locals_={},
+                                    ast_module=ast_module, module_cache=cache)
+                self.assertEqual((cache.hits, cache.misses), (1, 1))
+                self.assertIsNot(cached_tree, tree)
+                self.assertEqual(ast_module.dump(cached_tree), ast_module.dump(tree))
+                self.assertDictEqual(cached_tree._module_vars, tree._module_vars)
+                parse(EXAMPLE, globals_=GLOBALS_EXTERNAL, locals_=LOCALS_EXTERNAL,
+                      ast_module=ast_module, module_cache=cache)
+                parse(EXAMPLE + '\n', globals_=GLOBALS_EXTERNAL, locals_={},
+                      ast_module=ast_module, module_cache=cache)
+                self.assertEqual((cache.hits, cache.misses), (1, 3))
+                self.assertEqual(len(os.listdir(cache.directory)), 3)
+
+    def test_parse_with_changed_namespace(self):
+        example = 'x = None  # type: V\n'
+        cache = ModuleCache(self.directory)
+        for value in (t.List[int], t.List[float], t.List[int]):
+            with self.subTest(value=value):
+                tree = parse(example, globals_=GLOBALS_EXTERNAL, locals_={'V': value},
+                             module_cache=cache)
+                self.assertIs(next(iter(tree._module_vars['x'])), value)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        for _ in range(2):
+            parse(example, globals_=GLOBALS_EXTERNAL, locals_={'V': object()},
+                  module_cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertEqual(len(os.listdir(cache.directory)), 2)
+        for _ in range(2):
+            parse(example, globals_=dict(GLOBALS_EXTERNAL, unused=object()),
+                  locals_={'V': t.List[int]}, module_cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (3, 2))
+        self.assertEqual(len(os.listdir(cache.directory)), 2)
+
+    def test_unpicklable(self):
+        cache = ModuleCache(self.directory)
+        with self.assertLogs(level=logging.WARNING):
+            self.assertFalse(cache.put('key', lambda: None))
+        self.assertListEqual(os.listdir(self.directory), [])
+
+    def test_corrupted_entry(self):
+        cache = ModuleCache(self.directory)
+        cache.put('key', [1, 2, 3])
+        self.assertEqual(cache.get('key'), [1, 2, 3])
+        with open(os.path.join(self.directory, 'key.pickle'), 'wb') as cache_file:
+            cache_file.write(b'garbage')
+        with self.assertLogs(level=logging.WARNING):
+            self.assertIsNone(cache.get('key'))
+        self.assertListEqual(os.listdir(self.directory), [])
+
+    def test_eviction(self):
+        entry_size = len(pickle.dumps(b'0' * 1000, protocol=pickle.HIGHEST_PROTOCOL))
+        cache = ModuleCache(self.directory, max_size=10 * entry_size)
+        for i in range(20):
+            cache.put('key{:02}'.format(i), b'0' * 1000)
+            os.utime(os.path.join(self.directory, 'key{:02}.pickle'.format(i)), (i, i))
+        entries = sorted(os.listdir(self.directory))
+        self.assertLessEqual(len(entries), 10)
+        self.assertIn('key19.pickle', entries)
+        self.assertNotIn('key00.pickle', entries)
+        cache.clear()
+        self.assertListEqual(os.listdir(self.directory), [])
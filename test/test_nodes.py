@@ -4,6 +4,7 @@ import ast
 import collections
 import itertools
 import logging
+import pickle
 import sys
 import unittest
 
@@ -12,12 +13,14 @@ import typed_ast.ast3
 import typed_astunparse
 
 from static_typing.ast_manipulation.type_hint_resolver import TypeHintResolver
-from static_typing.nodes.statically_typed import StaticallyTyped
+from static_typing.nodes.statically_typed import \
+    EMPTY_TYPE_FIELD, TYPE_FIELD_NAMES, StaticallyTyped, StoreChain, find_all_stores
 from static_typing.nodes.module import StaticallyTypedModule
 from static_typing.nodes.function_def import StaticallyTypedFunctionDef
 from static_typing.nodes.class_def import StaticallyTypedClassDef
 from static_typing.nodes.declaration import StaticallyTypedAssign, StaticallyTypedAnnAssign
 from static_typing.nodes.context import StaticallyTypedFor, StaticallyTypedWith
+from static_typing.nodes.type_set import TypeSet
 from static_typing.static_typer import StaticTyper
 from .examples import \
     AST_MODULES, FUNCTIONS_SOURCE_CODES, FUNCTIONS_LOCAL_VARS, CLASSES_SOURCE_CODES, \
@@ -99,6 +102,98 @@ class Tests(unittest.TestCase):
                     self.assertEqual(len(module._module_vars), 3)
                     self.assertEqual(len(module._nonlocal_assignments), 1)
 
+    def test_type_set(self):
+        type_set = TypeSet([int, float, int])
+        self.assertIs(type_set, TypeSet((int, float)))
+        self.assertEqual(type_set, {float, int})
+        self.assertEqual(type_set, frozenset((float, int)))
+        self.assertEqual(hash(type_set), hash(frozenset((float, int))))
+        self.assertNotEqual(type_set, {int})
+        self.assertIsNot(type_set, TypeSet((float, int)))
+        self.assertEqual(type_set, TypeSet((float, int)))
+        self.assertEqual(TypeSet((float, int)), {int, float})
+        self.assertNotEqual(type_set, TypeSet((int, str)))
+        self.assertNotEqual(type_set, TypeSet((int,)))
+        self.assertEqual(type_set, ordered_set.OrderedSet([int, float]))
+        for other in ((int, float), [int, float], (float, int), [float, int], 'ab'):
+            with self.subTest(other=other):
+                self.assertNotEqual(type_set, other)
+        self.assertNotEqual(TypeSet('ab'), 'ab')
+        self.assertIs(type_set.union([float]), type_set)
+        self.assertIs(type_set.union([str], [int, bool]), TypeSet((int, float, str, bool)))
+        self.assertIs(TypeSet().union(), TypeSet())
+        self.assertIs(pickle.loads(pickle.dumps(type_set)), type_set)
+        with self.assertRaises(TypeError):
+            TypeSet([[int]])
+        code = 'x = 1  # type: int\ny = 2  # type: int\nz = x  # type: float\nz = y  # type: int\n'
+        for ast_module in AST_MODULES:
+            resolver = TypeHintResolver[ast_module, ast](globals_=GLOBALS_EXTERNAL)
+            typer = StaticTyper[ast_module]()
+            if ast_module is ast and sys.version_info[:2] < (3, 8):
+                continue
+            with self.subTest(ast_module=ast_module):
+                kwargs = {'type_comments': True} if ast_module is ast else {}
+                module = typer.visit(resolver.visit(ast_module.parse(code, **kwargs)))
+                self.assertIs(module._module_vars['x'], TypeSet([int]))
+                self.assertIs(module._module_vars['y'], module._module_vars['x'])
+                self.assertIs(module._module_vars['z'], TypeSet([float, int]))
+
+    def test_lazy_type_fields(self):
+        code = 'class Empty:\n    pass\ndef trivial():\n    pass\ndef spam(x):\n    y = x\n'
+        with self.assertRaises(TypeError):
+            EMPTY_TYPE_FIELD['spam'] = 'ham'
+        for ast_module in AST_MODULES:
+            with self.subTest(ast_module=ast_module):
+                module = StaticTyper[ast_module]().visit(ast_module.parse(code))
+                class_, trivial, spam = module.body
+                self.assertIsInstance(class_, StaticallyTypedClassDef[ast_module])
+                for node in (class_, trivial):
+                    for field_name in type(node)._type_fields:
+                        self.assertIs(getattr(node, '_{}'.format(field_name)), EMPTY_TYPE_FIELD)
+                        self.assertNotIn('_{}'.format(field_name), vars(node))
+                self.assertDictEqual(dict(spam._params), {'x': TypeSet()})
+                self.assertDictEqual(dict(spam._local_vars), {'y': TypeSet()})
+                self.assertIs(spam._nonlocal_assignments, EMPTY_TYPE_FIELD)
+                self.assertDictEqual(module._module_vars, {})
+                self.assertEqual(len(module._functions), 2)
+                self.assertIs(
+                    StaticallyTypedFunctionDef[ast_module].from_other(spam, in_place=True), spam)
+                self.assertDictEqual(dict(spam._local_vars), {'y': TypeSet()})
+                self.assertEqual(len(EMPTY_TYPE_FIELD), 0)
+        for ast_module in AST_MODULES:
+            node_types = [StaticallyTyped[ast_module]]
+            for node_type in node_types:
+                node_types += node_type.__subclasses__()
+                with self.subTest(ast_module=ast_module, node_type=node_type):
+                    for field_name in node_type._type_fields:
+                        self.assertIn(field_name, TYPE_FIELD_NAMES)
+                        self.assertIn('_{}'.format(field_name), vars(StaticallyTyped[ast_module]))
+            self.assertGreater(len(node_types), 8)
+
+    def test_pickle(self):
+        codes = [
+            "x = 1  # type: int\ny = 1.0\nz = 'one'\n\neggs.spam = ham\n",
+            "for x in range(10):  # type: int\n    y = 1.0\nwith read() as z:\n    eggs.spam = ham",
+            "x = None  # type: np.ndarray\nclass A:\n    def __init__(self, x):\n"
+            "        self.x = x  # type: np.float32\n        y = self  # type: t.Any\n"]
+        for ast_module in AST_MODULES:
+            resolver = TypeHintResolver[ast_module, ast](globals_=GLOBALS_EXTERNAL)
+            typer = StaticTyper[ast_module]()
+            for code in codes:
+                with self.subTest(ast_module=ast_module, code=code):
+                    tree = ast_module.parse(code)
+                    module = resolver.visit(tree)
+                    module = typer.visit(module)
+                    unpickled = pickle.loads(pickle.dumps(module))
+                    self.assertIsInstance(unpickled, StaticallyTypedModule[ast_module])
+                    self.assertEqual(ast_module.dump(unpickled), ast_module.dump(module))
+                    self.assertEqual(str(unpickled), str(module))
+                    self.assertDictEqual(unpickled._module_vars, module._module_vars)
+                    for cls in unpickled._classes.values():
+                        self.assertIsInstance(cls, StaticallyTypedClassDef[ast_module])
+                        self.assertIn('__init__', cls._methods)
+                        self.assertIs(cls._methods['__init__'], cls.body[0])
+
     def test_function_def(self):
         for ast_module in AST_MODULES:
             resolver = TypeHintResolver[ast_module, ast](globals_=GLOBALS_EXTERNAL)
@@ -119,6 +214,59 @@ class Tests(unittest.TestCase):
                         self.assertDictEqual(function_local_vars, function._local_vars)
                     _LOG.info('%s', function)
 
+    def test_store_chain(self):
+        inner = StoreChain([{'b': int}, StoreChain(), {}, StoreChain([{'c': str, 'd': None}])])
+        chain = StoreChain([{'a': float}, inner, StoreChain([inner]), {'e': bool}])
+        self.assertTrue(chain)
+        self.assertFalse(StoreChain([{}, StoreChain([StoreChain()])]))
+        self.assertListEqual([name for name, _ in chain], ['a', 'b', 'c', 'd', 'b', 'c', 'd', 'e'])
+        self.assertListEqual(list(pickle.loads(pickle.dumps(chain))), list(chain))
+
+    def test_find_all_stores(self):
+        example = '\n'.join([
+            'def outer():',
+            '    a = 1',
+            '    for i in range(10):',
+            '        if i:',
+            '            with open(i) as f:',
+            '                while f:',
+            '                    b: int = 2',
+            '        else:',
+            '            def inner(x):',
+            '                c, d = 3, 4',
+            '                class Local:',
+            '                    e = 5',
+            '            self.g = 7',
+            '    try:',
+            '        h = 8',
+            '    except ValueError:',
+            '        h = 9',
+            ''])
+        for ast_module in AST_MODULES:
+            with self.subTest(ast_module=ast_module):
+                tree = ast_module.parse(example)
+                tree = StaticTyper[ast_module]().visit(tree)
+                function = tree.body[0]
+                self.assertIsInstance(function, StaticallyTypedFunctionDef[ast_module])
+                stores = list(find_all_stores[ast_module](function))
+                self.assertListEqual(stores, list(function._stores))
+                walked = [
+                    target for node in ast_module.walk(function)
+                    if isinstance(node, StaticallyTyped[ast_module])
+                    and not isinstance(node, StaticallyTypedFunctionDef[ast_module])
+                    for field_name in ('vars', 'index_vars', 'context_vars')
+                    if field_name in type(node)._type_fields
+                    for target in getattr(node, '_{}'.format(field_name))]
+                self.assertSetEqual({id(target) for target, _ in stores},
+                                    {id(target) for target in walked})
+                self.assertEqual(len(stores), len(walked))
+                self.assertListEqual(
+                    [getattr(target, 'id', None) for target, _ in stores],
+                    ['a', 'i', 'f', 'b', 'c', 'd', 'e', None, 'h', 'h'])
+                self.assertSetEqual(set(function._local_vars),
+                                    {'a', 'i', 'f', 'b', 'c', 'd', 'e', 'h'})
+                self.assertEqual(len(function._nonlocal_assignments), 1)
+
     def test_unsupported_functions(self):
         examples = [
             '@my_decorator\ndef my_function():\n    pass\n',
@@ -0,0 +1,102 @@
+"""Unit tests for parse_files() function."""
+
+import logging
+import os
+import pathlib
+import tempfile
+import unittest
+
+import numpy as np
+
+from static_typing.augment import DEFAULT_AST_MODULE
+from static_typing.module_cache import ModuleCache
+from static_typing.parse_files import parse_files
+from .examples import GLOBALS_EXTERNAL
+
+_LOG = logging.getLogger(__name__)
+
+EXAMPLES = {
+    'simple.py': 'x = 0  # type: int\n\ndef spam():\n    y = 1.0  # type: float\n',
+    'external.py': 'def ham():\n    x = None  # type: np.float32\n',
+    'unsupported.py': 'def eggs(*args):\n    pass\n',
+    'invalid.py': 'def bacon(:\n'}
+
+
+def summarize(tree):
+    return sorted(tree._module_vars), sorted(tree._functions)
+
+
+class Tests(unittest.TestCase):
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.paths = []
+        for name, code in EXAMPLES.items():
+            path = pathlib.Path(self._tmpdir.name, name)
+            path.write_text(code)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def _check_results(self, results):
+        self.assertEqual(len(results), len(EXAMPLES))
+        results = {os.path.basename(result.path): result for result in results}
+        self.assertEqual(results['simple.py'].result, (['x'], ['spam']))
+        self.assertIsNone(results['simple.py'].error)
+        self.assertEqual(results['external.py'].result, ([], ['ham']))
+        self.assertIsInstance(results['unsupported.py'].error, NotImplementedError)
+        self.assertIsNone(results['unsupported.py'].result)
+        self.assertIsInstance(results['invalid.py'].error, SyntaxError)
+
+    def test_parse_files(self):
+        for max_workers, chunksize, ordered in ((1, 1, True), (2, 1, True), (2, 3, False)):
+            with self.subTest(max_workers=max_workers, chunksize=chunksize, ordered=ordered):
+                results = list(parse_files(
+                    self.paths, globals_=GLOBALS_EXTERNAL, function=summarize,
+                    max_workers=max_workers, chunksize=chunksize, ordered=ordered))
+                if ordered:
+                    self.assertListEqual([result.path for result in results], self.paths)
+                self._check_results(results)
+
+    def test_parse_files_default_namespace(self):
+        results = list(parse_files(self.paths[:2], function=summarize, max_workers=2))
+        self.assertEqual(results[0].result, (['x'], ['spam']))
+        self.assertIsInstance(results[1].error, NameError)
+
+    def test_parse_files_trees(self):
+        results = list(parse_files(self.paths[:2], locals_={'np': np}, max_workers=2))
+        self.assertEqual(len(results), 2)
+        for result in results:
+            self.assertIsNone(result.error)
+            self.assertIsInstance(result.result, DEFAULT_AST_MODULE.Module)
+        self.assertIn(np.float32, results[1].result._functions['ham']._local_vars['x'])
+
+    def test_parse_files_in_process(self):
+        results = list(parse_files(self.paths[:2], locals_={'np': np}, max_workers=1))
+        self.assertIsInstance(results[0].result, DEFAULT_AST_MODULE.Module)
+        self.assertIn(np.float32, results[1].result._functions['ham']._local_vars['x'])
+
+    def test_parse_files_with_module_cache(self):
+        cache = ModuleCache(pathlib.Path(self._tmpdir.name, 'cache'))
+        for _ in range(2):
+            results = list(parse_files(self.paths, globals_=GLOBALS_EXTERNAL, function=summarize,
+                                       max_workers=2, module_cache=cache))
+            self._check_results(results)
+        self.assertEqual(len(list(cache.directory.iterdir())), 2)
+
+    def test_parse_files_more_chunks_than_pending(self):
+        paths = self.paths * 4
+        for ordered in (True, False):
+            with self.subTest(ordered=ordered):
+                results = list(parse_files(paths, globals_=GLOBALS_EXTERNAL, function=summarize,
+                                           max_workers=2, ordered=ordered))
+                self.assertEqual(len(results), len(paths))
+                if ordered:
+                    self.assertListEqual([result.path for result in results], paths)
+
+    def test_parse_files_invalid_arguments(self):
+        for kwargs in ({'chunksize': 0}, {'max_workers': 0}):
+            with self.subTest(**kwargs):
+                with self.assertRaises(AssertionError):
+                    parse_files(self.paths, **kwargs)
@@ -0,0 +1,116 @@
+"""Unit tests for parse_statements() function."""
+
+import io
+import logging
+import unittest
+import unittest.mock
+
+from static_typing.ast_manipulation import type_hint_resolver
+from static_typing.nodes import StaticallyTyped, StaticallyTypedModule
+from static_typing.parse import parse
+from static_typing.parse_statements import split_statements, parse_statements
+from .examples import AST_MODULES, SOURCE_CODES, GLOBALS_EXTERNAL, LOCALS_EXTERNAL
+
+_LOG = logging.getLogger(__name__)
+
+MODULE_CODE = '''# comment before first statement
+import os
+
+@staticmethod
+def spam(x):
+    if x:
+        return 1
+    else:
+        return (2 +
+                3)
+try:
+    pass
+except Exception:
+    pass
+finally:
+    eggs = 1  # type: int
+# comment after statement
+
+class Ham:
+    bacon = 2.0  # type: float
+sausage = [1,
+           2]; beans = 'three'  # type: str
+'''
+
+
+class Tests(unittest.TestCase):
+
+    def test_split_statements(self):
+        statements = list(split_statements(io.StringIO(MODULE_CODE).readline))
+        self.assertListEqual([lineno for lineno, _ in statements], [1, 4, 11, 19, 21])
+        self.assertEqual(''.join(code for _, code in statements), MODULE_CODE)
+        self.assertTrue(statements[0][1].startswith('# comment'))
+        self.assertTrue(statements[2][1].endswith('# comment after statement\n\n'))
+        for source in ('', '\n\n', '# only comment\n'):
+            with self.subTest(source=source):
+                self.assertListEqual(list(split_statements(io.StringIO(source).readline)), [])
+
+    def test_parse_statements(self):
+        for ast_module in AST_MODULES:
+            for description, example in SOURCE_CODES.items():
+                with self.subTest(ast_module=ast_module, msg=description, example=example):
+                    tree = parse(example, globals_=GLOBALS_EXTERNAL, locals_=LOCALS_EXTERNAL,
+                                 ast_module=ast_module)
+                    module = StaticallyTypedModule[ast_module](body=[], type_ignores=[])
+                    statements = list(parse_statements(
+                        io.StringIO(example), globals_=GLOBALS_EXTERNAL, locals_=LOCALS_EXTERNAL,
+                        ast_module=ast_module, module=module))
+                    self.assertEqual(len(statements), len(tree.body))
+                    for statement, expected in zip(statements, tree.body):
+                        self.assertEqual(ast_module.dump(statement, include_attributes=True),
+                                         ast_module.dump(expected, include_attributes=True))
+                        if isinstance(expected, StaticallyTyped[ast_module]):
+                            self.assertEqual(str(statement), str(expected))
+                    self.assertDictEqual(module._module_vars, tree._module_vars)
+                    self.assertListEqual(list(module._functions), list(tree._functions))
+                    self.assertListEqual(list(module._classes), list(tree._classes))
+                    self.assertListEqual(module.body, [])
+
+    def test_namespaces_fingerprinted_once(self):
+        for ast_module in AST_MODULES:
+            with self.subTest(ast_module=ast_module):
+                with unittest.mock.patch.object(
+                        type_hint_resolver, 'namespace_fingerprint',
+                        wraps=type_hint_resolver.namespace_fingerprint) as fingerprint:
+                    statements = list(parse_statements(
+                        MODULE_CODE, globals_=GLOBALS_EXTERNAL, locals_=LOCALS_EXTERNAL,
+                        ast_module=ast_module))
+                self.assertGreater(len(statements), 1)
+                fingerprint.assert_called_once_with(GLOBALS_EXTERNAL, LOCALS_EXTERNAL)
+
+    def test_generator_returns_module(self):
+        for ast_module in AST_MODULES:
+            with self.subTest(ast_module=ast_module):
+                statements = parse_statements(MODULE_CODE, ast_module=ast_module)
+                with self.assertRaises(StopIteration) as raised:
+                    while True:
+                        next(statements)
+                module = raised.exception.value
+                self.assertIsInstance(module, StaticallyTypedModule[ast_module])
+                tree = parse(MODULE_CODE, ast_module=ast_module)
+                self.assertDictEqual(module._module_vars, tree._module_vars)
+                self.assertListEqual(list(module._module_vars), ['sausage', 'beans'])
+                self.assertIn(str, module._module_vars['beans'])
+                self.assertListEqual(list(module._functions), ['spam'])
+                self.assertListEqual(list(module._classes), ['Ham'])
+
+    def test_syntax_error_location(self):
+        example = 'x = 1\n\ndef spam():\n    y = 2\n    return (y +)\nz = 3\n'
+        for ast_module in AST_MODULES:
+            with self.subTest(ast_module=ast_module):
+                with self.assertRaises(SyntaxError) as expected:
+                    ast_module.parse(example)
+                statements = parse_statements(example, ast_module=ast_module)
+                self.assertIsInstance(next(statements), ast_module.Assign)
+                with self.assertRaises(SyntaxError) as raised:
+                    next(statements)
+                self.assertEqual(raised.exception.lineno, 5)
+                self.assertEqual(raised.exception.lineno, expected.exception.lineno)
+                self.assertEqual(raised.exception.offset, expected.exception.offset)
+                self.assertEqual(getattr(raised.exception, 'end_lineno', None),
+                                 getattr(expected.exception, 'end_lineno', None))
@@ -1,6 +1,7 @@
 """Tests for statically declared types for various objects."""
 
 import itertools
+import pickle
 import unittest
 
 import numpy as np
@@ -28,6 +29,11 @@ class Tests(unittest.TestCase):
     def test_numpy_ndarray_identity(self):
         self.assertIs(ndarray[1, int], ndarray[1, int])
 
+    def test_numpy_ndarray_pickle(self):
+        for key in ((1, int), (2, float, (10, ...))):
+            with self.subTest(key=key):
+                self.assertIs(pickle.loads(pickle.dumps(ndarray[key])), ndarray[key])
+
     def test_numpy_ndarray_bad(self):
         examples = {
             1: TypeError,